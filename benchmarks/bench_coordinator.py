@@ -0,0 +1,385 @@
+"""Benchmark suite: the coordinator's polling cycle against the fixture switch pages.
+
+For every model in benchmarks/fixtures (synthetic pages, see README) it measures
+
+* parse time per page (median of several runs, no Home Assistant needed),
+* the latency of a full KeeplinkCoordinator update cycle,
+* memory allocated per cycle (tracemalloc peak and what stays retained),
+* how many entity state writes one update causes.
+
+The coordinator runs unmodified; only its HTTP session is swapped for one
+that answers from the fixtures, so nothing touches the network. The cycle
+scenarios are "busy" (PoE readings and counters change every poll),
+"steady" (identical pages, the parse cache and dispatch filter do their
+job) and "poe" (a PoE-only poll with changing readings). The coordinator
+part needs Home Assistant installed; without it only parse times are
+reported and the coordinator results are null.
+
+Results can be written as JSON and compared with an earlier run:
+
+    python benchmarks/bench_coordinator.py --json before.json
+    python benchmarks/bench_coordinator.py --compare before.json [--threshold 20]
+
+--compare exits with status 1 when a metric got worse by more than the
+threshold (in percent), or when one update writes more entity states.
+
+Usage:
+    python benchmarks/bench_coordinator.py [--cycles 50] [--number 200] [--json PATH] [--compare PATH]
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from common import (
+    ROOT, ENDPOINT_PAGES, BenchEntry, async_build_entities, async_create_hass,
+    fixture_models, load_fixtures, load_module, percentile,
+)
+
+# Pages whose content moves between polls on a live switch
+DYNAMIC_PAGES = ("pse_system.html", "pse_port.html", "port_stats.html")
+
+# Entity config of the benchmark entry: everything that adds listeners switched on
+BENCH_ENTRY_DATA = {
+    "create_total_energy": True,
+    "create_port_energy": True,
+    "utility_cycles": ["daily", "monthly"],
+}
+
+# Count metrics compare exactly, everything else against --threshold
+EXACT_METRICS = ("state_writes",)
+
+
+# -------------------------------------------------------------------------
+# FIXTURE PAGES
+# -------------------------------------------------------------------------
+
+_DECIMAL = re.compile(r'(<td align="center">|name="pse_con_pwr" value=")(\d+\.\d+)')
+_COUNTER = re.compile(r'<td align="center">(\d+)-(\d+)</td>')
+
+
+def vary_page(html, step):
+    """Return the page as it could look `step` polls later: readings moved, counters grew."""
+    if step == 0:
+        return html
+
+    def decimal(match):
+        value = float(match.group(2))
+        return f"{match.group(1)}{value + 0.1 * (step % 7 + 1):.3f}"
+
+    def counter(match):
+        total = (int(match.group(1)) << 32) + int(match.group(2)) + 1021 * step
+        return f'<td align="center">{total >> 32}-{total & 0xFFFFFFFF}</td>'
+
+    return _COUNTER.sub(counter, _DECIMAL.sub(decimal, html))
+
+
+def page_variants(fixtures, cycles):
+    """{page file name: [html per cycle]}, static pages repeat unchanged."""
+    return {
+        name: [vary_page(html, step) if name in DYNAMIC_PAGES else html for step in range(cycles)]
+        for name, html in fixtures.items()
+    }
+
+
+# -------------------------------------------------------------------------
+# PARSE TIMES (no Home Assistant needed)
+# -------------------------------------------------------------------------
+
+def bench_parse(number):
+    parser = load_module("parser")
+    page_parsers = {
+        "pse_system.html": parser.parse_pse_system,
+        "pse_port.html": parser.parse_pse_port,
+        "info.html": parser.parse_info,
+        "port.html": parser.parse_port_settings,
+        "port_stats.html": parser.parse_port_stats,
+    }
+
+    results = {}
+    for model in fixture_models():
+        fixtures = load_fixtures(model)
+        model_results = {}
+        for page_name, parse in page_parsers.items():
+            if page_name not in fixtures:
+                continue
+            html = fixtures[page_name]
+            runs = timeit.repeat(lambda: parse(html), number=number, repeat=5)
+            model_results[page_name] = {
+                "parse_us": round(statistics.median(runs) / number * 1e6, 2),
+                "bytes": len(html.encode()),
+            }
+        results[model] = model_results
+    return results
+
+
+# -------------------------------------------------------------------------
+# COORDINATOR CYCLES (needs Home Assistant)
+# -------------------------------------------------------------------------
+
+class _FixtureResponse:
+    """The parts of aiohttp.ClientResponse the coordinator uses."""
+
+    status = 200
+
+    def __init__(self, url, body):
+        self.url = url
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def text(self):
+        return self._body.decode("utf-8")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FixtureSession:
+    """Stands in for the coordinator's aiohttp session and answers from the fixture pages."""
+
+    def __init__(self, host, pages):
+        self._prefix = f"http://{host}/"
+        self._pages = {endpoint: [html.encode("utf-8") for html in pages[page_name]]
+                       for endpoint, page_name in ENDPOINT_PAGES.items() if page_name in pages}
+        self.step = 0
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        variants = self._pages[url[len(self._prefix):]]
+        return _FixtureResponse(url, variants[self.step % len(variants)])
+
+    def post(self, url, **kwargs):
+        self.requests += 1
+        return _FixtureResponse(url, b"")
+
+    async def close(self):
+        pass
+
+
+async def _async_bench_model(hass, model, cycles):
+    from custom_components.keeplink_switch.const import DOMAIN, ENDPOINTS, POE_ENDPOINTS
+    from custom_components.keeplink_switch.coordinator import KeeplinkCoordinator
+
+    # Enough distinct polls for every scenario, so counters never run backwards
+    pages = page_variants(load_fixtures(model), 3 * (cycles + 12))
+    host = f"bench-{model}"
+    coordinator = KeeplinkCoordinator(hass, host, "admin", "admin", 30, 10)
+    # Same coordinator, fixture pages instead of the network
+    await coordinator.session.close()
+    session = coordinator.session = FixtureSession(host, pages)
+
+    # First poll builds the snapshot the platforms create their entities from
+    coordinator.data = await coordinator._async_fetch_endpoints(frozenset(ENDPOINTS))
+    entry = BenchEntry(f"bench_{model}", BENCH_ENTRY_DATA)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    entities = await async_build_entities(hass, entry)
+
+    # Listeners as Home Assistant would register them (entities disabled by default never subscribe)
+    writes = [0]
+
+    def count_write():
+        writes[0] += 1
+
+    enabled = [entity for entity in entities if entity.entity_registry_enabled_default]
+    removers = [coordinator.async_add_listener(count_write, entity.coordinator_context) for entity in enabled]
+
+    async def cycle(endpoints, step):
+        session.step = step
+        snapshot = await coordinator._async_fetch_endpoints(endpoints)
+        coordinator.data = snapshot
+        coordinator.async_update_listeners()
+
+    scenarios = {
+        "busy": (frozenset(ENDPOINTS), True),
+        "steady": (frozenset(ENDPOINTS), False),
+        "poe": (frozenset(POE_ENDPOINTS), True),
+    }
+    results = {"entities": len(entities), "enabled_entities": len(enabled)}
+    step = 0
+    for name, (endpoints, changing) in scenarios.items():
+        # Settle: the first read of a scenario may differ from whatever the previous one left
+        step += 1
+        await cycle(endpoints, step)
+
+        durations, write_counts, requests_before = [], [], session.requests
+        for _ in range(cycles):
+            if changing:
+                step += 1
+            writes[0] = 0
+            start = time.perf_counter()
+            await cycle(endpoints, step)
+            durations.append((time.perf_counter() - start) * 1000)
+            write_counts.append(writes[0])
+
+        # Allocations are measured in a separate pass, tracemalloc distorts the timings
+        tracemalloc.start()
+        peaks, retained = [], []
+        for _ in range(min(cycles, 10)):
+            if changing:
+                step += 1
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            await cycle(endpoints, step)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+        tracemalloc.stop()
+
+        results[name] = {
+            "cycle_ms_p50": round(statistics.median(durations), 3),
+            "cycle_ms_p95": round(percentile(durations, 0.95), 3),
+            "cycle_ms_mean": round(statistics.fmean(durations), 3),
+            "alloc_kib_peak": round(statistics.median(peaks) / 1024, 1),
+            "alloc_kib_retained": round(statistics.median(retained) / 1024, 1),
+            "requests": (session.requests - requests_before) // cycles,
+            "state_writes": max(write_counts),
+        }
+
+    for remove in removers:
+        remove()
+    hass.data[DOMAIN].pop(entry.entry_id)
+    await coordinator.async_close()
+    return results
+
+
+async def _async_bench_coordinator(cycles):
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        try:
+            return {model: await _async_bench_model(hass, model, cycles) for model in fixture_models()}
+        finally:
+            await hass.async_stop(force=True)
+
+
+def bench_coordinator(cycles):
+    if importlib.util.find_spec("homeassistant") is None:
+        print("Home Assistant is not installed, skipping the coordinator cycles")
+        return None
+    return asyncio.run(_async_bench_coordinator(cycles))
+
+
+# -------------------------------------------------------------------------
+# REPORTING
+# -------------------------------------------------------------------------
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=""):
+    """{"a": {"b": 1}} -> {"a.b": 1} for numeric leaves."""
+    flat = {}
+    for key, value in (results or {}).items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, current, threshold):
+    """Print the metrics that moved and return the names of the regressions."""
+    old = flatten({"parse": baseline.get("parse"), "coordinator": baseline.get("coordinator")})
+    new = flatten({"parse": current.get("parse"), "coordinator": current.get("coordinator")})
+    regressions = []
+    print(f"\nCompared with {baseline.get('meta', {}).get('revision') or 'baseline'} (threshold {threshold:g}%)")
+    for name in sorted(old.keys() & new.keys()):
+        if name.endswith(".bytes") or name.endswith("entities"):
+            continue
+        before, after = old[name], new[name]
+        if name.endswith(EXACT_METRICS):
+            worse = after > before
+        else:
+            worse = before > 0 and (after - before) / before * 100 > threshold
+        change = (after - before) / before * 100 if before else 0.0
+        if worse or abs(change) > threshold:
+            print(f"  {'REGRESSION' if worse else 'improved  '} {name:<55} {before:>10} -> {after:<10} ({change:+.1f}%)")
+        if worse:
+            regressions.append(name)
+    if not regressions:
+        print("  no regressions")
+    return regressions
+
+
+def print_results(results):
+    print(f"{'model / page':<40} {'bytes':>8} {'parse us':>10}")
+    for model, pages in results["parse"].items():
+        for page_name, page in pages.items():
+            print(f"{model + '/' + page_name:<40} {page['bytes']:>8} {page['parse_us']:>10.1f}")
+
+    if results["coordinator"] is None:
+        return
+    print(f"\n{'model / scenario':<32} {'p50 ms':>8} {'p95 ms':>8} {'alloc KiB':>10} {'kept KiB':>9} {'requests':>9} {'writes':>7}")
+    for model, model_results in results["coordinator"].items():
+        for name, scenario in model_results.items():
+            if not isinstance(scenario, dict):
+                continue
+            print(
+                f"{model + ' / ' + name:<32} {scenario['cycle_ms_p50']:>8.2f} {scenario['cycle_ms_p95']:>8.2f} "
+                f"{scenario['alloc_kib_peak']:>10.1f} {scenario['alloc_kib_retained']:>9.1f} "
+                f"{scenario['requests']:>9} {scenario['state_writes']:>7}"
+            )
+        print(f"{'':<32} {model_results['enabled_entities']} of {model_results['entities']} entities enabled")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--cycles", type=int, default=50, help="coordinator cycles per scenario")
+    arg_parser.add_argument("--number", type=int, default=200, help="parses per timing run")
+    arg_parser.add_argument("--json", metavar="PATH", help="write the results to this file")
+    arg_parser.add_argument("--compare", metavar="PATH", help="baseline JSON from an earlier run")
+    arg_parser.add_argument("--threshold", type=float, default=20.0, help="allowed slowdown in percent")
+    args = arg_parser.parse_args()
+
+    results = {
+        "meta": {
+            "revision": _git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cycles": args.cycles,
+            "number": args.number,
+        },
+        "parse": bench_parse(args.number),
+        "coordinator": bench_coordinator(args.cycles),
+    }
+    print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2, sort_keys=True)
+        print(f"\nResults written to {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
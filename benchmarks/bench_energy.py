@@ -0,0 +1,134 @@
+"""Benchmark: energy integration error against synthetic PoE power curves.
+
+Samples known power curves at several polling intervals (with a little
+timing jitter, like real polls), integrates them with the left, right and
+trapezoidal methods of energy.EnergyIntegrator, and prints the relative
+error against the exact energy. A final scenario drops samples for a
+while to show what the max-gap policy does with an outage. The pass/fail
+checks of the integrator live in tests/test_energy.py.
+
+Usage:
+    python benchmarks/bench_energy.py [--hours 24] [--intervals 5,30,60,120,300]
+"""
+import argparse
+import math
+import random
+
+from common import load_module
+
+HOUR = 3600.0
+
+
+def constant(t):
+    return 6.5
+
+
+def ramp(t):
+    """A load warming up: 2 W rising to 12 W over the first hour."""
+    return 2.0 + 10.0 * min(1.0, t / HOUR)
+
+
+def ir_camera(t):
+    """A camera whose IR LEDs switch on at night (step load twice a day)."""
+    return 4.2 + (3.8 if (t % (12 * HOUR)) > 6 * HOUR else 0.0)
+
+
+def wave(t):
+    """A slow-swinging load (10 minute period)."""
+    return 8.0 + 4.0 * math.sin(2 * math.pi * t / 600.0)
+
+
+def bursty(seed=3):
+    """An access point with random busy periods of 1-10 minutes."""
+    rnd = random.Random(seed)
+    edges, t, busy = [], 0.0, False
+    while t < 7 * 24 * HOUR:
+        t += rnd.uniform(60, 600)
+        busy = not busy
+        edges.append((t, busy))
+
+    def power(t):
+        state = False
+        for edge, value in edges:
+            if edge > t:
+                break
+            state = value
+        return 9.0 if state else 5.5
+    return power
+
+
+CURVES = (
+    ("constant", constant),
+    ("ramp", ramp),
+    ("ir camera", ir_camera),
+    ("10 min wave", wave),
+    ("bursty AP", bursty()),
+)
+
+
+def exact_kwh(curve, duration, step=1.0):
+    """Reference energy from a fine (1 s) trapezoidal integration."""
+    total, t, previous = 0.0, 0.0, curve(0.0)
+    while t < duration:
+        t_next = min(duration, t + step)
+        current = curve(t_next)
+        total += (previous + current) / 2.0 * (t_next - t)
+        previous, t = current, t_next
+    return total / HOUR / 1000.0
+
+
+def sample_times(duration, interval, rnd, outage=None):
+    """Poll times with +-10% jitter; samples inside the outage window are dropped."""
+    times, t = [0.0], 0.0
+    while True:
+        t += interval * rnd.uniform(0.9, 1.1)
+        if t >= duration:
+            break
+        if outage and outage[0] <= t < outage[1]:
+            continue
+        times.append(t)
+    times.append(duration)
+    return times
+
+
+def integrate(energy, method, curve, times, max_gap):
+    integrator = energy.EnergyIntegrator(method, max_gap)
+    return sum(integrator.add_sample(curve(t), t) for t in times)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--hours", type=float, default=24.0)
+    arg_parser.add_argument("--intervals", default="5,30,60,120,300")
+    args = arg_parser.parse_args()
+
+    energy = load_module("energy")
+    duration = args.hours * HOUR
+    intervals = [int(value) for value in args.intervals.split(",")]
+    no_gap_limit = duration
+
+    print(f"Relative error vs. exact energy over {args.hours:g} h (max_gap disabled)")
+    print(f"{'curve':<12} {'interval':>8} " + " ".join(f"{method:>12}" for method in energy.METHODS))
+    for name, curve in CURVES:
+        reference = exact_kwh(curve, duration)
+        for interval in intervals:
+            times = sample_times(duration, interval, random.Random(interval))
+            errors = [
+                (integrate(energy, method, curve, times, no_gap_limit) - reference) / reference * 100
+                for method in energy.METHODS
+            ]
+            print(f"{name:<12} {interval:>7}s " + " ".join(f"{error:>+11.3f}%" for error in errors))
+
+    # One hour without samples in the middle of the run
+    outage = (duration / 2, duration / 2 + HOUR)
+    print("\nOne hour outage, 30 s polling, trapezoidal (bursty AP)")
+    curve = CURVES[-1][1]
+    reference = exact_kwh(curve, duration)
+    times = sample_times(duration, 30, random.Random(1), outage)
+    for label, max_gap in (("integrate across gap", no_gap_limit), (f"max_gap {energy.DEFAULT_MAX_GAP}s", energy.DEFAULT_MAX_GAP)):
+        kwh = integrate(energy, energy.METHOD_TRAPEZOIDAL, curve, times, max_gap)
+        print(f"{label:<24} {kwh:.5f} kWh (exact {reference:.5f}, error {(kwh - reference) / reference * 100:+.2f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Load test: a fleet of coordinators polling emulated switches end to end.
+
+Starts N emulated switches (benchmarks/emulator.py) in this process and
+one real KeeplinkCoordinator per switch, all sharing a FleetScheduler the
+way the integration sets them up, then forces full polls of every switch
+at once for a number of rounds. Everything runs over real HTTP on
+localhost: the coordinators' own connection pools, the cookie auth, the
+fleet-wide request cap and the switches' request limits and latency.
+
+Reports the time per round and per switch poll (p50/p95), failed polls,
+connection reuse, fleet queue wait and the highest concurrency a switch
+saw. Needs Home Assistant installed.
+
+Usage:
+    python benchmarks/bench_fleet.py [--switches 50] [--ports 9] [--rounds 10]
+        [--latency 0.05] [--max-connections 2] [--fleet-max-in-flight 8] [--json PATH]
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import statistics
+import sys
+import tempfile
+import time
+
+from common import ROOT, async_create_hass, percentile
+from emulator import async_start_fleet, async_stop_fleet
+
+
+async def _async_poll(coordinator, endpoints):
+    """One forced full poll; returns (ms, error or None)."""
+    start = time.perf_counter()
+    try:
+        coordinator.data = await coordinator._async_fetch_endpoints(endpoints)
+        error = None
+    except Exception as err:  # UpdateFailed, ConfigEntryAuthFailed, timeouts
+        error = type(err).__name__
+    return (time.perf_counter() - start) * 1000, error
+
+
+async def _async_run(args):
+    from custom_components.keeplink_switch.const import ENDPOINTS
+    from custom_components.keeplink_switch.coordinator import KeeplinkCoordinator
+    from custom_components.keeplink_switch.fleet import FleetScheduler
+
+    emulators = await async_start_fleet(
+        args.switches,
+        ports=args.ports,
+        latency=args.latency,
+        max_connections=args.max_connections,
+        over_limit=args.over_limit,
+    )
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        fleet = FleetScheduler(args.fleet_max_in_flight, 0.0)
+        coordinators = [
+            KeeplinkCoordinator(
+                hass, emulator.address, "admin", "admin", 30, 10,
+                max_concurrent_requests=args.max_connections, fleet=fleet
+            )
+            for emulator in emulators
+        ]
+        endpoints = frozenset(ENDPOINTS)
+        try:
+            round_ms, poll_ms, errors = [], [], {}
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                results = await asyncio.gather(*(_async_poll(coordinator, endpoints) for coordinator in coordinators))
+                round_ms.append((time.perf_counter() - start) * 1000)
+                for elapsed, error in results:
+                    poll_ms.append(elapsed)
+                    if error is not None:
+                        errors[error] = errors.get(error, 0) + 1
+
+            connections = [coordinator.connection_stats.as_dict() for coordinator in coordinators]
+            reused = sum(stats["reused_connections"] for stats in connections)
+            created = sum(stats["new_connections"] for stats in connections)
+            return {
+                "switches": args.switches,
+                "ports": args.ports,
+                "rounds": args.rounds,
+                "round_ms_p50": round(statistics.median(round_ms), 2),
+                "round_ms_p95": round(percentile(round_ms, 0.95), 2),
+                "poll_ms_p50": round(statistics.median(poll_ms), 2),
+                "poll_ms_p95": round(percentile(poll_ms, 0.95), 2),
+                "failed_polls": errors,
+                "new_connections": created,
+                "reuse_ratio": round(reused / (reused + created), 3) if reused + created else None,
+                "fleet_wait": fleet.fleet_wait.as_dict(),
+                "switch_max_in_flight": max(emulator.stats["max_in_flight"] for emulator in emulators),
+                "switch_rejected": sum(emulator.stats["rejected"] for emulator in emulators),
+                "auth_redirects": sum(emulator.stats["auth_redirects"] for emulator in emulators),
+            }
+        finally:
+            for coordinator in coordinators:
+                await coordinator.async_close()
+            await hass.async_stop(force=True)
+            await async_stop_fleet(emulators)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--switches", type=int, default=50)
+    arg_parser.add_argument("--ports", type=int, default=9)
+    arg_parser.add_argument("--rounds", type=int, default=10)
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="seconds per switch response")
+    arg_parser.add_argument("--max-connections", type=int, default=2, help="requests a switch handles at once")
+    arg_parser.add_argument("--over-limit", choices=("queue", "drop"), default="queue")
+    arg_parser.add_argument("--fleet-max-in-flight", type=int, default=8)
+    arg_parser.add_argument("--json", metavar="PATH", help="write the results to this file")
+    args = arg_parser.parse_args()
+
+    if importlib.util.find_spec("homeassistant") is None:
+        sys.exit("Home Assistant is not installed; run benchmarks/emulator.py on its own to test against a real instance")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    results = asyncio.run(_async_run(args))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
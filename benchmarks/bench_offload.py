@@ -0,0 +1,74 @@
+"""Benchmark: event-loop blocking with inline vs. executor page parsing.
+
+Parses one full polling cycle (every fixture page of a model) the way the
+coordinator does, either directly on the event loop or as a single batched
+executor job, while a ticker task measures how late the loop wakes it up.
+
+Usage:
+    python benchmarks/bench_offload.py [--switches 10] [--cycles 20]
+"""
+import argparse
+import asyncio
+import time
+
+from common import fixture_models, load_fixtures, load_module
+
+TICK = 0.001
+
+
+async def measure(parse_batch, batches, offload, cycles):
+    """Return (max loop lag, total loop lag) in ms while parsing all batches."""
+    loop = asyncio.get_running_loop()
+    lags = []
+    done = False
+
+    async def ticker():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(max(0.0, time.perf_counter() - start - TICK))
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK * 5)
+
+    for _ in range(cycles):
+        for batch in batches:
+            if offload:
+                await loop.run_in_executor(None, parse_batch, batch)
+            else:
+                parse_batch(batch)
+            await asyncio.sleep(0)
+
+    done = True
+    await ticker_task
+    return max(lags) * 1000, sum(lags) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--switches", type=int, default=10, help="simulated switches per cycle")
+    arg_parser.add_argument("--cycles", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    parser = load_module("parser")
+    page_parsers = {
+        "pse_system.html": parser.parse_pse_system,
+        "pse_port.html": parser.parse_pse_port,
+        "info.html": parser.parse_info,
+        "port.html": parser.parse_port_settings,
+        "port_stats.html": parser.parse_port_stats,
+    }
+
+    batches = []
+    for model in fixture_models():
+        fixtures = load_fixtures(model)
+        batches.append([(parse, fixtures[name]) for name, parse in page_parsers.items() if name in fixtures])
+    batches = [batches[i % len(batches)] for i in range(args.switches)]
+
+    for label, offload in (("inline", False), ("executor", True)):
+        max_lag, total_lag = asyncio.run(measure(parser.timed_parse_batch, batches, offload, args.cycles))
+        print(f"{label:<9} max loop stall {max_lag:8.2f} ms   total loop stall {total_lag:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Micro-benchmark: fast table extractor vs. the original BeautifulSoup parsers.
+
+Runs every page parser against the synthetic pages in benchmarks/fixtures,
+checks that the result is identical to the original BeautifulSoup
+implementation and prints the time per parse for both.
+
+Usage:
+    python benchmarks/bench_parsers.py [--number 200]
+"""
+import argparse
+import timeit
+
+from bs4 import BeautifulSoup
+
+from common import fixture_models, load_fixtures, load_module
+
+
+# -------------------------------------------------------------------------
+# ORIGINAL BEAUTIFULSOUP PARSERS (reference implementation)
+# -------------------------------------------------------------------------
+
+def legacy_parse_info(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    data = {}
+    for row in soup.find_all('tr'):
+        cols = row.find_all(['th', 'td'])
+        if len(cols) == 2:
+            key = cols[0].get_text(strip=True)
+            value = cols[1].get_text(strip=True)
+            if "Device Model" in key: data["model"] = value
+            elif "Firmware Version" in key: data["firmware"] = value
+            elif "MAC Address" in key: data["mac"] = value
+            elif "Hardware Version" in key: data["hardware"] = value
+            elif "IP Address" in key: data["ip_address"] = value
+            elif "Netmask" in key: data["netmask"] = value
+            elif "Gateway" in key: data["gateway"] = value
+            elif "Firmware Date" in key: data["firmware_date"] = value
+    return data
+
+
+def legacy_parse_pse_system(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    data = {}
+    input_tag = soup.find('input', {'name': 'pse_con_pwr'})
+    if input_tag and input_tag.get('value'):
+        try:
+            data["poe_total_power"] = float(input_tag['value'])
+        except ValueError:
+            pass
+    return data
+
+
+def legacy_parse_pse_port(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    data = {"ports": {}}
+    tables = soup.find_all('table')
+    if len(tables) < 2:
+        return data
+    for row in tables[1].find_all('tr')[1:]:
+        cols = row.find_all('td')
+        if len(cols) >= 7:
+            try:
+                port_num = int(cols[0].get_text(strip=True).replace("Port ", ""))
+            except ValueError:
+                continue
+
+            def parse_val(text):
+                return float(text) if text != "-" else 0.0
+
+            data["ports"][port_num] = {
+                "power": parse_val(cols[4].get_text(strip=True)),
+                "voltage": parse_val(cols[5].get_text(strip=True)),
+                "current": parse_val(cols[6].get_text(strip=True)),
+                "enabled": "Enable" in cols[1].get_text(strip=True)
+            }
+    return data
+
+
+def legacy_parse_port_settings(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    data = {"ports": {}}
+    tables = soup.find_all('table')
+    if not tables:
+        return data
+    for row in tables[-1].find_all('tr'):
+        cols = row.find_all('td')
+        if len(cols) >= 6:
+            port_text = cols[0].get_text(strip=True)
+            if "Port" not in port_text:
+                continue
+            try:
+                port_num = int(port_text.replace("Port ", ""))
+            except ValueError:
+                continue
+            data["ports"][port_num] = {
+                "admin_state": cols[1].get_text(strip=True) == "Enable",
+                "config_speed": cols[2].get_text(strip=True),
+                "speed": cols[3].get_text(strip=True),
+                "config_flow": cols[4].get_text(strip=True) == "On",
+                "flow_control": cols[5].get_text(strip=True)
+            }
+    return data
+
+
+def legacy_parse_port_stats(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    data = {"ports": {}}
+    tables = soup.find_all('table')
+    if not tables:
+        return data
+    for row in tables[0].find_all('tr'):
+        cols = row.find_all(['td'])
+        if len(cols) >= 7:
+            port_text = cols[0].get_text(strip=True)
+            if "Port" not in port_text:
+                continue
+            try:
+                port_num = int(port_text.replace("Port ", ""))
+            except ValueError:
+                continue
+
+            def parse_bigint(text_content):
+                if "-" in text_content:
+                    parts = text_content.split("-")
+                    try:
+                        return (int(parts[0]) * 4294967296) + int(parts[1])
+                    except ValueError:
+                        return 0
+                return 0
+
+            data["ports"][port_num] = {
+                "is_link_up": "Link Up" in cols[2].get_text(strip=True),
+                "tx_packets": parse_bigint(cols[3].get_text(strip=True)),
+                "rx_packets": parse_bigint(cols[5].get_text(strip=True)),
+                "tx_errors": int(cols[4].get_text(strip=True)),
+                "rx_errors": int(cols[6].get_text(strip=True))
+            }
+    return data
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--number", type=int, default=200, help="parses per measurement")
+    args = arg_parser.parse_args()
+
+    parser = load_module("parser")
+    pages = {
+        "info.html": (legacy_parse_info, parser.parse_info),
+        "pse_system.html": (legacy_parse_pse_system, parser.parse_pse_system),
+        "pse_port.html": (legacy_parse_pse_port, parser.parse_pse_port),
+        "port.html": (legacy_parse_port_settings, parser.parse_port_settings),
+        "port_stats.html": (legacy_parse_port_stats, parser.parse_port_stats),
+    }
+
+    print(f"{'fixture':<42} {'bs4 (us)':>10} {'fast (us)':>10} {'speedup':>8}")
+    total_legacy = total_fast = 0.0
+    for model in fixture_models():
+        fixtures = load_fixtures(model)
+        for page_name, (legacy, fast) in pages.items():
+            if page_name not in fixtures:
+                continue
+            html = fixtures[page_name]
+
+            if legacy(html) != fast(html):
+                raise SystemExit(f"MISMATCH in {model}/{page_name}")
+
+            legacy_us = min(timeit.repeat(lambda: legacy(html), number=args.number, repeat=3)) / args.number * 1e6
+            fast_us = min(timeit.repeat(lambda: fast(html), number=args.number, repeat=3)) / args.number * 1e6
+            total_legacy += legacy_us
+            total_fast += fast_us
+            print(f"{model + '/' + page_name:<42} {legacy_us:>10.1f} {fast_us:>10.1f} {legacy_us / fast_us:>7.1f}x")
+
+    print(f"{'TOTAL':<42} {total_legacy:>10.1f} {total_fast:>10.1f} {total_legacy / total_fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark: port state as nested dicts vs. PortState records.
+
+Builds the full port state of every fixture model once as the former
+read-only dict snapshot ({"ports": {n: MappingProxyType({...})}}) and once
+as a PortTable of slotted PortState records, and reports:
+
+- memory per switch (tracemalloc, everything the port state keeps alive)
+- the cost of one entity property read: the old
+  coordinator.data.get("ports", {}).get(n, {}).get(field) chain vs. a
+  direct attribute read on the record the entity holds
+
+Usage:
+    python benchmarks/bench_ports.py [--switches 50] [--reads 200000]
+"""
+import argparse
+import timeit
+import tracemalloc
+from types import MappingProxyType
+
+from common import fixture_models, load_fixtures, load_module
+
+PAGE_PARSERS = (
+    ("pse_port.html", "parse_pse_port"),
+    ("port.html", "parse_port_settings"),
+    ("port_stats.html", "parse_port_stats"),
+)
+RATE_FIELDS = ("tx_packets_rate", "rx_packets_rate", "tx_errors_rate", "rx_errors_rate")
+
+
+def port_fields(parser, fixtures):
+    """{port: {field: value}} of one switch, including the derived rates."""
+    ports = {}
+    for page, name in PAGE_PARSERS:
+        if page in fixtures:
+            for port, info in getattr(parser, name)(fixtures[page])["ports"].items():
+                ports.setdefault(port, {}).update(info)
+    for info in ports.values():
+        info.update((field, 0.0) for field in RATE_FIELDS)
+    return ports
+
+
+def build_dicts(ports):
+    return MappingProxyType({"ports": MappingProxyType({port: MappingProxyType(dict(info)) for port, info in ports.items()})})
+
+
+def build_table(ports_module, ports):
+    table = ports_module.PortTable()
+    table.merge(ports, set())
+    return table
+
+
+def measure(build, inputs):
+    """Bytes kept alive per switch by `build`."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [build(ports) for ports in inputs]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return (after - before) / len(inputs)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--switches", type=int, default=50)
+    arg_parser.add_argument("--reads", type=int, default=200000)
+    args = arg_parser.parse_args()
+
+    parser = load_module("parser")
+    ports_module = load_module("ports")
+
+    models = fixture_models()
+    per_model = {model: port_fields(parser, load_fixtures(model)) for model in models}
+    inputs = [per_model[models[index % len(models)]] for index in range(args.switches)]
+
+    dict_bytes = measure(build_dicts, inputs)
+    record_bytes = measure(lambda ports: build_table(ports_module, ports), inputs)
+    print(f"{'port state':<16} {'bytes/switch':>14}")
+    print(f"{'nested dicts':<16} {dict_bytes:>14.0f}")
+    print(f"{'port records':<16} {record_bytes:>14.0f}")
+
+    # One PoE power read, as done by a sensor's native_value on every state write
+    ports = per_model[models[0]]
+    port_num = next(port for port, info in ports.items() if "power" in info)
+    data = build_dicts(ports)
+    record = build_table(ports_module, ports)[port_num]
+    lookups = (
+        ("nested dicts", lambda: data.get("ports", {}).get(port_num, {}).get("power")),
+        ("port records", lambda: record.power),
+    )
+    print(f"\n{'entity read':<16} {'ns/read':>14}")
+    for label, read in lookups:
+        seconds = min(timeit.repeat(read, number=args.reads, repeat=5))
+        print(f"{label:<16} {seconds / args.reads * 1e9:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Benchmark: per-tick copy.deepcopy vs. copy-on-write snapshots vs. port records.
+
+Builds a full coordinator snapshot from the fixture pages, then simulates
+PoE-only ticks (pse_system.cgi + pse_port.cgi, with a few ports changing
+power each time) using the original deepcopy + dict.update path, the
+copy-on-write dict snapshots and the current path (shared PortTable with
+PortState records updated in place), reporting time and bytes allocated per
+tick. Both copy-on-write and record ticks include finding the changed keys.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--ticks 2000] [--switches 10]
+"""
+import argparse
+import copy
+import random
+from types import MappingProxyType
+import time
+import tracemalloc
+
+from common import fixture_models, load_fixtures, load_module
+
+PAGE_PARSERS = (
+    ("pse_system.html", "parse_pse_system"),
+    ("pse_port.html", "parse_pse_port"),
+    ("info.html", "parse_info"),
+    ("port.html", "parse_port_settings"),
+    ("port_stats.html", "parse_port_stats"),
+)
+
+
+def legacy_tick(previous, results):
+    """The original path: deepcopy everything, then update in place."""
+    data = copy.deepcopy(previous) if previous else {"ports": {}}
+    for result in results:
+        for key, value in result.items():
+            if key != "ports":
+                data[key] = value
+        for port, info in result.get("ports", {}).items():
+            if port not in data["ports"]:
+                data["ports"][port] = {}
+            data["ports"][port].update(info)
+    return data
+
+
+_MISSING = object()
+
+
+def cow_tick(previous, results):
+    """Copy-on-write dicts: shallow copies, a new read-only dict per changed port, then a diff."""
+    if previous:
+        data = dict(previous)
+        data["ports"] = dict(previous["ports"])
+    else:
+        data = {"ports": {}}
+    ports = data["ports"]
+    for result in results:
+        for key, value in result.items():
+            if key != "ports":
+                data[key] = value
+        for port, info in result.get("ports", {}).items():
+            current = ports.get(port)
+            if current is None:
+                ports[port] = MappingProxyType(dict(info))
+            elif any(current.get(key, _MISSING) != value for key, value in info.items()):
+                ports[port] = MappingProxyType({**current, **info})
+    data["ports"] = MappingProxyType(ports)
+    snapshot = MappingProxyType(data)
+
+    if previous:
+        changed = {(None, key) for key, value in snapshot.items() if key != "ports" and previous.get(key, _MISSING) != value}
+        for port, info in snapshot["ports"].items():
+            old = previous["ports"].get(port)
+            if old is info:
+                continue
+            changed.update((port, field) for field, value in info.items() if old is None or old.get(field, _MISSING) != value)
+    return snapshot
+
+
+def make_record_tick(snapshot, ports_module):
+    """The current path; every switch owns one PortTable, looked up by its slot in `states`."""
+    tables = {}
+
+    def record_tick(previous, results, index):
+        table = tables.setdefault(index, ports_module.PortTable())
+        data = snapshot.begin_snapshot(previous, table)
+        changed = set()
+        for result in results:
+            snapshot.merge_result(data, result, changed)
+        frozen = snapshot.freeze_snapshot(data)
+        if previous:
+            changed |= snapshot.diff_snapshots(previous, frozen)
+        return frozen
+    return record_tick
+
+
+def poe_results(base_results, rnd):
+    """PoE page results for one tick, with a couple of powered ports drifting."""
+    pse_system, pse_port = base_results
+    ports = {}
+    for port, info in pse_port["ports"].items():
+        if info["power"] and rnd.random() < 0.25:
+            info = dict(info, power=round(info["power"] + rnd.uniform(-0.2, 0.2), 3))
+        ports[port] = info
+    return [pse_system, {"ports": ports}]
+
+
+def run(tick, initial, poe_base, ticks, seed):
+    rnd = random.Random(seed)
+    inputs = [[poe_results(base, rnd) for base in poe_base] for _ in range(ticks)]
+    states = list(initial)
+
+    tracemalloc.start()
+    allocated = 0
+    start = time.perf_counter()
+    for tick_inputs in inputs:
+        for index, results in enumerate(tick_inputs):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            states[index] = tick(states[index], results, index)
+            _, peak = tracemalloc.get_traced_memory()
+            allocated += peak - before
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    per_tick = ticks * len(initial)
+    return elapsed / per_tick * 1e6, allocated / per_tick
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--ticks", type=int, default=2000)
+    arg_parser.add_argument("--switches", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    parser = load_module("parser")
+    snapshot = load_module("snapshot")
+    ports_module = load_module("ports")
+
+    models = fixture_models()
+    full_results, poe_base = [], []
+    for index in range(args.switches):
+        fixtures = load_fixtures(models[index % len(models)])
+        results = [getattr(parser, name)(fixtures[page]) for page, name in PAGE_PARSERS if page in fixtures]
+        full_results.append(results)
+        poe_base.append(results[:2] if "pse_port.html" in fixtures else [{}, {"ports": {}}])
+
+    paths = (
+        ("deepcopy", lambda previous, results, index: legacy_tick(previous, results)),
+        ("copy-on-write", lambda previous, results, index: cow_tick(previous, results)),
+        ("port records", make_record_tick(snapshot, ports_module)),
+    )
+    print(f"{'path':<16} {'time/tick (us)':>15} {'alloc/tick (bytes)':>20}")
+    for label, tick in paths:
+        initial = [tick(None, results, index) for index, results in enumerate(full_results)]
+        micros, allocated = run(tick, initial, poe_base, args.ticks, seed=1)
+        print(f"{label:<16} {micros:>15.1f} {allocated:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark: setup time of a fleet with and without the stored snapshot.
+
+Starts N emulated switches (benchmarks/emulator.py) and sets every one of
+them up concurrently the way async_setup_entry does, twice:
+
+* "switch": no stored snapshot, each switch waits for its startup slot and
+  a full poll before its entities can be created;
+* "stored snapshot": entities are created from the snapshot saved after
+  the first pass and the full poll runs afterwards, in the background.
+
+Reports per-switch time until the entities exist (p50/p95/max) and until
+live data arrived. Needs Home Assistant installed.
+
+Usage:
+    python benchmarks/bench_startup.py [--switches 20] [--ports 9] [--latency 0.05]
+        [--stagger 0.5] [--json PATH]
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import statistics
+import sys
+import tempfile
+import time
+
+from common import ROOT, BenchEntry, async_build_entities, async_create_hass, percentile
+from emulator import async_start_fleet, async_stop_fleet
+
+
+async def _async_setup_switch(hass, fleet, emulator, index, restore):
+    """Set up one switch; returns (coordinator, ms until entities exist, ms until live data, entities)."""
+    from custom_components.keeplink_switch.const import DOMAIN, ENDPOINTS
+    from custom_components.keeplink_switch.coordinator import KeeplinkCoordinator
+    from custom_components.keeplink_switch.store import SnapshotStore
+
+    entry = BenchEntry(f"bench_startup_{index}", {})
+    store = SnapshotStore(hass, entry.entry_id)
+    coordinator = KeeplinkCoordinator(hass, emulator.address, "admin", "admin", 30, 10, fleet=fleet, store=store)
+
+    started = time.perf_counter()
+    stored = await store.async_load() if restore else None
+    if stored is not None:
+        coordinator.restore_snapshot(stored)
+    else:
+        await fleet.async_stagger_startup()
+        coordinator.data = await coordinator._async_fetch_endpoints(frozenset(ENDPOINTS))
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    entities = await async_build_entities(hass, entry)
+    setup_ms = (time.perf_counter() - started) * 1000
+
+    if stored is not None:
+        # The background first refresh
+        await fleet.async_stagger_startup()
+        coordinator.data = await coordinator._async_fetch_endpoints(frozenset(ENDPOINTS))
+    live_ms = (time.perf_counter() - started) * 1000
+    return coordinator, setup_ms, live_ms, len(entities)
+
+
+async def _async_pass(hass, emulators, args, restore):
+    from custom_components.keeplink_switch.fleet import FleetScheduler
+
+    fleet = FleetScheduler(args.fleet_max_in_flight, args.stagger)
+    results = await asyncio.gather(
+        *(_async_setup_switch(hass, fleet, emulator, index, restore) for index, emulator in enumerate(emulators))
+    )
+    coordinators = [coordinator for coordinator, *_ in results]
+    setup_ms = [result[1] for result in results]
+    live_ms = [result[2] for result in results]
+    summary = {
+        "entities": sum(result[3] for result in results),
+        "setup_ms_p50": round(statistics.median(setup_ms), 1),
+        "setup_ms_p95": round(percentile(setup_ms, 0.95), 1),
+        "setup_ms_max": round(max(setup_ms), 1),
+        "live_ms_p50": round(statistics.median(live_ms), 1),
+        "live_ms_max": round(max(live_ms), 1),
+    }
+    return coordinators, summary
+
+
+async def _async_run(args):
+    emulators = await async_start_fleet(args.switches, ports=args.ports, latency=args.latency)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        try:
+            coordinators, live = await _async_pass(hass, emulators, args, restore=False)
+            # What the delayed save (or unloading the entry) leaves on disk
+            for coordinator in coordinators:
+                await coordinator.store.async_save(coordinator)
+                await coordinator.async_close()
+
+            coordinators, restored = await _async_pass(hass, emulators, args, restore=True)
+            for coordinator in coordinators:
+                await coordinator.async_close()
+            return {
+                "switches": args.switches,
+                "ports": args.ports,
+                "latency": args.latency,
+                "stagger": args.stagger,
+                "switch": live,
+                "stored snapshot": restored,
+            }
+        finally:
+            await hass.async_stop(force=True)
+            await async_stop_fleet(emulators)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--switches", type=int, default=20)
+    arg_parser.add_argument("--ports", type=int, default=9)
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="seconds per switch response")
+    arg_parser.add_argument("--stagger", type=float, default=0.5, help="seconds between first refreshes")
+    arg_parser.add_argument("--fleet-max-in-flight", type=int, default=8)
+    arg_parser.add_argument("--json", metavar="PATH", help="write the results to this file")
+    args = arg_parser.parse_args()
+
+    if importlib.util.find_spec("homeassistant") is None:
+        sys.exit("Home Assistant is not installed")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    results = asyncio.run(_async_run(args))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
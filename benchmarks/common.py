@@ -0,0 +1,83 @@
+"""Shared helpers for the offline benchmarks."""
+import importlib.util
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+COMPONENT = os.path.join(ROOT, "custom_components", "keeplink_switch")
+
+
+def load_module(name):
+    """Import a Home Assistant independent module of the integration straight from its file."""
+    spec = importlib.util.spec_from_file_location(f"keeplink_{name}", os.path.join(COMPONENT, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_fixtures(model):
+    """Return {page file name: html} of one fixture model (synthetic pages, see README)."""
+    model_dir = os.path.join(FIXTURES, model)
+    pages = {}
+    for page_name in sorted(os.listdir(model_dir)):
+        if page_name.endswith(".html"):
+            with open(os.path.join(model_dir, page_name), encoding="utf-8") as page_file:
+                pages[page_name] = page_file.read()
+    return pages
+
+
+def fixture_models():
+    """Names of all fixture models."""
+    return sorted(name for name in os.listdir(FIXTURES) if os.path.isdir(os.path.join(FIXTURES, name)))
+
+
+# Captured page file of every endpoint in const.py
+ENDPOINT_PAGES = {
+    "pse_system.cgi": "pse_system.html",
+    "pse_port.cgi": "pse_port.html",
+    "info.cgi": "info.html",
+    "port.cgi": "port.html",
+    "port.cgi?page=stats": "port_stats.html",
+}
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile, fraction in [0, 1]."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+async def async_create_hass(config_dir):
+    """A bare HomeAssistant instance for benchmarks that drive the real coordinator."""
+    from homeassistant.core import HomeAssistant
+
+    try:
+        hass = HomeAssistant(config_dir)
+    except TypeError:
+        # Older cores take no arguments
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+    return hass
+
+
+# Entity platforms of the integration, as forwarded by async_setup_entry
+PLATFORMS = ("sensor", "switch", "binary_sensor", "button", "select")
+
+
+class BenchEntry:
+    """Minimal config entry for the platform setup functions."""
+
+    def __init__(self, entry_id, data):
+        self.entry_id = entry_id
+        self.data = data
+
+
+async def async_build_entities(hass, entry):
+    """Run every platform's setup for the entry's coordinator and return the entities it creates."""
+    import importlib
+
+    entities = []
+    for platform_name in PLATFORMS:
+        module = importlib.import_module(f"custom_components.keeplink_switch.{platform_name}")
+        await module.async_setup_entry(hass, entry, lambda new_entities, *args: entities.extend(new_entities))
+    return entities
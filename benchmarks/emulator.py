@@ -0,0 +1,534 @@
+"""Keeplink switch emulator for load and fleet-scale testing.
+
+Serves info.cgi, pse_system.cgi, pse_port.cgi, port.cgi and
+port.cgi?page=stats in the switch's markup, accepts the same POST payloads
+the integration sends (PoE on/off, port settings, clearing counters and
+reboot.cgi) and checks the `admin` auth cookie, redirecting to login.cgi
+without it, like the real firmware. PoE readings drift and traffic
+counters grow between reads, so every poll sees fresh data.
+
+Many emulated switches can run in one process, each on its own port, with
+configurable port counts, response latency, request limits and keep-alive
+timeout. GET /_emulator/stats returns what a switch saw (requests per page,
+commands, peak concurrency, rejected requests) as JSON.
+
+Usage:
+    python benchmarks/emulator.py [--switches 50] [--ports 9] [--base-port 8080]
+        [--latency 0.05] [--max-connections 2] [--over-limit queue|drop]
+
+Each switch is reachable at http://127.0.0.1:<base-port + n>/ and accepts
+username/password admin/admin; add it to Home Assistant with host
+127.0.0.1:<port>.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import socket
+import time
+
+from aiohttp import web
+
+DEFAULT_USERNAME = "admin"
+DEFAULT_PASSWORD = "admin"
+
+# Speed/duplex payload values and how port.cgi shows them once applied
+SPEED_OPTIONS = (
+    (0, "Auto", "Auto"), (1, "10M/Half", "10 Half"), (2, "10M/Full", "10 Full"), (3, "100M/Half", "100 Half"),
+    (4, "100M/Full", "100 Full"), (5, "1000M/Full", "1000Full"), (6, "2500M/Full", "2.5G Full"), (8, "10G/Full", "10G Full"),
+)
+SPEED_LABELS = {value: label for value, _, label in SPEED_OPTIONS}
+
+# Packets per second a linked port moves, errors are rare
+PACKET_RATE = (50, 20000)
+ERROR_CHANCE = 0.02
+
+
+# -------------------------------------------------------------------------
+# MARKUP
+# -------------------------------------------------------------------------
+
+_HEAD = """<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">
+<HTML>
+<HEAD>
+<meta http-equiv="Content-Type" content="text/html; charset=utf-8">
+<link rel="stylesheet" type="text/css" href="/style.css">
+<script type="text/javascript" src="/js/common.js"></script>
+<script type="text/javascript">
+function SubmitCheck() { return true; }
+var pages = ["<tr><td>x</td></tr>"];
+</script>
+<title>%s</title>
+</HEAD>
+<BODY>
+<center>
+"""
+_TAIL = """</center>
+</BODY>
+</HTML>
+"""
+
+
+def _page(title, body):
+    return _HEAD % title + body + _TAIL
+
+
+def _cell(text):
+    return f'  <td align="center">{text}</td>\n'
+
+
+def _counter(value):
+    """64-bit counters are shown as 'high-low'."""
+    return f"{value >> 32}-{value & 0xFFFFFFFF}"
+
+
+def _port_select(ports, size=4):
+    options = "".join(f'<option value="{port.num - 1}">Port {port.num}</option>\n' for port in ports)
+    return f'<td align="center"><select name="portid" multiple size="{size}">\n{options}</select></td>\n'
+
+
+# -------------------------------------------------------------------------
+# SWITCH STATE
+# -------------------------------------------------------------------------
+
+class EmulatedPort:
+    """State of one port; readings and counters advance with time."""
+
+    def __init__(self, num, poe, sfp, rnd):
+        self.num = num
+        self.poe = poe
+        self.sfp = sfp
+        self.admin_state = rnd.random() > 0.1
+        self.cable = rnd.random() > 0.35
+        self.config_speed = "Auto" if sfp or rnd.random() > 0.3 else rnd.choice(("1000Full", "100 Full", "2.5G Full"))
+        self.config_flow = rnd.random() > 0.7
+        self.negotiated = "10G Full" if sfp else rnd.choice(("2.5G Full", "1000Full", "100 Full"))
+        # PoE: a connected device draws load_ma when powered
+        self.poe_enabled = poe and rnd.random() > 0.15
+        self.poe_class = rnd.randint(1, 4)
+        self.load_ma = rnd.randint(40, 250) if poe and rnd.random() > 0.3 else 0
+        self.voltage = round(rnd.uniform(52.0, 53.8), 1)
+        self.packet_rate = rnd.randint(*PACKET_RATE)
+        self.tx_packets = rnd.randint(0, 3 << 32)
+        self.rx_packets = rnd.randint(0, 3 << 32)
+        self.tx_errors = 0
+        self.rx_errors = 0
+
+    @property
+    def link_up(self):
+        return self.admin_state and self.cable
+
+    @property
+    def delivering(self):
+        return self.poe_enabled and self.load_ma > 0
+
+    def current_ma(self, rnd):
+        """Load with a few percent of jitter, like a real powered device."""
+        return round(self.load_ma * rnd.uniform(0.95, 1.05)) if self.delivering else 0
+
+    def advance(self, elapsed, rnd):
+        if not self.link_up or elapsed <= 0:
+            return
+        packets = int(self.packet_rate * elapsed)
+        self.tx_packets = (self.tx_packets + packets) & 0xFFFFFFFFFFFFFFFF
+        self.rx_packets = (self.rx_packets + int(packets * 1.3)) & 0xFFFFFFFFFFFFFFFF
+        if rnd.random() < ERROR_CHANCE:
+            self.rx_errors = (self.rx_errors + 1) & 0xFFFFFFFF
+
+    def clear_counters(self):
+        self.tx_packets = self.rx_packets = self.tx_errors = self.rx_errors = 0
+
+
+class SwitchState:
+    """One emulated switch: identity, ports and the pages rendered from them."""
+
+    def __init__(self, ports=9, poe_ports=None, sfp_ports=None, model=None, mac=None, budget=None, seed=0):
+        if sfp_ports is None:
+            sfp_ports = range(ports - 1 if ports > 10 else ports, ports + 1)
+        if poe_ports is None:
+            poe_ports = [num for num in range(1, ports + 1) if num not in sfp_ports]
+        self._rnd = random.Random(seed)
+        self.model = model or f"KP-9000-{ports}XHP-EMU"
+        self.mac = mac or "1C:2A:A3:%02X:%02X:%02X" % (seed >> 16 & 0xFF, seed >> 8 & 0xFF, seed & 0xFF)
+        self.budget = budget or 15 * len(poe_ports)
+        self.ports = [EmulatedPort(num, num in poe_ports, num in sfp_ports, self._rnd) for num in range(1, ports + 1)]
+        self._last_advance = time.monotonic()
+
+    def port(self, portid):
+        """Port addressed by the 0-based portid of a command, or None."""
+        try:
+            index = int(portid)
+        except (TypeError, ValueError):
+            return None
+        return self.ports[index] if 0 <= index < len(self.ports) else None
+
+    def advance(self):
+        now = time.monotonic()
+        elapsed, self._last_advance = now - self._last_advance, now
+        for port in self.ports:
+            port.advance(elapsed, self._rnd)
+
+    # --- pages ---
+
+    def info_page(self):
+        rows = (
+            ("Device Model", self.model), ("MAC Address", self.mac), ("IP Address", "192.168.1.168"),
+            ("Netmask", "255.255.255.0"), ("Gateway", "192.168.1.1"), ("Firmware Version", "V1.9"),
+            ("Firmware Date", "Jun 12 2024"), ("Hardware Version", "V1.1"),
+        )
+        body = '<fieldset>\n<legend>System Info</legend>\n<br>\n<table border="1" cellpadding="2" width="60%">\n'
+        for key, value in rows:
+            body += f'  <tr>\n    <th style="width:150px;" align="left">{key}</th>\n    <td align="left">&nbsp;{value}</td>\n  </tr>\n'
+        return _page("System Info", body + "</table>\n</fieldset>\n")
+
+    def _poe_readings(self):
+        readings = {}
+        for port in self.ports:
+            if port.poe:
+                current = port.current_ma(self._rnd)
+                readings[port.num] = (current, round(port.voltage * current / 1000.0, 3))
+        return readings
+
+    def pse_system_page(self, readings=None):
+        readings = readings if readings is not None else self._poe_readings()
+        total = sum(power for _, power in readings.values())
+        body = (
+            '<fieldset>\n<legend>PoE Setting</legend>\n<form method="post" action="/pse_system.cgi" name="poeForm">\n'
+            '<table border="1" width="60%">\n'
+            f'  <tr><th align="left">Maximum Power Available</th><td><input type="text" name="pse_max_pwr" value="{self.budget}" size="8" disabled> W</td></tr>\n'
+            f'  <tr><th align="left">Total Power Consumption</th><td><input type="text" name="pse_con_pwr" value="{total:.3f}" size="8" readonly> W</td></tr>\n'
+            '  <tr><th align="left">Power Mode</th><td><select name="pse_mode"><option value="0" selected>Auto</option><option value="1">Manual</option></select></td></tr>\n'
+            '</table>\n<br>\n<input type="submit" name="submit" value="Apply">\n<input type="hidden" name="cmd" value="poe">\n</form>\n</fieldset>\n'
+        )
+        return _page("PoE Setting", body)
+
+    def pse_port_page(self, readings=None):
+        readings = readings if readings is not None else self._poe_readings()
+        poe_ports = [port for port in self.ports if port.poe]
+        body = (
+            '<fieldset>\n<legend>PoE Port Setting</legend>\n<form method="post" action="/pse_port.cgi" name="pseForm">\n'
+            '<table border="1" width="60%">\n<tr><th>Port</th><th>State</th></tr>\n<tr>\n'
+            + _port_select(poe_ports)
+            + '<td align="center"><select name="state"><option value="0">Disable</option><option value="1">Enable</option></select></td>\n</tr>\n</table>\n'
+            '<br><input type="submit" name="submit" value="Apply"><input type="hidden" name="cmd" value="poe">\n</form>\n<br>\n'
+            '<table border="1" width="80%">\n<tr>\n  <th>Port</th><th>PoE State</th><th>Power Class</th><th>Status</th>'
+            '<th>Power(W)</th><th>Voltage(V)</th><th>Current(mA)</th>\n</tr>\n'
+        )
+        for port in poe_ports:
+            if port.delivering:
+                current, power = readings[port.num]
+                values = (f"Class {port.poe_class}", "Delivering Power", f"{power:.3f}", f"{port.voltage:.1f}", str(current))
+            else:
+                values = ("-", "Searching" if port.poe_enabled else "Disabled", "-", "-", "-")
+            body += "<tr>\n" + _cell(f"Port {port.num}") + _cell("Enable" if port.poe_enabled else "Disable")
+            body += "".join(_cell(value) for value in values) + "</tr>\n"
+        return _page("PoE Port Setting", body + "</table>\n</fieldset>\n")
+
+    def port_page(self):
+        speed_options = "".join(f'<option value="{value}">{text}</option>\n' for value, text, _ in SPEED_OPTIONS)
+        body = (
+            '<fieldset>\n<legend>Port Setting</legend>\n<form method="post" action="/port.cgi" name="portForm">\n'
+            '<table border="1" width="80%">\n<tr><th>Port</th><th>State</th><th>Speed/Duplex</th><th>Flow Control</th></tr>\n<tr>\n'
+            + _port_select(self.ports)
+            + '<td align="center"><select name="state"><option value="1">Enable</option><option value="0">Disable</option></select></td>\n'
+            f'<td align="center"><select name="speed_duplex">\n{speed_options}</select></td>\n'
+            '<td align="center"><select name="flow"><option value="0">Off</option><option value="1">On</option></select></td>\n</tr>\n</table>\n'
+            '<br><input type="submit" name="submit" value="   Apply   "><input type="hidden" name="cmd" value="port">\n</form>\n<br>\n'
+            '<table border="1" width="80%">\n<tr>\n  <th rowspan="2">Port</th><th rowspan="2">State</th>'
+            '<th colspan="2">Speed/Duplex</th><th colspan="2">Flow Control</th>\n</tr>\n'
+            '<tr>\n  <th>Config</th><th>Actual</th><th>Config</th><th>Actual</th>\n</tr>\n'
+        )
+        for port in self.ports:
+            if port.link_up:
+                actual = port.negotiated if port.config_speed == "Auto" else port.config_speed
+                flow_actual = "On" if port.config_flow else "Off"
+            else:
+                actual, flow_actual = "Link Down", "Off"
+            body += "<tr>\n" + _cell(f"Port {port.num}") + _cell("Enable" if port.admin_state else "Disable")
+            body += _cell(port.config_speed) + _cell(actual) + _cell("On" if port.config_flow else "Off") + _cell(flow_actual)
+            body += "</tr>\n"
+        return _page("Port Setting", body + "</table>\n</fieldset>\n")
+
+    def port_stats_page(self):
+        self.advance()
+        body = (
+            '<fieldset>\n<legend>Port Statistics</legend>\n<table border="1" width="90%">\n<tr>\n'
+            '  <th>Port</th><th>State</th><th>Link Status</th><th>TxGoodPkt</th><th>TxBadPkt</th><th>RxGoodPkt</th><th>RxBadPkt</th>\n</tr>\n'
+        )
+        for port in self.ports:
+            body += "<tr>\n" + _cell(f"Port {port.num}") + _cell("Enable" if port.admin_state else "Disable")
+            body += _cell("Link Up" if port.link_up else "Link Down")
+            body += _cell(_counter(port.tx_packets)) + _cell(port.tx_errors)
+            body += _cell(_counter(port.rx_packets)) + _cell(port.rx_errors) + "</tr>\n"
+        body += (
+            '</table>\n<br>\n<form method="post" action="/port.cgi?page=stats" name="statsForm">\n'
+            '<input type="submit" name="submit" value="   Clear   ">\n<input type="hidden" name="cmd" value="stats">\n</form>\n</fieldset>\n'
+        )
+        return _page("Port Statistics", body)
+
+    @staticmethod
+    def login_page():
+        body = (
+            '<fieldset>\n<legend>Login</legend>\n<form method="post" action="/login.cgi" name="loginForm">\n'
+            '<table border="1" width="40%">\n'
+            '  <tr><th align="left">Username</th><td><input type="text" name="username" value=""></td></tr>\n'
+            '  <tr><th align="left">Password</th><td><input type="password" name="password" value=""></td></tr>\n'
+            '</table>\n<br>\n<input type="submit" name="submit" value="Login">\n</form>\n</fieldset>\n'
+        )
+        return _page("Login", body)
+
+    # --- commands ---
+
+    def set_poe(self, form):
+        port = self.port(form.get("portid"))
+        if port is None or not port.poe:
+            return False
+        port.poe_enabled = form.get("state") == "1"
+        return True
+
+    def set_port(self, form):
+        port = self.port(form.get("portid"))
+        if port is None:
+            return False
+        try:
+            label = SPEED_LABELS[int(form.get("speed_duplex", 0))]
+        except (KeyError, ValueError):
+            return False
+        port.admin_state = form.get("state") == "1"
+        port.config_speed = label
+        port.config_flow = form.get("flow") == "1"
+        return True
+
+    def clear_counters(self):
+        for port in self.ports:
+            port.clear_counters()
+
+
+# -------------------------------------------------------------------------
+# HTTP SERVER
+# -------------------------------------------------------------------------
+
+class SwitchEmulator:
+    """One emulated switch served over HTTP on its own port.
+
+    latency: seconds added to every response (+-jitter, as a fraction).
+    max_connections: requests handled at once; more either wait ("queue")
+    or get their connection closed ("drop"), like an overloaded switch.
+    keepalive_timeout: seconds an idle keep-alive connection stays open.
+    reboot_time: seconds the switch stays unreachable after reboot.cgi.
+    """
+
+    def __init__(self, state=None, host="127.0.0.1", port=0, username=DEFAULT_USERNAME, password=DEFAULT_PASSWORD,
+                 latency=0.0, jitter=0.2, max_connections=2, over_limit="queue", keepalive_timeout=20.0,
+                 reboot_time=30.0):
+        if over_limit not in ("queue", "drop"):
+            raise ValueError(f"Unknown over_limit policy: {over_limit}")
+        self.state = state or SwitchState()
+        self.host = host
+        self.port = port
+        self.auth_cookie = hashlib.md5(f"{username}{password}".encode()).hexdigest()
+        self.latency = latency
+        self.jitter = jitter
+        self.over_limit = over_limit
+        self.keepalive_timeout = keepalive_timeout
+        self.reboot_time = reboot_time
+        self._slots = asyncio.Semaphore(max(1, max_connections))
+        self._rnd = random.Random()
+        self._runner = None
+        self._offline_until = 0.0
+        self.in_flight = 0
+        self.stats = {
+            "requests": {},
+            "commands": {},
+            "auth_redirects": 0,
+            "rejected": 0,
+            "dropped_offline": 0,
+            "max_in_flight": 0,
+        }
+
+    @property
+    def address(self):
+        """host:port to configure in the integration."""
+        return f"{self.host}:{self.port}"
+
+    def _app(self):
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/info.cgi", lambda request: self._html(self.state.info_page()))
+        app.router.add_get("/pse_system.cgi", lambda request: self._html(self.state.pse_system_page()))
+        app.router.add_get("/pse_port.cgi", lambda request: self._html(self.state.pse_port_page()))
+        app.router.add_get("/port.cgi", self._get_port)
+        app.router.add_get("/login.cgi", lambda request: self._html(self.state.login_page()))
+        app.router.add_post("/login.cgi", self._post_login)
+        app.router.add_post("/pse_port.cgi", self._post_poe)
+        app.router.add_post("/port.cgi", self._post_port)
+        app.router.add_post("/reboot.cgi", self._post_reboot)
+        app.router.add_get("/_emulator/stats", self._get_stats)
+        return app
+
+    async def start(self):
+        # Bind first so port=0 gets a free port we can report
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+
+        self._runner = web.AppRunner(self._app(), keepalive_timeout=self.keepalive_timeout, access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @staticmethod
+    def _html(text):
+        return web.Response(text=text, content_type="text/html", charset="utf-8")
+
+    @staticmethod
+    def _drop(request):
+        """Close the connection without an answer, like a switch that is down or overloaded."""
+        if request.transport is not None:
+            request.transport.close()
+        return web.Response(status=503)
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.path.startswith("/_emulator/"):
+            return await handler(request)
+
+        page = request.path_qs.lstrip("/")
+        requests = self.stats["requests"]
+        requests[page] = requests.get(page, 0) + 1
+        if time.monotonic() < self._offline_until:
+            self.stats["dropped_offline"] += 1
+            return self._drop(request)
+
+        # The firmware only checks the cookie the login page sets
+        if request.path != "/login.cgi" and request.cookies.get("admin") != self.auth_cookie:
+            self.stats["auth_redirects"] += 1
+            raise web.HTTPFound("/login.cgi")
+
+        if self.over_limit == "drop" and self._slots.locked():
+            self.stats["rejected"] += 1
+            return self._drop(request)
+
+        async with self._slots:
+            self.in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.in_flight)
+            try:
+                if self.latency:
+                    await asyncio.sleep(self.latency * self._rnd.uniform(1 - self.jitter, 1 + self.jitter))
+                return await handler(request)
+            finally:
+                self.in_flight -= 1
+
+    def _count_command(self, name):
+        commands = self.stats["commands"]
+        commands[name] = commands.get(name, 0) + 1
+
+    async def _get_port(self, request):
+        if request.query.get("page") == "stats":
+            return self._html(self.state.port_stats_page())
+        return self._html(self.state.port_page())
+
+    async def _get_stats(self, request):
+        return web.json_response({"address": self.address, **self.stats})
+
+    async def _post_login(self, request):
+        form = await request.post()
+        if hashlib.md5(f"{form.get('username', '')}{form.get('password', '')}".encode()).hexdigest() != self.auth_cookie:
+            return self._html(self.state.login_page())
+        response = web.HTTPFound("/info.cgi")
+        response.set_cookie("admin", self.auth_cookie)
+        raise response
+
+    async def _post_poe(self, request):
+        form = await request.post()
+        if form.get("cmd") == "poe" and self.state.set_poe(form):
+            self._count_command("poe")
+        return self._html(self.state.pse_port_page())
+
+    async def _post_port(self, request):
+        form = await request.post()
+        if request.query.get("page") == "stats":
+            if form.get("cmd") == "stats":
+                self.state.clear_counters()
+                self._count_command("stats")
+            return self._html(self.state.port_stats_page())
+        if form.get("cmd") == "port" and self.state.set_port(form):
+            self._count_command("port")
+        return self._html(self.state.port_page())
+
+    async def _post_reboot(self, request):
+        form = await request.post()
+        if form.get("cmd") == "reboot":
+            self._count_command("reboot")
+            self._offline_until = time.monotonic() + self.reboot_time
+            self.state.clear_counters()
+        return self._html(_page("Reboot", "<p>Rebooting...</p>\n"))
+
+
+async def async_start_fleet(count, ports=9, base_port=0, seed=0, **options):
+    """Start `count` emulated switches in this process (base_port=0 picks free ports)."""
+    emulators = []
+    for index in range(count):
+        state = SwitchState(ports=ports, seed=seed + index)
+        emulator = SwitchEmulator(state, port=base_port + index if base_port else 0, **options)
+        await emulator.start()
+        emulators.append(emulator)
+    return emulators
+
+
+async def async_stop_fleet(emulators):
+    await asyncio.gather(*(emulator.stop() for emulator in emulators))
+
+
+async def _async_main(args):
+    emulators = await async_start_fleet(
+        args.switches,
+        ports=args.ports,
+        base_port=args.base_port,
+        host=args.host,
+        latency=args.latency,
+        max_connections=args.max_connections,
+        over_limit=args.over_limit,
+        keepalive_timeout=args.keepalive_timeout,
+        reboot_time=args.reboot_time,
+    )
+    print(f"{len(emulators)} emulated switches ({args.ports} ports, login admin/admin):")
+    for emulator in emulators:
+        print(f"  http://{emulator.address}/")
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        totals = {}
+        for emulator in emulators:
+            for page, count in emulator.stats["requests"].items():
+                totals[page] = totals.get(page, 0) + count
+        print(json.dumps({"requests": totals}, indent=2))
+        await async_stop_fleet(emulators)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--switches", type=int, default=1)
+    arg_parser.add_argument("--ports", type=int, default=9)
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--base-port", type=int, default=8080, help="first switch's port, 0 for random ports")
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="seconds per response")
+    arg_parser.add_argument("--max-connections", type=int, default=2, help="requests a switch handles at once")
+    arg_parser.add_argument("--over-limit", choices=("queue", "drop"), default="queue")
+    arg_parser.add_argument("--keepalive-timeout", type=float, default=20.0)
+    arg_parser.add_argument("--reboot-time", type=float, default=30.0)
+    args = arg_parser.parse_args()
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
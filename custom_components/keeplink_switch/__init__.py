@@ -1,49 +1,159 @@
 """The Keeplink Switch integration."""
 import logging
+import time
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN, CONF_HOST, CONF_USERNAME, CONF_PASSWORD, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, CONF_POE_SCAN_INTERVAL, DEFAULT_POE_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    CONF_HOST,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    CONF_POE_SCAN_INTERVAL,
+    DEFAULT_POE_SCAN_INTERVAL,
+    CONF_INFO_SCAN_INTERVAL,
+    DEFAULT_INFO_SCAN_INTERVAL,
+    CONF_SETTINGS_SCAN_INTERVAL,
+    DEFAULT_SETTINGS_SCAN_INTERVAL,
+    CONF_POE_ADAPTIVE,
+    DEFAULT_POE_ADAPTIVE,
+    CONF_POE_MIN_INTERVAL,
+    DEFAULT_POE_MIN_INTERVAL,
+    CONF_POE_MAX_INTERVAL,
+    DEFAULT_POE_MAX_INTERVAL,
+    CONF_POE_CHANGE_THRESHOLD,
+    DEFAULT_POE_CHANGE_THRESHOLD,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    CONF_INLINE_PARSE_MAX_BYTES,
+    DEFAULT_INLINE_PARSE_MAX_BYTES,
+    CONF_COMMAND_RATE,
+    DEFAULT_COMMAND_RATE,
+    FLEET_SCHEDULER,
+    DEFAULT_FLEET_MAX_IN_FLIGHT,
+    DEFAULT_FLEET_STARTUP_STAGGER
+)
 from .coordinator import KeeplinkCoordinator
+from .fleet import FleetScheduler
+from .profiling import CycleProfiler
+from .services import async_setup_services, async_unload_services
+from .store import SnapshotStore
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor", "switch", "binary_sensor", "button", "select"]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Keeplink Switch from a config entry."""
-    
-    session = async_get_clientsession(hass)
+
+    # One scheduler shared by every switch spreads polls and caps requests fleet-wide
+    hass.data.setdefault(DOMAIN, {})
+    fleet = hass.data[DOMAIN].get(FLEET_SCHEDULER)
+    if fleet is None:
+        fleet = FleetScheduler(DEFAULT_FLEET_MAX_IN_FLIGHT, DEFAULT_FLEET_STARTUP_STAGGER)
+        hass.data[DOMAIN][FLEET_SCHEDULER] = fleet
+
     scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     poe_scan_interval = entry.data.get(CONF_POE_SCAN_INTERVAL, DEFAULT_POE_SCAN_INTERVAL)
+    max_concurrent_requests = entry.data.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
+    inline_parse_max_bytes = entry.data.get(CONF_INLINE_PARSE_MAX_BYTES, DEFAULT_INLINE_PARSE_MAX_BYTES)
+    info_scan_interval = entry.data.get(CONF_INFO_SCAN_INTERVAL, DEFAULT_INFO_SCAN_INTERVAL)
+    settings_scan_interval = entry.data.get(CONF_SETTINGS_SCAN_INTERVAL, DEFAULT_SETTINGS_SCAN_INTERVAL)
 
+    store = SnapshotStore(hass, entry.entry_id)
     coordinator = KeeplinkCoordinator(
         hass, 
-        session, 
         entry.data[CONF_HOST], 
         entry.data[CONF_USERNAME], 
         entry.data[CONF_PASSWORD],
         scan_interval,
-        poe_scan_interval # Pass the new parameter
+        poe_scan_interval, # Pass the new parameter
+        max_concurrent_requests,
+        inline_parse_max_bytes,
+        info_scan_interval,
+        settings_scan_interval,
+        poe_adaptive=entry.data.get(CONF_POE_ADAPTIVE, DEFAULT_POE_ADAPTIVE),
+        poe_min_interval=entry.data.get(CONF_POE_MIN_INTERVAL, DEFAULT_POE_MIN_INTERVAL),
+        poe_max_interval=entry.data.get(CONF_POE_MAX_INTERVAL, DEFAULT_POE_MAX_INTERVAL),
+        poe_change_threshold=entry.data.get(CONF_POE_CHANGE_THRESHOLD, DEFAULT_POE_CHANGE_THRESHOLD),
+        command_rate=entry.data.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE),
+        fleet=fleet,
+        store=store
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # With a stored snapshot the entities are created right away (marked stale) and
+    # the switch is read in the background; otherwise the first poll discovers the ports
+    started = time.perf_counter()
+    stored = await store.async_load()
+    if stored is not None:
+        coordinator.restore_snapshot(stored)
+    else:
+        # Stagger first refreshes so a restart doesn't hit every switch at the same moment
+        await fleet.async_stagger_startup()
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            # Setup is retried with a new coordinator, don't leak this one's connections
+            fleet.unregister(coordinator.host)
+            await coordinator.async_close()
+            raise
 
-    hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_services(hass)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
+    source = "stored snapshot" if stored is not None else "switch"
+    coordinator.startup_stats = {"source": source, "setup_ms": round((time.perf_counter() - started) * 1000, 1)}
+    _LOGGER.debug(f"Set up Keeplink Switch ({coordinator.host}) from the {source} in {coordinator.startup_stats['setup_ms']} ms")
+
+    if stored is not None:
+        entry.async_create_background_task(
+            hass, _async_first_live_refresh(hass, entry, coordinator, fleet), f"Keeplink first refresh ({coordinator.host})"
+        )
+
     return True
 
+async def _async_first_live_refresh(hass, entry, coordinator, fleet):
+    """First poll after starting from the stored snapshot; reload if the switch now has other ports."""
+    layout = coordinator.profile.as_dict()
+    await fleet.async_stagger_startup()
+    started = time.perf_counter()
+    await coordinator.async_refresh()
+    coordinator.startup_stats["first_refresh_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    if coordinator.last_update_success and layout != coordinator.profile.as_dict():
+        _LOGGER.info(f"Port layout of Keeplink Switch ({coordinator.host}) changed since the stored snapshot, reloading")
+        hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # A reload (e.g. after changing options) starts from the current state
+        if coordinator.data and coordinator.store is not None:
+            await coordinator.store.async_save(coordinator)
+        if CycleProfiler.active is not None and CycleProfiler.active.coordinator is coordinator:
+            CycleProfiler.active.cancel()
+        await coordinator.async_close()
+        fleet = hass.data[DOMAIN].get(FLEET_SCHEDULER)
+        if fleet is not None:
+            fleet.unregister(coordinator.host)
+            if not fleet.members:
+                hass.data[DOMAIN].pop(FLEET_SCHEDULER)
+                # That was the last switch
+                async_unload_services(hass)
 
     return unload_ok
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry when options change."""
-    await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
+    await hass.config_entries.async_reload(entry.entry_id)
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored snapshot of a removed switch."""
+    await SnapshotStore(hass, entry.entry_id).async_remove()
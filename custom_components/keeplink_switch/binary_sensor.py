@@ -3,19 +3,26 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorDeviceClass,
 )
+from datetime import datetime, timezone
+
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 
 from .const import DOMAIN
 
+# Port fields shown by the link sensor (state + attributes)
+LINK_SENSOR_KEYS = (
+    "is_link_up", "speed", "flow_control", "tx_packets", "rx_packets",
+    "tx_errors", "rx_errors", "power", "voltage", "current",
+)
+
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the Keeplink Switch binary sensors."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
     
-    sensors = []
-    if "ports" in coordinator.data:
-        for port_num in coordinator.data["ports"]:
-            sensors.append(KeeplinkPortBinarySensor(coordinator, port_num))
+    sensors = [KeeplinkStaleBinarySensor(coordinator)]
+    for port_num in coordinator.profile.ports:
+        sensors.append(KeeplinkPortBinarySensor(coordinator, port_num))
 
     async_add_entities(sensors)
 
@@ -24,8 +31,9 @@ class KeeplinkPortBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     def __init__(self, coordinator, port_num):
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset((port_num, field) for field in LINK_SENSOR_KEYS))
         self.port_num = port_num
+        self._port = coordinator.ports[port_num]
         self._attr_unique_id = f"{coordinator.mac_address}_port{port_num}_link"
         self._attr_name = f"Keeplink Port {port_num} Link"
         self._attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
@@ -34,15 +42,12 @@ class KeeplinkPortBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self):
         """Return true if the binary sensor is on (Link Up)."""
-        port_data = self.coordinator.data.get("ports", {}).get(self.port_num)
-        if port_data:
-            return port_data.get("is_link_up", False)
-        return False
+        return bool(self._port.is_link_up)
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        port_data = self.coordinator.data.get("ports", {}).get(self.port_num, {})
+        port_data = self._port
         
         attributes = {
             "speed": port_data.get("speed", "Unknown"),
@@ -54,10 +59,10 @@ class KeeplinkPortBinarySensor(CoordinatorEntity, BinarySensorEntity):
         }
         
         # FIX: Using the correct keys "power", "voltage", "current"
-        if "power" in port_data:
-            attributes["poe_power_w"] = port_data["power"]
-            attributes["poe_voltage_v"] = port_data["voltage"]
-            attributes["poe_current_ma"] = port_data["current"]
+        if port_data.power is not None:
+            attributes["poe_power_w"] = port_data.power
+            attributes["poe_voltage_v"] = port_data.voltage
+            attributes["poe_current_ma"] = port_data.current
             
         return attributes
 
@@ -65,4 +70,35 @@ class KeeplinkPortBinarySensor(CoordinatorEntity, BinarySensorEntity):
     def device_info(self) -> DeviceInfo:
         return DeviceInfo(
             identifiers={(DOMAIN, self.coordinator.mac_address)},
-        )
\ No newline at end of file
+        )
+
+
+class KeeplinkStaleBinarySensor(CoordinatorEntity, BinarySensorEntity):
+    """On while the entities show the snapshot stored before a restart and the switch hasn't been read yet."""
+
+    def __init__(self, coordinator):
+        # Stale only changes on the first poll, which notifies every entity
+        super().__init__(coordinator, frozenset())
+        self._attr_unique_id = f"{coordinator.mac_address}_stale"
+        self._attr_name = "Keeplink Data Stale"
+        self._attr_icon = "mdi:history"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def available(self):
+        """Always available, it also tells apart an offline switch restored from storage."""
+        return True
+
+    @property
+    def is_on(self):
+        return self.coordinator.stale
+
+    @property
+    def extra_state_attributes(self):
+        if not self.coordinator.stale:
+            return {}
+        return {"snapshot_saved_at": datetime.fromtimestamp(self.coordinator.restored_at, timezone.utc).isoformat()}
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
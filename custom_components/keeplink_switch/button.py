@@ -1,5 +1,6 @@
 """Button platform for Keeplink Switch."""
 from homeassistant.components.button import ButtonEntity, ButtonDeviceClass
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 
@@ -13,6 +14,10 @@ async def async_setup_entry(hass, entry, async_add_entities):
         KeeplinkClearStatsButton(coordinator),
         KeeplinkRebootButton(coordinator)
     ]
+
+    # PoE power cycle per PoE-capable port
+    for port_num in sorted(coordinator.profile.poe_ports):
+        buttons.append(KeeplinkPowerCycleButton(coordinator, port_num))
     
     async_add_entities(buttons)
 
@@ -20,7 +25,8 @@ async def async_setup_entry(hass, entry, async_add_entities):
 class KeeplinkClearStatsButton(CoordinatorEntity, ButtonEntity):
     """Representation of a Clear Stats Button."""
     def __init__(self, coordinator):
-        super().__init__(coordinator)
+        # Buttons have no state, they only need updates when availability changes
+        super().__init__(coordinator, frozenset())
         self._attr_unique_id = f"{coordinator.mac_address}_clear_stats"
         self._attr_name = "Keeplink Clear Statistics"
         self._attr_icon = "mdi:delete-sweep"
@@ -37,10 +43,33 @@ class KeeplinkClearStatsButton(CoordinatorEntity, ButtonEntity):
         return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
 
 
+class KeeplinkPowerCycleButton(CoordinatorEntity, ButtonEntity):
+    """Turns PoE off and back on for one port (e.g. to restart a hung camera)."""
+    def __init__(self, coordinator, port_num):
+        super().__init__(coordinator, frozenset())
+        self.port_num = port_num
+        self._attr_unique_id = f"{coordinator.mac_address}_port{port_num}_poe_power_cycle"
+        self._attr_name = f"Keeplink Port {port_num} PoE Power Cycle"
+        self._attr_device_class = ButtonDeviceClass.RESTART
+        self._attr_icon = "mdi:power-cycle"
+        self._attr_entity_category = EntityCategory.CONFIG
+
+    async def async_press(self) -> None:
+        """Handle the button press."""
+        results = await self.coordinator.async_power_cycle([self.port_num])
+        error = results.get(self.port_num)
+        if error is not None:
+            raise HomeAssistantError(f"PoE power cycle of port {self.port_num} failed: {error}")
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
+
 class KeeplinkRebootButton(CoordinatorEntity, ButtonEntity):
     """Representation of a Reboot Switch Button."""
     def __init__(self, coordinator):
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset())
         self._attr_unique_id = f"{coordinator.mac_address}_reboot"
         self._attr_name = "Keeplink Reboot Device"
         self._attr_device_class = ButtonDeviceClass.RESTART
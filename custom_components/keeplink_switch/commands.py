@@ -0,0 +1,174 @@
+"""Per-switch command queue for Keeplink Switch.
+
+Writes to a switch go through one queue that sends them one at a time.
+A write for a target that is still waiting in the queue (same port, same
+kind of command) is merged into the pending one instead of being sent
+twice. Once the queue drains, a single verification refresh covers every
+page the batch touched.
+"""
+import asyncio
+import logging
+import time
+
+from .const import DEFAULT_COMMAND_RATE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Wait this long after the first command before sending, so a scene's calls land in one batch
+COMMAND_BATCH_WINDOW = 0.05
+
+
+class Command:
+    """One pending write: a coalescing key, the fields to write and the pages it affects."""
+
+    __slots__ = ("key", "fields", "endpoints", "future", "created")
+
+    def __init__(self, key, fields, endpoints, future):
+        self.key = key
+        self.fields = fields
+        self.endpoints = endpoints
+        self.future = future
+        # Monotonic time of the first submit, for time-to-UI measurements
+        self.created = time.monotonic()
+
+
+class CommandQueue:
+    """Serializes and coalesces writes to one switch.
+
+    send(command) performs the write and refresh(endpoints) runs once per
+    drained batch with the union of the pages the batch touched. Writes are
+    spaced so no more than `rate` go out per second.
+    """
+
+    def __init__(self, send, refresh, rate=DEFAULT_COMMAND_RATE, batch_window=COMMAND_BATCH_WINDOW):
+        self._send = send
+        self._refresh = refresh
+        self.batch_window = batch_window
+        self.min_spacing = 1.0 / rate if rate > 0 else 0.0
+        self._last_send = None
+        self._pending = {}
+        self._worker = None
+        self._shutting_down = False
+        self.stats = {
+            "depth": 0,
+            "max_depth": 0,
+            "submitted": 0,
+            "coalesced": 0,
+            "sent": 0,
+            "failed": 0,
+            "batches": 0,
+            "last_batch_size": 0,
+            "max_batch_size": 0,
+        }
+
+    def submit(self, key, fields, endpoints=()):
+        """Queue a write and return a future that resolves once it was sent.
+
+        If a write with the same key is still pending, the new fields are
+        merged into it (later values win) and both callers share its future.
+        """
+        self.stats["submitted"] += 1
+        command = self._pending.get(key)
+        if command is not None:
+            command.fields.update(fields)
+            command.endpoints |= frozenset(endpoints)
+            self.stats["coalesced"] += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            command = self._pending[key] = Command(key, dict(fields), frozenset(endpoints), future)
+            self.stats["depth"] = len(self._pending)
+            self.stats["max_depth"] = max(self.stats["max_depth"], self.stats["depth"])
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._async_drain())
+        return command.future
+
+    async def _async_drain(self):
+        """Send batches until the queue stays empty; each batch ends with one refresh."""
+        try:
+            while self._pending:
+                await asyncio.sleep(self.batch_window)
+                touched = await self._async_send_batch()
+                if touched:
+                    try:
+                        await self._refresh(touched)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:  # pylint: disable=broad-except
+                        # The writes went out; the next poll reads the pages anyway
+                        _LOGGER.exception(f"Refresh of {', '.join(sorted(touched))} after a command batch failed")
+        finally:
+            # Commands submitted while this worker was finishing saw it alive and didn't start one
+            if self._pending and not self._shutting_down:
+                self._restart_worker()
+
+    def _restart_worker(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # The event loop is gone (Home Assistant is stopping), nothing to drain into
+            return
+        self._worker = loop.create_task(self._async_drain())
+
+    async def _async_send_batch(self):
+        """Send queued commands until the queue is empty, returning the pages they touched."""
+        touched = set()
+        batch_size = 0
+
+        while self._pending:
+            # Oldest first; merged commands keep the position of the first write
+            key = next(iter(self._pending))
+            command = self._pending.pop(key)
+            self.stats["depth"] = len(self._pending)
+            batch_size += 1
+            try:
+                await self._async_pace()
+                await self._send(command)
+            except asyncio.CancelledError:
+                command.future.cancel()
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                self.stats["failed"] += 1
+                if not command.future.done():
+                    command.future.set_exception(err)
+                    # Callers may not wait for the result, don't log "exception never retrieved"
+                    command.future.exception()
+            else:
+                self.stats["sent"] += 1
+                if not command.future.done():
+                    command.future.set_result(None)
+            touched |= command.endpoints
+
+        self.stats["batches"] += 1
+        self.stats["last_batch_size"] = batch_size
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], batch_size)
+        _LOGGER.debug(f"Command batch of {batch_size} sent, refreshing {', '.join(sorted(touched)) or 'nothing'}")
+        return touched
+
+    async def _async_pace(self):
+        """Sleep until the next write is allowed by the configured rate."""
+        loop = asyncio.get_running_loop()
+        if self._last_send is not None:
+            wait = self._last_send + self.min_spacing - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        self._last_send = loop.time()
+
+    async def async_wait_idle(self):
+        """Wait until every queued write was sent and its batch read back."""
+        while self._worker is not None and not self._worker.done():
+            await asyncio.wait({self._worker})
+
+    async def async_shutdown(self):
+        """Drop pending writes and stop the worker."""
+        self._shutting_down = True
+        for command in self._pending.values():
+            command.future.cancel()
+        self._pending.clear()
+        self.stats["depth"] = 0
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
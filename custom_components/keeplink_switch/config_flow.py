@@ -11,10 +11,21 @@ from .const import (
     DOMAIN, 
     CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL,
     CONF_POE_SCAN_INTERVAL, DEFAULT_POE_SCAN_INTERVAL,
+    CONF_INFO_SCAN_INTERVAL, DEFAULT_INFO_SCAN_INTERVAL,
+    CONF_SETTINGS_SCAN_INTERVAL, DEFAULT_SETTINGS_SCAN_INTERVAL,
+    CONF_POE_ADAPTIVE, DEFAULT_POE_ADAPTIVE,
+    CONF_POE_MIN_INTERVAL, DEFAULT_POE_MIN_INTERVAL,
+    CONF_POE_MAX_INTERVAL, DEFAULT_POE_MAX_INTERVAL,
+    CONF_POE_CHANGE_THRESHOLD, DEFAULT_POE_CHANGE_THRESHOLD,
+    CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS,
+    CONF_INLINE_PARSE_MAX_BYTES, DEFAULT_INLINE_PARSE_MAX_BYTES,
+    CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE,
     CONF_CREATE_TOTAL_ENERGY, DEFAULT_CREATE_TOTAL_ENERGY,
     CONF_CREATE_PORT_ENERGY, DEFAULT_CREATE_PORT_ENERGY,
-    CONF_UTILITY_CYCLES, DEFAULT_UTILITY_CYCLES
+    CONF_UTILITY_CYCLES, DEFAULT_UTILITY_CYCLES,
+    CONF_ENERGY_METHOD, CONF_ENERGY_MAX_GAP
 )
+from .energy import METHODS as ENERGY_METHODS, DEFAULT_METHOD as DEFAULT_ENERGY_METHOD, DEFAULT_MAX_GAP as DEFAULT_ENERGY_MAX_GAP
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,8 +35,20 @@ def get_schema(data: dict) -> vol.Schema:
         vol.Required(CONF_HOST, default=data.get(CONF_HOST, "")): str,
         vol.Required(CONF_USERNAME, default=data.get(CONF_USERNAME, "admin")): str,
         vol.Required(CONF_PASSWORD, default=data.get(CONF_PASSWORD, "admin")): str,
-        vol.Required(CONF_SCAN_INTERVAL, default=data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)): int,
-        vol.Required(CONF_POE_SCAN_INTERVAL, default=data.get(CONF_POE_SCAN_INTERVAL, DEFAULT_POE_SCAN_INTERVAL)): int,
+        vol.Required(CONF_SCAN_INTERVAL, default=data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)): vol.All(int, vol.Range(min=1)),
+        vol.Required(CONF_POE_SCAN_INTERVAL, default=data.get(CONF_POE_SCAN_INTERVAL, DEFAULT_POE_SCAN_INTERVAL)): vol.All(int, vol.Range(min=1)),
+        vol.Required(CONF_SETTINGS_SCAN_INTERVAL, default=data.get(CONF_SETTINGS_SCAN_INTERVAL, DEFAULT_SETTINGS_SCAN_INTERVAL)): vol.All(int, vol.Range(min=1)),
+        vol.Required(CONF_INFO_SCAN_INTERVAL, default=data.get(CONF_INFO_SCAN_INTERVAL, DEFAULT_INFO_SCAN_INTERVAL)): vol.All(int, vol.Range(min=1)),
+
+        # Adaptive PoE polling (speeds up while PoE loads are changing)
+        vol.Optional(CONF_POE_ADAPTIVE, default=data.get(CONF_POE_ADAPTIVE, DEFAULT_POE_ADAPTIVE)): bool,
+        vol.Optional(CONF_POE_MIN_INTERVAL, default=data.get(CONF_POE_MIN_INTERVAL, DEFAULT_POE_MIN_INTERVAL)): vol.All(int, vol.Range(min=1)),
+        vol.Optional(CONF_POE_MAX_INTERVAL, default=data.get(CONF_POE_MAX_INTERVAL, DEFAULT_POE_MAX_INTERVAL)): vol.All(int, vol.Range(min=1)),
+        vol.Optional(CONF_POE_CHANGE_THRESHOLD, default=data.get(CONF_POE_CHANGE_THRESHOLD, DEFAULT_POE_CHANGE_THRESHOLD)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+
+        vol.Optional(CONF_MAX_CONCURRENT_REQUESTS, default=data.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)): vol.All(int, vol.Range(min=1, max=5)),
+        vol.Optional(CONF_INLINE_PARSE_MAX_BYTES, default=data.get(CONF_INLINE_PARSE_MAX_BYTES, DEFAULT_INLINE_PARSE_MAX_BYTES)): vol.All(int, vol.Range(min=0)),
+        vol.Optional(CONF_COMMAND_RATE, default=data.get(CONF_COMMAND_RATE, DEFAULT_COMMAND_RATE)): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=20)),
         
         # New Energy Options
         vol.Optional(CONF_CREATE_TOTAL_ENERGY, default=data.get(CONF_CREATE_TOTAL_ENERGY, DEFAULT_CREATE_TOTAL_ENERGY)): bool,
@@ -38,6 +61,8 @@ def get_schema(data: dict) -> vol.Schema:
                 translation_key="utility_cycles"
             )
         ),
+        vol.Optional(CONF_ENERGY_METHOD, default=data.get(CONF_ENERGY_METHOD, DEFAULT_ENERGY_METHOD)): vol.In(list(ENERGY_METHODS)),
+        vol.Optional(CONF_ENERGY_MAX_GAP, default=data.get(CONF_ENERGY_MAX_GAP, DEFAULT_ENERGY_MAX_GAP)): vol.All(int, vol.Range(min=60)),
     })
 
 class KeeplinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -58,6 +83,10 @@ class KeeplinkConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 user_input[CONF_SCAN_INTERVAL] = int(user_input[CONF_SCAN_INTERVAL])
             if CONF_POE_SCAN_INTERVAL in user_input:
                 user_input[CONF_POE_SCAN_INTERVAL] = int(user_input[CONF_POE_SCAN_INTERVAL])
+            if CONF_SETTINGS_SCAN_INTERVAL in user_input:
+                user_input[CONF_SETTINGS_SCAN_INTERVAL] = int(user_input[CONF_SETTINGS_SCAN_INTERVAL])
+            if CONF_INFO_SCAN_INTERVAL in user_input:
+                user_input[CONF_INFO_SCAN_INTERVAL] = int(user_input[CONF_INFO_SCAN_INTERVAL])
 
             return self.async_create_entry(title=f"Keeplink ({user_input[CONF_HOST]})", data=user_input)
 
@@ -0,0 +1,80 @@
+"""Per-switch HTTP connection pool for Keeplink Switch.
+
+The embedded web servers only handle one or two connections and are slow
+to accept new ones, so every coordinator owns a small keep-alive pool with
+fixed default headers and a cookie jar holding the auth cookie, instead of
+borrowing Home Assistant's shared session.
+"""
+import aiohttp
+from yarl import URL
+
+USER_AGENT = "HomeAssistant/1.0"
+# Kept longer than the default stats and PoE poll intervals (60s/30s), so a
+# connection idle between two polls is reused. If the switch closed it in the
+# meantime, the request is retried once on a fresh connection.
+KEEPALIVE_TIMEOUT = 75
+
+
+class ConnectionStats:
+    """Counts new vs. reused connections and how long connecting took."""
+
+    __slots__ = ("created", "reused", "recycled", "connect_time_total", "last_connect_time")
+
+    def __init__(self):
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+        self.connect_time_total = 0.0
+        self.last_connect_time = 0.0
+
+    def as_dict(self):
+        total = self.created + self.reused
+        return {
+            "new_connections": self.created,
+            "reused_connections": self.reused,
+            "recycled_connections": self.recycled,
+            "reuse_ratio": round(self.reused / total, 3) if total else None,
+            "avg_connect_ms": round((self.connect_time_total / self.created) * 1000, 2) if self.created else None,
+            "last_connect_ms": round(self.last_connect_time * 1000, 2),
+        }
+
+
+def _trace_config(stats):
+    """aiohttp tracing hooks feeding ConnectionStats."""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_create_start(session, context, params):
+        context.connect_start = session.loop.time()
+
+    async def on_create_end(session, context, params):
+        elapsed = session.loop.time() - context.connect_start
+        stats.created += 1
+        stats.connect_time_total += elapsed
+        stats.last_connect_time = elapsed
+
+    async def on_reuse(session, context, params):
+        stats.reused += 1
+
+    trace_config.on_connection_create_start.append(on_create_start)
+    trace_config.on_connection_create_end.append(on_create_end)
+    trace_config.on_connection_reuseconn.append(on_reuse)
+    return trace_config
+
+
+def create_switch_session(host, auth_cookie, limit, stats):
+    """Create the keep-alive session used for all traffic to one switch."""
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    # unsafe=True: switches are addressed by IP, which the default jar refuses cookies for
+    cookie_jar = aiohttp.CookieJar(unsafe=True)
+    cookie_jar.update_cookies({"admin": auth_cookie}, URL(f"http://{host}/"))
+
+    return aiohttp.ClientSession(
+        connector=connector,
+        cookie_jar=cookie_jar,
+        headers={"User-Agent": USER_AGENT},
+        trace_configs=[_trace_config(stats)],
+    )
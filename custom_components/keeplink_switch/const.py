@@ -7,21 +7,97 @@ CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_POE_SCAN_INTERVAL = "poe_scan_interval"
+CONF_INFO_SCAN_INTERVAL = "info_scan_interval"
+CONF_SETTINGS_SCAN_INTERVAL = "settings_scan_interval"
+CONF_POE_ADAPTIVE = "poe_adaptive"
+CONF_POE_MIN_INTERVAL = "poe_min_interval"
+CONF_POE_MAX_INTERVAL = "poe_max_interval"
+CONF_POE_CHANGE_THRESHOLD = "poe_change_threshold"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_INLINE_PARSE_MAX_BYTES = "inline_parse_max_bytes"
+CONF_COMMAND_RATE = "command_rate"
 
 # NEW: Energy Configuration Constants
 CONF_CREATE_TOTAL_ENERGY = "create_total_energy"
 CONF_CREATE_PORT_ENERGY = "create_port_energy"
 CONF_UTILITY_CYCLES = "utility_cycles"
+CONF_ENERGY_METHOD = "energy_method"
+CONF_ENERGY_MAX_GAP = "energy_max_gap"
 
 DEFAULT_SCAN_INTERVAL = 60
 DEFAULT_POE_SCAN_INTERVAL = 30
+DEFAULT_INFO_SCAN_INTERVAL = 3600
+DEFAULT_SETTINGS_SCAN_INTERVAL = 300
+DEFAULT_POE_ADAPTIVE = False
+DEFAULT_POE_MIN_INTERVAL = 5
+DEFAULT_POE_MAX_INTERVAL = 120
+DEFAULT_POE_CHANGE_THRESHOLD = 10  # percent
+# The embedded web servers only cope with one or two simultaneous connections
+DEFAULT_MAX_CONCURRENT_REQUESTS = 2
+# Page batches smaller than this are parsed on the event loop (executor overhead isn't worth it)
+DEFAULT_INLINE_PARSE_MAX_BYTES = 2048
+# Writes per second sent to one switch (bulk services and scenes are paced to this)
+DEFAULT_COMMAND_RATE = 5.0
 DEFAULT_CREATE_TOTAL_ENERGY = False
 DEFAULT_CREATE_PORT_ENERGY = False
 DEFAULT_UTILITY_CYCLES = []
 
+# Fleet-wide limits shared by all switches
+FLEET_SCHEDULER = "fleet_scheduler"
+DEFAULT_FLEET_MAX_IN_FLIGHT = 8
+DEFAULT_FLEET_STARTUP_STAGGER = 0.5  # seconds between first refreshes
+
+# Services
+SERVICE_SET_POE = "set_poe"
+SERVICE_SET_PORT_SETTINGS = "set_port_settings"
+SERVICE_POWER_CYCLE = "power_cycle"
+SERVICE_PROFILE = "profile"
+ATTR_PORTS = "ports"
+ATTR_STATE = "state"
+ATTR_SPEED = "speed"
+ATTR_FLOW = "flow"
+ATTR_DELAY = "delay"
+ATTR_STAGGER = "stagger"
+ATTR_CYCLES = "cycles"
+
+# PoE power cycle: seconds powered off, and seconds between ports powering back on (limits inrush)
+DEFAULT_POWER_CYCLE_DELAY = 5.0
+DEFAULT_POWER_CYCLE_STAGGER = 1.0
+
+# Update cycles captured by the profile service
+DEFAULT_PROFILE_CYCLES = 3
+
+# Speed/Duplex options: (as shown in the UI, port.cgi payload value, how port.cgi shows it once applied)
+SPEED_DUPLEX_OPTIONS = (
+    ("Auto", 0, "Auto"),
+    ("10M/Half", 1, "10 Half"),
+    ("10M/Full", 2, "10 Full"),
+    ("100M/Half", 3, "100 Half"),
+    ("100M/Full", 4, "100 Full"),
+    ("1000M/Full", 5, "1000Full"),
+    ("2500M/Full", 6, "2.5G Full"),
+    ("10G/Full", 8, "10G Full"),
+)
+SPEED_DUPLEX_VALUES = {option: value for option, value, _ in SPEED_DUPLEX_OPTIONS}
+# port.cgi text -> UI option, plus the spellings other firmware versions use
+SPEED_DUPLEX_LABELS = {
+    **{label: option for option, _, label in SPEED_DUPLEX_OPTIONS},
+    "10M Half": "10M/Half",
+    "10M Full": "10M/Full",
+    "100M Half": "100M/Half",
+    "100M Full": "100M/Full",
+    "1000M Full": "1000M/Full",
+    "1G Full": "1000M/Full",
+    "2500M Full": "2500M/Full",
+}
+
 # Endpoints
 ENDPOINT_INFO = "info.cgi"
 ENDPOINT_PSE_SYSTEM = "pse_system.cgi"
 ENDPOINT_PSE_PORT = "pse_port.cgi"
 ENDPOINT_PORT_SETTINGS = "port.cgi"
-ENDPOINT_PORT_STATS = "port.cgi?page=stats"
\ No newline at end of file
+ENDPOINT_PORT_STATS = "port.cgi?page=stats"
+
+# Fetch (and merge) order of the endpoints within one cycle
+ENDPOINTS = [ENDPOINT_PSE_SYSTEM, ENDPOINT_PSE_PORT, ENDPOINT_INFO, ENDPOINT_PORT_SETTINGS, ENDPOINT_PORT_STATS]
+POE_ENDPOINTS = [ENDPOINT_PSE_SYSTEM, ENDPOINT_PSE_PORT]
@@ -1,11 +1,11 @@
 """DataUpdateCoordinator for Keeplink Switch."""
+import asyncio
 import logging
 import hashlib
 import aiohttp
 import async_timeout
 import time
-import copy
-from bs4 import BeautifulSoup
+from contextlib import asynccontextmanager
 from datetime import timedelta
 
 from homeassistant.helpers.update_coordinator import (
@@ -13,6 +13,7 @@ from homeassistant.helpers.update_coordinator import (
     UpdateFailed,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.core import callback
 
 from .const import (
     DOMAIN, 
@@ -20,132 +21,625 @@ from .const import (
     ENDPOINT_PSE_SYSTEM, 
     ENDPOINT_PSE_PORT,
     ENDPOINT_PORT_SETTINGS,
-    ENDPOINT_PORT_STATS
+    ENDPOINT_PORT_STATS,
+    ENDPOINTS,
+    POE_ENDPOINTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_INLINE_PARSE_MAX_BYTES,
+    DEFAULT_INFO_SCAN_INTERVAL,
+    DEFAULT_SETTINGS_SCAN_INTERVAL,
+    DEFAULT_POE_MIN_INTERVAL,
+    DEFAULT_POE_MAX_INTERVAL,
+    DEFAULT_POE_CHANGE_THRESHOLD,
+    DEFAULT_COMMAND_RATE,
+    DEFAULT_POWER_CYCLE_DELAY,
+    DEFAULT_POWER_CYCLE_STAGGER,
+    SPEED_DUPLEX_OPTIONS,
+    SPEED_DUPLEX_VALUES,
+    SPEED_DUPLEX_LABELS
 )
+from .parser import (
+    parse_info,
+    parse_pse_system,
+    parse_pse_port,
+    parse_port_settings,
+    parse_port_stats,
+    timed_parse_batch
+)
+from .snapshot import begin_snapshot, merge_ports, merge_result, freeze_snapshot, diff_snapshots
+from .ports import PortTable
+from .scheduler import EndpointScheduler, AdaptiveInterval
+from .connection import ConnectionStats, create_switch_session
+from .commands import CommandQueue
+from .rates import TrafficRates
+from .timing import TimingStats
+from .store import load_ports
+from .models import lookup_profile, probe_profile
 
 _LOGGER = logging.getLogger(__name__)
 
+# Give the switch a moment to apply a batch of writes before reading them back
+VERIFY_DELAY = 1.0
+# Seconds a poll cycle, or a single command POST, may take
+REQUEST_TIMEOUT = 30
+
+# Speed/duplex payload values and how port.cgi shows them once applied
+SPEED_VALUE_LABELS = {value: label for _, value, label in SPEED_DUPLEX_OPTIONS}
+
+
 class KeeplinkCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the switch."""
 
-    def __init__(self, hass, session, host, username, password, scan_interval, poe_scan_interval):
+    def __init__(self, hass, host, username, password, scan_interval, poe_scan_interval,
+                 max_concurrent_requests=DEFAULT_MAX_CONCURRENT_REQUESTS,
+                 inline_parse_max_bytes=DEFAULT_INLINE_PARSE_MAX_BYTES,
+                 info_scan_interval=DEFAULT_INFO_SCAN_INTERVAL,
+                 settings_scan_interval=DEFAULT_SETTINGS_SCAN_INTERVAL,
+                 poe_adaptive=False,
+                 poe_min_interval=DEFAULT_POE_MIN_INTERVAL,
+                 poe_max_interval=DEFAULT_POE_MAX_INTERVAL,
+                 poe_change_threshold=DEFAULT_POE_CHANGE_THRESHOLD,
+                 command_rate=DEFAULT_COMMAND_RATE,
+                 fleet=None,
+                 store=None):
         """Initialize."""
         self.host = host
         self.username = username
         self.password = password
-        self.session = session
         self.mac_address = None
         self.device_info = {}
 
-        # Intervals tracking
+        # Shared fleet scheduler: global request cap and a stable phase offset for this switch
+        self.fleet = fleet
+        phase = fleet.register(host) if fleet is not None else 0.0
+
+        # Intervals tracking: every endpoint runs on its own deadline
         self.scan_interval = scan_interval
         self.poe_scan_interval = poe_scan_interval
-        self.last_general_update = 0
-        self.last_poe_update = 0
+        self.scheduler = EndpointScheduler({
+            ENDPOINT_PSE_SYSTEM: poe_scan_interval,
+            ENDPOINT_PSE_PORT: poe_scan_interval,
+            ENDPOINT_INFO: info_scan_interval,
+            ENDPOINT_PORT_SETTINGS: settings_scan_interval,
+            ENDPOINT_PORT_STATS: scan_interval,
+        }, phase=phase)
+        # Optional adaptive PoE cadence driven by how much PoE readings move
+        self.poe_adaptive = None
+        if poe_adaptive:
+            self.poe_adaptive = AdaptiveInterval(poe_scan_interval, poe_min_interval, poe_max_interval, poe_change_threshold)
+            self.scheduler.set_interval(POE_ENDPOINTS, self.poe_adaptive.interval)
+
+        self._parsers = {
+            ENDPOINT_PSE_SYSTEM: self._parse_pse_system,
+            ENDPOINT_PSE_PORT: self._parse_pse_port,
+            ENDPOINT_INFO: self._parse_info,
+            ENDPOINT_PORT_SETTINGS: self._parse_port_settings,
+            ENDPOINT_PORT_STATS: self._parse_port_stats,
+        }
+
+        # Caps how many requests hit this switch at once (the web servers are fragile)
+        self._request_semaphore = asyncio.Semaphore(max(1, max_concurrent_requests))
+
+        # Batches up to this size are parsed inline, bigger ones go to the executor
+        self.inline_parse_max_bytes = inline_parse_max_bytes
+        self.parse_stats = {
+            "inline_batches": 0,
+            "offloaded_batches": 0,
+            "last_parse_ms": 0.0,
+            "last_loop_blocked_ms": 0.0,
+            "loop_blocked_ms_total": 0.0,
+            "loop_blocked_ms_avoided": 0.0,
+        }
+
+        # One record per port, updated in place; entities keep references to their records
+        self.ports = PortTable()
+        # Port layout, PoE/SFP ports and speed options of the model (models.py), known after the first poll
+        self.profile = None
+        # Set once a full poll confirmed (or corrected) the profile
+        self._profile_checked = False
+
+        # Request, parse, merge and cycle durations (rolling windows)
+        self.timing = TimingStats()
+
+        # Last good snapshot on disk; while restored_at is set the data comes from it, not the switch
+        self.store = store
+        self.restored_at = None
+        self.startup_stats = {}
+
+        # Per-endpoint (fingerprint, parsed result) so unchanged pages aren't parsed again
+        self._page_cache = {}
+
+        # Packets/s and errors/s derived from consecutive stats page reads
+        self.traffic_rates = TrafficRates()
+
+        # Serializes snapshot building between scheduled polls and scoped refreshes
+        self._update_lock = asyncio.Lock()
+        self.page_cache_stats = {"hits": 0, "misses": 0, "bytes_skipped": 0, "endpoints": {}}
+
+        # Keys changed by the last update, None means "notify every entity"
+        self._changed_keys = None
+        self._last_dispatch_success = None
+        self.dispatch_stats = {"dispatched": 0, "suppressed": 0}
 
         # Auth Hash Calculation
         auth_str = f"{username}{password}"
         self.auth_cookie = hashlib.md5(auth_str.encode()).hexdigest()
 
-        # The engine needs to tick at the fastest required speed
-        fastest_interval = min(scan_interval, poe_scan_interval)
+        # Own keep-alive pool; the auth cookie and User-Agent live in the session,
+        # the Referer headers never change so they are built once
+        self.connection_stats = ConnectionStats()
+        self.session = create_switch_session(host, self.auth_cookie, max(1, max_concurrent_requests), self.connection_stats)
+        self._poll_headers = {"Referer": f"http://{host}/login.cgi"}
+        self._command_headers = {}
+
+        # Writes are serialized and coalesced, with one scoped verification refresh per batch
+        self.commands = CommandQueue(self._async_send_command, self._async_verify_endpoints, rate=command_rate)
+        self._command_builders = {
+            "poe": self._build_poe_command,
+            "port": self._build_port_command,
+            "stats": self._build_stats_command,
+            "reboot": self._build_reboot_command,
+        }
+
+        # Written values shown before a read confirmed them:
+        # {(port_num, field): (value, verifying endpoint, submitted at, applied at)}
+        self._optimistic = {}
+        self.optimistic_stats = {
+            "applied": 0,
+            "confirmed": 0,
+            "mismatched": 0,
+            "last_ui_update_ms": 0.0,
+            "ui_update_ms_total": 0.0,
+            "last_confirm_ms": 0.0,
+        }
+
+        # Until the first refresh re-arms it from the deadline queue, tick at the fastest speed
+        self._fastest_interval = min(self.scheduler.intervals.values())
+        if self.poe_adaptive is not None:
+            self._fastest_interval = min(self._fastest_interval, self.poe_adaptive.min_interval)
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"Keeplink Switch ({host})",
-            update_interval=timedelta(seconds=fastest_interval),
+            update_interval=timedelta(seconds=self._fastest_interval),
         )
 
     async def _async_update_data(self):
-        """Fetch data from API endpoints smartly based on time."""
-        current_time = time.time()
-        
-        # Load existing data so we don't overwrite attributes we aren't fetching this cycle
-        data = copy.deepcopy(self.data) if self.data else {"ports": {}}
-
-        # Check if we need to update General Data / PoE Data (added a 2s buffer for execution variance)
-        update_general = (current_time - self.last_general_update) >= (self.scan_interval - 2)
-        update_poe = (current_time - self.last_poe_update) >= (self.poe_scan_interval - 2)
-
-        headers = {
-            "Referer": f"http://{self.host}/login.cgi",
-            "User-Agent": "HomeAssistant/1.0"
+        """Fetch the endpoints whose deadline has passed."""
+        return await self._async_fetch_endpoints()
+
+    async def _async_fetch_endpoints(self, endpoints=None):
+        """Fetch and parse the given endpoints (default: those due) and return the new snapshot.
+
+        Runs under a lock so a scheduled poll and a scoped refresh never build
+        snapshots from the same previous one (which would drop one's results).
+        """
+        async with self._update_lock:
+            due = self.scheduler.due()
+            if endpoints is None:
+                endpoints = due
+            started = time.monotonic()
+
+            # Start from the previous snapshot so we don't lose attributes we aren't fetching this cycle.
+            # The port table is shared, its records are updated in place.
+            data = begin_snapshot(self.data, self.ports)
+
+            # Build the list of pages due this cycle. ENDPOINTS order is the merge order,
+            # so the result is identical to fetching them one after another.
+            # Pages the model doesn't have are no longer in the scheduler.
+            jobs = [(endpoint, self._parsers[endpoint]) for endpoint in ENDPOINTS
+                    if endpoint in endpoints and endpoint in self.scheduler.intervals]
+            _LOGGER.debug(f"Fetching {', '.join(endpoint for endpoint, _ in jobs)} for {self.host}")
+
+            try:
+                async with async_timeout.timeout(REQUEST_TIMEOUT):
+                    # Model not known yet: read it first, so even the first poll skips pages the model doesn't have
+                    first = {}
+                    if self.profile is None and ENDPOINT_INFO in endpoints and len(jobs) > 1:
+                        first[ENDPOINT_INFO] = await self._fetch_page(ENDPOINT_INFO)
+                        profile = lookup_profile(parse_info(first[ENDPOINT_INFO][0]).get("model"))
+                        if profile is not None:
+                            self._set_profile(profile)
+                            jobs = [job for job in jobs if job[0] in self.scheduler.intervals]
+                    endpoints = frozenset(endpoint for endpoint, _ in jobs)
+
+                    # Send the requests in parallel; the semaphore in _fetch_page limits the load
+                    fetched = iter(await asyncio.gather(
+                        *(self._fetch_page(endpoint) for endpoint, _ in jobs if endpoint not in first)
+                    ))
+                    pages = [first[endpoint] if endpoint in first else next(fetched) for endpoint, _ in jobs]
+                fetched_at = time.monotonic()
+                sampled_at = time.time()
+
+                # Reuse the previous parse of pages whose body didn't change
+                results = [self._lookup_page_cache(endpoint, html, fingerprint)
+                           for (endpoint, _), (html, fingerprint) in zip(jobs, pages)]
+                misses = [index for index, result in enumerate(results) if result is None]
+
+                # Parse everything else in one go
+                parsed, parse_times = await self._async_parse_pages([(jobs[i][1], pages[i][0]) for i in misses])
+                for index, result, parse_time in zip(misses, parsed, parse_times):
+                    results[index] = result
+                    self._page_cache[jobs[index][0]] = (pages[index][1], result)
+                    self.timing.endpoint(jobs[index][0]).parse_ms.add(parse_time * 1000)
+
+                # PoE readings before this cycle's merge overwrites them, for the adaptive interval
+                adapt_poe = self.poe_adaptive is not None and ENDPOINT_PSE_PORT in endpoints
+                previous_readings = self._poe_readings() if adapt_poe else None
+
+                merge_start = time.perf_counter()
+                changed = set()
+                for result in results:
+                    self._merge_result(data, result, changed)
+
+                # Wall-clock read time of the power readings; energy sensors integrate on these
+                if ENDPOINT_PSE_SYSTEM in endpoints:
+                    data["poe_total_sampled_at"] = sampled_at
+                if ENDPOINT_PSE_PORT in endpoints:
+                    data["poe_port_sampled_at"] = sampled_at
+
+                # Derived metrics: traffic rates from the counters we just read
+                if ENDPOINT_PORT_STATS in endpoints:
+                    stats = results[[endpoint for endpoint, _ in jobs].index(ENDPOINT_PORT_STATS)]
+                    rates = self.traffic_rates.update(stats.get("ports", {}), fetched_at)
+                    self._deep_merge_ports(data, {"ports": rates}, changed)
+
+                # Confirm (or roll back) values that were shown optimistically
+                if self._optimistic:
+                    self._reconcile_optimistic(data, endpoints, started, changed)
+                self.timing.merge_ms.add((time.perf_counter() - merge_start) * 1000)
+
+                # Work out the layout from what the pages showed: the whole profile of an unknown
+                # model, a check of a registered (or restored) one on the first full poll
+                if self.profile is None:
+                    probed = probe_profile(data.get("model"), self.ports)
+                    if not probed.port_count:
+                        raise UpdateFailed(f"Keeplink Switch ({self.host}) listed no ports, retrying")
+                    self._set_profile(probed)
+                    self._profile_checked = True
+                elif not self._profile_checked and endpoints.issuperset(self.scheduler.intervals):
+                    self._check_profile(probe_profile(data.get("model"), self.ports))
+
+                # Build Device Info once MAC is confirmed
+                if ENDPOINT_INFO in endpoints and "mac" in data:
+                    self.mac_address = data["mac"]
+                    self.device_info = {
+                        "manufacturer": "Keeplink",
+                        "model": data.get("model", "Unknown Model"),
+                        "sw_version": data.get("firmware", "Unknown"),
+                        "hw_version": data.get("hardware", "Unknown"),
+                    }
+
+                # Let PoE volatility pick the next PoE interval before the deadlines move
+                if adapt_poe:
+                    self._update_poe_interval(previous_readings)
+                if ENDPOINT_PSE_PORT in self.scheduler.intervals:
+                    data["poe_effective_interval"] = self.scheduler.intervals[ENDPOINT_PSE_PORT]
+
+                # Advance the deadlines and wake up exactly when the next endpoint is due.
+                # Fetched endpoints that weren't due yet keep their deadline.
+                self.scheduler.mark_done(due.intersection(endpoints))
+                self._schedule_next_tick()
+
+                snapshot = freeze_snapshot(data)
+                # Remember what changed so only the affected entities write state.
+                # Everyone is notified after the first poll and after a restored (stale) snapshot.
+                if self.data and not self.stale:
+                    self._changed_keys = diff_snapshots(self.data, snapshot) | changed
+                else:
+                    self._changed_keys = None
+                self.restored_at = None
+                if self.store is not None:
+                    self.store.async_schedule_save(self)
+
+                self.timing.cycle_ms.add((time.monotonic() - started) * 1000)
+                return snapshot
+
+            except aiohttp.ClientError as err:
+                # Nothing was marked done, so the same endpoints are retried on the next tick
+                self.update_interval = timedelta(seconds=self._fastest_interval)
+                raise UpdateFailed(f"Error communicating with API: {err}")
+            except asyncio.TimeoutError as err:
+                self.update_interval = timedelta(seconds=self._fastest_interval)
+                raise UpdateFailed(f"Timeout communicating with API: {err}") from err
+
+    @property
+    def stale(self):
+        """The data is the stored snapshot, the switch hasn't been read since startup."""
+        return self.restored_at is not None
+
+    def restore_snapshot(self, stored):
+        """Load a stored snapshot (see store.py) as the current data, marked stale until the first poll."""
+        self.mac_address = stored["mac_address"]
+        self.device_info = dict(stored.get("device_info", {}))
+        self.ports.merge(load_ports(stored), set())
+        self.data = freeze_snapshot(begin_snapshot(stored.get("data"), self.ports))
+        self.restored_at = stored.get("saved_at", 0.0)
+        self._set_profile(lookup_profile(self.data.get("model")) or probe_profile(self.data.get("model"), self.ports))
+
+    def _check_profile(self, probed):
+        """Prefer what the switch shows when it disagrees with the profile in use.
+
+        A page that came back without ports (the switch was busy) proves
+        nothing; the check is repeated on the next full poll instead of
+        dropping ports or PoE the model has.
+        """
+        profile = self.profile
+        if not probed.port_count or (profile.has_poe and not probed.has_poe):
+            _LOGGER.debug(f"Keeplink Switch ({self.host}) showed no ports or no PoE, checking its layout again later")
+            return
+        self._profile_checked = True
+        if (probed.port_count, probed.poe_ports) == (profile.port_count, profile.poe_ports):
+            return
+        _LOGGER.warning(
+            f"Keeplink Switch ({self.host}) doesn't match the {profile.model} profile "
+            f"({profile.port_count} ports, PoE on {sorted(profile.poe_ports) or 'none'}): it shows "
+            f"{probed.port_count} ports, PoE on {sorted(probed.poe_ports) or 'none'}. Using what the switch shows"
+        )
+        self._set_profile(probed)
+
+    def _set_profile(self, profile):
+        """Adopt the model's capabilities: every port gets a record, pages it doesn't have aren't polled."""
+        self.profile = profile
+        self.ports.merge({port_num: {} for port_num in profile.ports}, set())
+        if not profile.has_poe:
+            self.scheduler.remove(POE_ENDPOINTS)
+        if profile.probed:
+            _LOGGER.info(
+                f"Unknown Keeplink model {profile.model} on {self.host}: probed {profile.port_count} ports, "
+                f"PoE on {sorted(profile.poe_ports) or 'none'}, SFP on {sorted(profile.sfp_ports) or 'none'}"
+            )
+
+    @callback
+    def async_update_listeners(self):
+        """Notify only the entities subscribed to keys that changed in the last update.
+
+        Entities pass the keys they read as their coordinator context (a frozenset of
+        (port_num, field) or (None, key) tuples). Entities without a context, and
+        every entity when availability flips, are always notified.
+        """
+        changed = self._changed_keys
+        if self.last_update_success != self._last_dispatch_success:
+            changed = None
+        self._changed_keys = None
+        self._last_dispatch_success = self.last_update_success
+
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context is None or not context.isdisjoint(changed):
+                self.dispatch_stats["dispatched"] += 1
+                update_callback()
+            else:
+                self.dispatch_stats["suppressed"] += 1
+
+    def _poe_readings(self):
+        """{port: (power, voltage, current)} of the ports on the PoE page."""
+        return {
+            port_num: (port.power, port.voltage, port.current)
+            for port_num, port in self.ports.items()
+            if port.power is not None
         }
-        cookies = {"admin": self.auth_cookie}
 
+    def _update_poe_interval(self, previous):
+        """Speed PoE polling up while loads swing and back off while they are flat."""
+        interval = self.poe_adaptive.update(previous, self._poe_readings())
+        if interval != self.scheduler.intervals[ENDPOINT_PSE_PORT]:
+            _LOGGER.debug(f"Adaptive PoE interval for {self.host} is now {interval}s")
+            self.scheduler.set_interval(POE_ENDPOINTS, interval)
+
+    def _apply_optimistic(self, command, page):
+        """Show the values a successful write should produce right away.
+
+        Only entities reading the written fields are notified. The values stay
+        pending until a read of the verifying page confirms or overrides them.
+        """
+        expected = self._expected_values(command)
+        if not expected or not self.data:
+            return
+
+        applied_at = time.monotonic()
+        ports = {}
+        for (port_num, field), value in expected.items():
+            ports.setdefault(port_num, {})[field] = value
+            self._optimistic[(port_num, field)] = (value, page, command.created, applied_at)
+
+        # Entities read their port records directly, so updating those in place publishes the values.
+        # Not async_set_updated_data: that would also reset the polling timer.
+        self._changed_keys = self.ports.merge(ports, set())
+        self.async_update_listeners()
+
+        ui_update_ms = (time.monotonic() - command.created) * 1000
+        self.optimistic_stats["applied"] += 1
+        self.optimistic_stats["last_ui_update_ms"] = ui_update_ms
+        self.optimistic_stats["ui_update_ms_total"] += ui_update_ms
+
+    def _reconcile_optimistic(self, data, fetched, started, changed):
+        """Check pending optimistic values against the pages read this cycle, keep the rest applied."""
+        now = time.monotonic()
+        for key, (expected, endpoint, submitted_at, applied_at) in list(self._optimistic.items()):
+            port_num, field = key
+            if endpoint not in fetched or applied_at >= started:
+                # Not read back yet (or read before the write went out), keep showing the written value
+                merge_ports(data, {"ports": {port_num: {field: expected}}}, changed)
+                continue
+
+            del self._optimistic[key]
+            actual = self.ports.get(port_num, {}).get(field)
+            if actual == expected:
+                self.optimistic_stats["confirmed"] += 1
+                self.optimistic_stats["last_confirm_ms"] = (now - submitted_at) * 1000
+            else:
+                # The page we just read already holds the real value, so this rolls the entity back
+                self.optimistic_stats["mismatched"] += 1
+                _LOGGER.warning(
+                    f"Keeplink Switch ({self.host}) port {port_num} reports {field}={actual} "
+                    f"after writing {expected}, showing the switch's value"
+                )
+
+    def _schedule_next_tick(self):
+        """Point the coordinator timer at the next deadline in the queue."""
+        self.update_interval = timedelta(seconds=max(1.0, self.scheduler.seconds_until_next()))
+
+    async def async_refresh_endpoints(self, endpoints):
+        """Fetch only the given endpoints now, merge them into the current data and notify listeners.
+
+        Used to verify commands: reading back ENDPOINT_PSE_PORT alone costs one
+        request instead of a full poll. Other endpoints keep their schedule.
+        """
         try:
-            async with async_timeout.timeout(30):
-                
-                # --- POE DATA FETCH ---
-                if update_poe:
-                    _LOGGER.debug(f"Fetching PoE Data for {self.host}")
-                    
-                    # 1. Fetch Total System PoE Power
-                    poe_sys_data = await self._fetch_page(ENDPOINT_PSE_SYSTEM, headers, cookies, self._parse_pse_system)
-                    data.update(poe_sys_data)
-
-                    # 2. Fetch Per-Port PoE Data
-                    poe_port_data = await self._fetch_page(ENDPOINT_PSE_PORT, headers, cookies, self._parse_pse_port)
-                    self._deep_merge_ports(data, poe_port_data)
-                    
-                    # Update our timer
-                    self.last_poe_update = current_time
-
-                # --- GENERAL DATA FETCH ---
-                if update_general:
-                    _LOGGER.debug(f"Fetching General Data for {self.host}")
-                    
-                    # 1. Fetch System Info (Firmware, MAC, IP, etc.)
-                    data.update(await self._fetch_page(ENDPOINT_INFO, headers, cookies, self._parse_info))
-                    
-                    # 2. Fetch Port Settings (Speed/Duplex/Flow Control)
-                    settings_data = await self._fetch_page(ENDPOINT_PORT_SETTINGS, headers, cookies, self._parse_port_settings)
-                    self._deep_merge_ports(data, settings_data)
-
-                    # 3. Fetch Port Stats (Link Status, Tx/Rx Packets, Errors)
-                    stats_data = await self._fetch_page(ENDPOINT_PORT_STATS, headers, cookies, self._parse_port_stats)
-                    self._deep_merge_ports(data, stats_data)
-                    
-                    # Update our timer
-                    self.last_general_update = current_time
-
-                    # Build Device Info once MAC is confirmed
-                    if "mac" in data:
-                        self.mac_address = data["mac"]
-                        self.device_info = {
-                            "manufacturer": "Keeplink",
-                            "model": data.get("model", "Unknown Model"),
-                            "sw_version": data.get("firmware", "Unknown"),
-                            "hw_version": data.get("hardware", "Unknown"),
-                        }
-            
-            return data
-
-        except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}")
-
-    def _deep_merge_ports(self, main_data, new_data):
-        """Safely merges new port attributes without erasing existing ones."""
-        if "ports" not in main_data:
-            main_data["ports"] = {}
-            
-        if "ports" in new_data:
-            for port, info in new_data["ports"].items():
-                if port not in main_data["ports"]:
-                    main_data["ports"][port] = {}
-                main_data["ports"][port].update(info)
-
-    async def _fetch_page(self, endpoint, headers, cookies, parser_func):
-        """Helper to fetch and parse a single page."""
+            snapshot = await self._async_fetch_endpoints(frozenset(endpoints))
+        except (UpdateFailed, ConfigEntryAuthFailed) as err:
+            # The scheduled poll will retry (and start reauth if needed)
+            _LOGGER.warning(f"Failed to refresh {', '.join(sorted(endpoints))} on {self.host}: {err}")
+            self._async_refresh_failed(err)
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            # E.g. a page the parsers can't read; callers verifying writes still get their results
+            _LOGGER.exception(f"Unexpected error refreshing {', '.join(sorted(endpoints))} on {self.host}")
+            self._async_refresh_failed(err)
+            return
+        self.last_update_success = True
+        self.last_exception = None
+        self.data = snapshot
+        self.async_update_listeners()
+
+    @callback
+    def _async_refresh_failed(self, err):
+        """Mark the data unavailable like a failed scheduled poll would (entities are notified once)."""
+        self.last_exception = err
+        if self.last_update_success:
+            self.last_update_success = False
+            self.async_update_listeners()
+
+    async def _async_verify_endpoints(self, endpoints):
+        """Read back pages after a batch of writes, once the switch had time to apply them."""
+        await asyncio.sleep(VERIFY_DELAY)
+        await self.async_refresh_endpoints(endpoints)
+
+    def _merge_result(self, main_data, new_data, changed):
+        """Merges one parsed page: top-level values overwrite, port fields go to the port records."""
+        merge_result(main_data, new_data, changed)
+
+    def _deep_merge_ports(self, main_data, new_data, changed):
+        """Merges new port attributes into the port records without erasing the others."""
+        merge_ports(main_data, new_data, changed)
+
+    def _lookup_page_cache(self, endpoint, html, fingerprint):
+        """Return the cached parse of a page if its body is unchanged, else None."""
+        endpoint_stats = self.page_cache_stats["endpoints"].setdefault(endpoint, {"hits": 0, "misses": 0})
+        cached = self._page_cache.get(endpoint)
+        if cached is not None and cached[0] == fingerprint:
+            endpoint_stats["hits"] += 1
+            self.page_cache_stats["hits"] += 1
+            self.page_cache_stats["bytes_skipped"] += len(html)
+            return cached[1]
+
+        endpoint_stats["misses"] += 1
+        self.page_cache_stats["misses"] += 1
+        return None
+
+    async def _async_parse_pages(self, parse_jobs):
+        """Parse all pages of a cycle, in the executor unless the batch is tiny.
+
+        Returns the results and each page's parse time in seconds.
+        """
+        if not parse_jobs:
+            return [], []
+
+        batch_bytes = sum(len(html) for _, html in parse_jobs)
+        start = time.perf_counter()
+
+        if batch_bytes <= self.inline_parse_max_bytes:
+            results, durations = timed_parse_batch(parse_jobs)
+            parse_time = loop_blocked = time.perf_counter() - start
+            self.parse_stats["inline_batches"] += 1
+        else:
+            # Only scheduling the job touches the event loop; the parsing itself runs in a thread
+            future = self.hass.async_add_executor_job(timed_parse_batch, parse_jobs)
+            loop_blocked = time.perf_counter() - start
+            results, durations = await future
+            parse_time = sum(durations)
+            self.parse_stats["offloaded_batches"] += 1
+            self.parse_stats["loop_blocked_ms_avoided"] += (parse_time - loop_blocked) * 1000
+
+        self.parse_stats["last_parse_ms"] = parse_time * 1000
+        self.parse_stats["last_loop_blocked_ms"] = loop_blocked * 1000
+        self.parse_stats["loop_blocked_ms_total"] += loop_blocked * 1000
+
+        _LOGGER.debug(
+            f"Parsed {len(parse_jobs)} pages ({batch_bytes} bytes) for {self.host} in {parse_time * 1000:.1f} ms, "
+            f"event loop blocked for {loop_blocked * 1000:.2f} ms"
+        )
+        return results, durations
+
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Hold this switch's request slot and, if shared, a fleet-wide one."""
+        async with self._request_semaphore:
+            if self.fleet is None:
+                yield
+            else:
+                async with self.fleet.request_slot(self.host):
+                    yield
+
+    async def async_close(self):
+        """Drop queued commands and close this switch's connection pool."""
+        await self.commands.async_shutdown()
+        await self.session.close()
+
+    async def _async_post(self, page, payload):
+        """Send a command POST through the same request limits as polling."""
+        url = f"http://{self.host}/{page}"
+        headers = self._command_headers.get(page)
+        if headers is None:
+            headers = self._command_headers[page] = {"Referer": url}
+
+        async with self._request_slot():
+            # The queue sends one write at a time, a hung POST would hold up every later command
+            async with async_timeout.timeout(REQUEST_TIMEOUT):
+                async with self.session.post(url, headers=headers, data=payload) as response:
+                    # Drain the body so the connection goes back to the pool
+                    await response.read()
+                    return response.status
+
+    async def _fetch_page(self, endpoint):
+        """Helper to fetch a single page. Returns the raw HTML and a fingerprint of the body."""
         url = f"http://{self.host}/{endpoint}"
-        response = await self.session.get(url, headers=headers, cookies=cookies)
-        
-        if "login.cgi" in str(response.url): 
-            raise ConfigEntryAuthFailed("Authentication failed.")
-            
-        html = await response.text()
-        return parser_func(html)
+        async with self._request_slot():
+            try:
+                return await self._get_page(endpoint, url)
+            except aiohttp.ClientConnectorError:
+                # No connection at all (switch offline or refusing): retrying would only double the load
+                raise
+            except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError) as err:
+                # The switch closed an idle keep-alive connection under us; retry once on a fresh one
+                self.connection_stats.recycled += 1
+                _LOGGER.debug(f"Connection to {self.host} dropped ({err}), retrying {endpoint}")
+                return await self._get_page(endpoint, url)
+
+    async def _get_page(self, endpoint, url):
+        # Timed inside the request slot, so queueing for a slot doesn't count as switch time
+        start = time.perf_counter()
+        async with self.session.get(url, headers=self._poll_headers) as response:
+            ttfb = time.perf_counter() - start
+            if "login.cgi" in str(response.url):
+                raise ConfigEntryAuthFailed("Authentication failed.")
+
+            body = await response.read()
+            if response.status == 404 and endpoint in POE_ENDPOINTS and (self.profile is None or not self.profile.has_poe):
+                # A switch without PoE doesn't serve the PoE pages
+                body = b""
+            elif not 200 <= response.status < 300:
+                # Error and "busy" pages parse to nothing, which would look like ports without data
+                raise UpdateFailed(f"{endpoint} returned HTTP {response.status}")
+            html = await response.text() if body else ""
+        elapsed = time.perf_counter() - start
+
+        timing = self.timing.endpoint(endpoint)
+        timing.request_ms.add(elapsed * 1000)
+        timing.ttfb_ms.add(ttfb * 1000)
+        timing.body_bytes.add(len(body))
+        return html, (len(body), hashlib.blake2b(body, digest_size=16).digest())
 
     # -------------------------------------------------------------------------
     # PARSERS (Reading data from the switch)
@@ -153,259 +647,212 @@ class KeeplinkCoordinator(DataUpdateCoordinator):
 
     def _parse_info(self, html):
         """Parse System Info (info.cgi)."""
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {}
-        rows = soup.find_all('tr')
-        for row in rows:
-            cols = row.find_all(['th', 'td'])
-            if len(cols) == 2:
-                key = cols[0].get_text(strip=True)
-                value = cols[1].get_text(strip=True)
-                
-                if "Device Model" in key: data["model"] = value
-                elif "Firmware Version" in key: data["firmware"] = value
-                elif "MAC Address" in key: data["mac"] = value
-                elif "Hardware Version" in key: data["hardware"] = value
-                elif "IP Address" in key: data["ip_address"] = value
-                elif "Netmask" in key: data["netmask"] = value
-                elif "Gateway" in key: data["gateway"] = value
-                elif "Firmware Date" in key: data["firmware_date"] = value
-        return data
+        return parse_info(html)
 
     def _parse_pse_system(self, html):
         """Parse Total PoE Power (pse_system.cgi)."""
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {}
-        input_tag = soup.find('input', {'name': 'pse_con_pwr'})
-        if input_tag and input_tag.get('value'):
-            try: 
-                data["poe_total_power"] = float(input_tag['value'])
-            except ValueError: 
-                pass
-        return data
+        return parse_pse_system(html)
 
     def _parse_pse_port(self, html):
         """Parse Per-Port PoE Data (pse_port.cgi)."""
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {"ports": {}} 
-        tables = soup.find_all('table')
-        if len(tables) < 2: 
-            return data
-            
-        data_table = tables[1]
-        rows = data_table.find_all('tr')
-        
-        for row in rows[1:]:
-            cols = row.find_all('td')
-            if len(cols) >= 7:
-                port_name = cols[0].get_text(strip=True)
-                try: 
-                    port_num = int(port_name.replace("Port ", ""))
-                except ValueError: 
-                    continue
-                    
-                def parse_val(text): 
-                    return float(text) if text != "-" else 0.0
-                    
-                data["ports"][port_num] = {
-                    "power": parse_val(cols[4].get_text(strip=True)),
-                    "voltage": parse_val(cols[5].get_text(strip=True)),
-                    "current": parse_val(cols[6].get_text(strip=True)),
-                    "enabled": "Enable" in cols[1].get_text(strip=True)
-                }
-        return data
+        return parse_pse_port(html)
 
     def _parse_port_settings(self, html):
         """Parse Port Settings like Speed and Flow Control (port.cgi)."""
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {"ports": {}}
-        tables = soup.find_all('table')
-        if not tables: 
-            return data
-            
-        target_table = tables[-1]
-        rows = target_table.find_all('tr')
-        
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) >= 6:
-                port_text = cols[0].get_text(strip=True)
-                if "Port" not in port_text: 
-                    continue
-                try: 
-                    port_num = int(port_text.replace("Port ", ""))
-                except ValueError: 
-                    continue
-
-                data["ports"][port_num] = {
-                    "admin_state": cols[1].get_text(strip=True) == "Enable",
-                    "config_speed": cols[2].get_text(strip=True),
-                    "speed": cols[3].get_text(strip=True),
-                    "config_flow": cols[4].get_text(strip=True) == "On",
-                    "flow_control": cols[5].get_text(strip=True)
-                }
-        return data
+        return parse_port_settings(html)
 
     def _parse_port_stats(self, html):
         """Parse Link Status and Traffic Counters (port.cgi?page=stats)."""
-        soup = BeautifulSoup(html, 'html.parser')
-        data = {"ports": {}}
-        tables = soup.find_all('table')
-        if not tables: 
-            return data
-            
-        target_table = tables[0]
-        rows = target_table.find_all('tr')
-        
-        for row in rows:
-            cols = row.find_all(['td'])
-            if len(cols) >= 7:
-                port_text = cols[0].get_text(strip=True)
-                if "Port" not in port_text: 
-                    continue
-                try: 
-                    port_num = int(port_text.replace("Port ", ""))
-                except ValueError: 
-                    continue
-
-                link_status = cols[2].get_text(strip=True)
-                
-                # Math conversion for 64-bit integer values displayed in HTML
-                def parse_bigint(text_content):
-                    if "-" in text_content:
-                        parts = text_content.split("-")
-                        try: 
-                            return (int(parts[0]) * 4294967296) + int(parts[1])
-                        except ValueError: 
-                            return 0
-                    return 0
-
-                data["ports"][port_num] = {
-                    "is_link_up": "Link Up" in link_status,
-                    "tx_packets": parse_bigint(cols[3].get_text(strip=True)),
-                    "rx_packets": parse_bigint(cols[5].get_text(strip=True)),
-                    "tx_errors": int(cols[4].get_text(strip=True)),
-                    "rx_errors": int(cols[6].get_text(strip=True))
-                }
-        return data
+        return parse_port_stats(html)
 
     # -------------------------------------------------------------------------
     # ACTIONS (Sending commands to the switch)
     # -------------------------------------------------------------------------
 
     async def async_set_poe_state(self, port_num, state):
-        """Send command to toggle PoE power for a specific port."""
-        port_id = port_num - 1 
-        state_val = "1" if state else "0"
-        
-        url = f"http://{self.host}/{ENDPOINT_PSE_PORT}"
-        headers = {
-            "Referer": f"http://{self.host}/{ENDPOINT_PSE_PORT}", 
-            "User-Agent": "HomeAssistant/1.0"
+        """Queue a command to toggle PoE power for a specific port."""
+        try:
+            # The queue reads pse_port.cgi back once its batch is sent
+            await self.commands.submit(("poe", port_num), {"state": state}, (ENDPOINT_PSE_PORT,))
+        except aiohttp.ClientError as err:
+            _LOGGER.error(f"Failed to set PoE state for port {port_num}: {err}")
+
+    async def async_set_port_settings(self, port_num, state=None, speed_val=None, flow=None):
+        """Queue a command to update Admin State, Flow Control, and Speed/Duplex."""
+        try:
+            # Pending writes to the same port are merged, only the given fields are overridden
+            await self._submit_port_settings(port_num, state, speed_val, flow)
+        except aiohttp.ClientError as err:
+            _LOGGER.error(f"Failed to set port settings: {err}")
+
+    async def async_bulk_set_poe(self, ports, state):
+        """Queue PoE writes for several ports, wait for their read-back and return {port: error or None}."""
+        futures = {
+            port_num: self.commands.submit(("poe", port_num), {"state": state}, (ENDPOINT_PSE_PORT,))
+            for port_num in ports
         }
-        cookies = {"admin": self.auth_cookie}
-        
+        return await self._async_bulk_results(futures)
+
+    async def async_bulk_set_port_settings(self, ports, state=None, speed_val=None, flow=None):
+        """Queue port setting writes for several ports, wait for their read-back and return {port: error or None}."""
+        futures = {
+            port_num: self._submit_port_settings(port_num, state, speed_val, flow)
+            for port_num in ports
+        }
+        return await self._async_bulk_results(futures)
+
+    async def async_power_cycle(self, ports, delay=DEFAULT_POWER_CYCLE_DELAY, stagger=DEFAULT_POWER_CYCLE_STAGGER):
+        """Bounce PoE on several ports: all off, wait, then back on one by one.
+
+        No page is read in between; one pse_port.cgi read confirms the final
+        state of every port. Ports whose PoE is already off are left off and
+        reported as failed. Returns {port: error or None}.
+        """
+        # Taken before the off phase, which turns every requested port off
+        skipped = {
+            port_num: "PoE is off" for port_num in ports
+            if (port := self.ports.get(port_num)) is not None and port.enabled is False
+        }
+        ports = [port_num for port_num in ports if port_num not in skipped]
+        if not ports:
+            return skipped
+        # endpoints=() keeps the queue from reading the pages back after each phase
+        off = {port_num: self.commands.submit(("poe", port_num), {"state": False}) for port_num in ports}
+        outcomes = dict(zip(off, await asyncio.gather(*off.values(), return_exceptions=True)))
+        _LOGGER.debug(f"PoE off on ports {ports} of {self.host}, powering back on in {delay}s")
+        await asyncio.sleep(delay)
+
+        # Ports that never turned off are left alone; the rest come back staggered to limit inrush
+        on = {}
+        for port_num in ports:
+            if isinstance(outcomes[port_num], Exception):
+                continue
+            if on:
+                await asyncio.sleep(stagger)
+            on[port_num] = self.commands.submit(("poe", port_num), {"state": True})
+        outcomes.update(zip(on, await asyncio.gather(*on.values(), return_exceptions=True)))
+        for port_num in on:
+            if isinstance(outcomes[port_num], Exception):
+                # The port was turned off, so whatever it powers stays down
+                _LOGGER.error(f"Failed to turn PoE back on for port {port_num} of {self.host}: {outcomes[port_num]}")
+
+        await self._async_verify_endpoints((ENDPOINT_PSE_PORT,))
+        return {
+            **skipped,
+            **{
+                port_num: (str(outcome) or type(outcome).__name__) if isinstance(outcome, Exception) else None
+                for port_num, outcome in outcomes.items()
+            },
+        }
+
+    def _submit_port_settings(self, port_num, state, speed_val, flow):
+        fields = {"state": state, "speed_val": speed_val, "flow": flow}
+        return self.commands.submit(
+            ("port", port_num),
+            {key: value for key, value in fields.items() if value is not None},
+            (ENDPOINT_PORT_SETTINGS,)
+        )
+
+    async def _async_bulk_results(self, futures):
+        """Collect per-port outcomes, then wait for the single read-back of the batch."""
+        outcomes = await asyncio.gather(*futures.values(), return_exceptions=True)
+        await self.commands.async_wait_idle()
+        return {
+            port_num: (str(outcome) or type(outcome).__name__) if isinstance(outcome, Exception) else None
+            for port_num, outcome in zip(futures, outcomes)
+        }
+
+    async def async_clear_port_stats(self):
+        """Queue a command to clear Tx/Rx traffic statistics."""
+        try:
+            # Reads the stats page back afterwards to show 0 packets
+            await self.commands.submit(("stats",), {}, (ENDPOINT_PORT_STATS,))
+        except aiohttp.ClientError as err:
+            _LOGGER.error(f"Failed to clear statistics: {err}")
+
+    async def async_reboot_switch(self):
+        """Queue a command to Reboot the switch hardware."""
+        try:
+            # We explicitly DO NOT refresh data here because the switch is offline
+            await self.commands.submit(("reboot",), {})
+            _LOGGER.info(f"Reboot command sent to Keeplink Switch ({self.host})")
+        except aiohttp.ClientError as err:
+            _LOGGER.error(f"Failed to send reboot command: {err}")
+
+    async def _async_send_command(self, command):
+        """Send one (possibly merged) queued command to the switch."""
+        page, payload = self._command_builders[command.key[0]](command)
+        await self._async_post(page, payload)
+        if command.key[0] == "stats":
+            # Counters start from zero again, don't report the drop as traffic
+            self.traffic_rates.reset()
+        self._apply_optimistic(command, page)
+
+    def _expected_values(self, command):
+        """Values the switch should report once a command is applied: {(port_num, field): value}."""
+        kind = command.key[0]
+        fields = command.fields
+        if kind == "poe":
+            return {(command.key[1], "enabled"): bool(fields["state"])}
+        if kind != "port":
+            return {}
+
+        port_num = command.key[1]
+        expected = {}
+        if fields.get("state") is not None:
+            expected[(port_num, "admin_state")] = bool(fields["state"])
+        if fields.get("flow") is not None:
+            expected[(port_num, "config_flow")] = bool(fields["flow"])
+        label = SPEED_VALUE_LABELS.get(fields.get("speed_val"))
+        if label is not None:
+            expected[(port_num, "config_speed")] = label
+        return expected
+
+    def _build_poe_command(self, command):
+        port_num = command.key[1]
         payload = {
-            "portid": port_id, 
-            "state": state_val, 
+            "portid": port_num - 1, 
+            "state": "1" if command.fields["state"] else "0", 
             "submit": "Apply", 
             "cmd": "poe"
         }
-        
-        try:
-            await self.session.post(url, headers=headers, cookies=cookies, data=payload)
-            # Force immediate PoE refresh so the UI updates instantly
-            self.last_poe_update = 0 
-            await self.async_request_refresh()
-        except aiohttp.ClientError as err:
-            _LOGGER.error(f"Failed to set PoE state for port {port_num}: {err}")
+        return ENDPOINT_PSE_PORT, payload
 
-    async def async_set_port_settings(self, port_num, state=None, speed_val=None, flow=None):
-        """Send command to update Admin State, Flow Control, and Speed/Duplex."""
-        port_id = port_num - 1
-        
-        # Pull current config to fill in the blanks
-        current = self.data.get("ports", {}).get(port_num, {})
+    def _build_port_command(self, command):
+        port_num = command.key[1]
+        fields = command.fields
+
+        # Pull current config to fill in the blanks (read at send time, after earlier writes)
+        current = self.ports.get(port_num, {})
         
         # Resolve State
+        state = fields.get("state")
         new_state = "1" if (state if state is not None else current.get("admin_state", True)) else "0"
         
         # Resolve Flow Control
+        flow = fields.get("flow")
         new_flow = "1" if (flow if flow is not None else current.get("config_flow", False)) else "0"
             
         # Resolve Speed
+        speed_val = fields.get("speed_val")
         if speed_val is None:
-            speed_map = {
-                "Auto": "0", "10M Half": "1", "10M Full": "2", "100M Half": "3", 
-                "100M Full": "4", "1000M Full": "5", "1G Full": "5", 
-                "2500M Full": "6", "2.5G Full": "6", "10G Full": "8"
-            }
-            new_speed = speed_map.get(current.get("config_speed", "Auto"), "0")
+            option = SPEED_DUPLEX_LABELS.get(current.get("config_speed", "Auto"), "Auto")
+            new_speed = str(SPEED_DUPLEX_VALUES[option])
         else:
             new_speed = str(speed_val)
 
-        url = f"http://{self.host}/{ENDPOINT_PORT_SETTINGS}"
-        headers = {
-            "Referer": f"http://{self.host}/{ENDPOINT_PORT_SETTINGS}", 
-            "User-Agent": "HomeAssistant/1.0"
-        }
-        cookies = {"admin": self.auth_cookie}
-        
         payload = {
-            "portid": port_id, 
+            "portid": port_num - 1, 
             "state": new_state, 
             "speed_duplex": new_speed, 
             "flow": new_flow, 
             "submit": "   Apply   ", 
             "cmd": "port"
         }
-        
-        try:
-            await self.session.post(url, headers=headers, cookies=cookies, data=payload)
-            # Force immediate General refresh so the UI updates instantly
-            self.last_general_update = 0 
-            await self.async_request_refresh()
-        except aiohttp.ClientError as err:
-            _LOGGER.error(f"Failed to set port settings: {err}")
+        return ENDPOINT_PORT_SETTINGS, payload
 
-    async def async_clear_port_stats(self):
-        """Send command to clear Tx/Rx traffic statistics."""
-        url = f"http://{self.host}/{ENDPOINT_PORT_STATS}"
-        headers = {
-            "Referer": f"http://{self.host}/{ENDPOINT_PORT_STATS}", 
-            "User-Agent": "HomeAssistant/1.0"
-        }
-        cookies = {"admin": self.auth_cookie}
-        
-        payload = {
-            "submit": "   Clear   ", 
-            "cmd": "stats"
-        }
-        
-        try:
-            await self.session.post(url, headers=headers, cookies=cookies, data=payload)
-            # Force immediate General refresh to show 0 packets
-            self.last_general_update = 0 
-            await self.async_request_refresh()
-        except aiohttp.ClientError as err:
-            _LOGGER.error(f"Failed to clear statistics: {err}")
+    def _build_stats_command(self, command):
+        return ENDPOINT_PORT_STATS, {"submit": "   Clear   ", "cmd": "stats"}
 
-    async def async_reboot_switch(self):
-        """Send command to Reboot the switch hardware."""
-        url = f"http://{self.host}/reboot.cgi"
-        headers = {
-            "Referer": url, 
-            "User-Agent": "HomeAssistant/1.0"
-        }
-        cookies = {"admin": self.auth_cookie}
-        
-        payload = {
-            "cmd": "reboot"
-        }
-        
-        try:
-            await self.session.post(url, headers=headers, cookies=cookies, data=payload)
-            _LOGGER.info(f"Reboot command sent to Keeplink Switch ({self.host})")
-            # We explicitly DO NOT refresh data here because the switch is offline
-        except aiohttp.ClientError as err:
-            _LOGGER.error(f"Failed to send reboot command: {err}")
\ No newline at end of file
+    def _build_reboot_command(self, command):
+        return "reboot.cgi", {"cmd": "reboot"}
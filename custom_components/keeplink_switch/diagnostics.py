@@ -0,0 +1,40 @@
+"""Diagnostics support for Keeplink Switch."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_USERNAME, CONF_PASSWORD
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    """Return timings and internal counters of one switch for the diagnostics download."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    diagnostics = {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "device": coordinator.device_info,
+        "profile": coordinator.profile.as_dict() if coordinator.profile else None,
+        "last_update_success": coordinator.last_update_success,
+        "stale": coordinator.stale,
+        "startup": dict(coordinator.startup_stats),
+        "poll_intervals": dict(coordinator.scheduler.intervals),
+        "timing": coordinator.timing.as_dict(),
+        "parse": dict(coordinator.parse_stats),
+        "page_cache": coordinator.page_cache_stats,
+        "dispatch": dict(coordinator.dispatch_stats),
+        "connections": coordinator.connection_stats.as_dict(),
+        "commands": dict(coordinator.commands.stats),
+        "optimistic": dict(coordinator.optimistic_stats),
+        "ports": {port_num: port.as_dict() for port_num, port in coordinator.ports.items()},
+    }
+    if coordinator.fleet is not None:
+        host_wait = coordinator.fleet.host_wait.get(coordinator.host)
+        diagnostics["fleet"] = {
+            "switches": len(coordinator.fleet.members),
+            "max_in_flight": coordinator.fleet.max_in_flight,
+            "queue_wait": host_wait.as_dict() if host_wait else None,
+            "fleet_queue_wait": coordinator.fleet.fleet_wait.as_dict(),
+        }
+    return diagnostics
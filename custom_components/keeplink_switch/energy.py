@@ -0,0 +1,156 @@
+"""Energy integration for Keeplink Switch PoE power readings.
+
+Integrates power samples (W) at the time they were actually read from the
+switch into energy (kWh), so accuracy depends on how fast power changes
+rather than on how often the coordinator ticks. Gaps longer than max_gap
+(outages, long restarts) are not integrated at all: guessing what was drawn
+while nobody was looking would make the meter lie.
+"""
+import logging
+from datetime import datetime, timedelta
+
+_LOGGER = logging.getLogger(__name__)
+
+METHOD_LEFT = "left"
+METHOD_RIGHT = "right"
+METHOD_TRAPEZOIDAL = "trapezoidal"
+METHODS = (METHOD_LEFT, METHOD_RIGHT, METHOD_TRAPEZOIDAL)
+
+DEFAULT_METHOD = METHOD_TRAPEZOIDAL
+DEFAULT_MAX_GAP = 600  # seconds
+
+
+def effective_max_gap(max_gap, poe_interval):
+    """The max gap to integrate with: at least two PoE poll intervals.
+
+    With PoE polled more slowly than max_gap every sample would be a gap
+    and the meters would never count anything.
+    """
+    return max(max_gap, 2 * poe_interval)
+
+
+class EnergyIntegrator:
+    """Turns (power W, timestamp s) samples into kWh increments."""
+
+    __slots__ = ("method", "max_gap", "last_power", "last_time", "gaps_skipped")
+
+    def __init__(self, method=DEFAULT_METHOD, max_gap=DEFAULT_MAX_GAP):
+        if method not in METHODS:
+            raise ValueError(f"Unknown integration method: {method}")
+        self.method = method
+        self.max_gap = max_gap
+        self.last_power = None
+        self.last_time = None
+        self.gaps_skipped = 0
+
+    def add_sample(self, power, timestamp):
+        """Feed a power reading taken at `timestamp` (epoch seconds) and return the kWh since the last one."""
+        last_power, last_time = self.last_power, self.last_time
+        if last_time is not None and timestamp <= last_time:
+            # Same (or an older) sample again, nothing new to integrate
+            return 0.0
+
+        self.last_power = power
+        self.last_time = timestamp
+        if last_time is None:
+            return 0.0
+
+        elapsed = timestamp - last_time
+        if elapsed > self.max_gap:
+            self.gaps_skipped += 1
+            return 0.0
+
+        if self.method == METHOD_LEFT:
+            average = last_power
+        elif self.method == METHOD_RIGHT:
+            average = power
+        else:
+            average = (last_power + power) / 2.0
+        return average * elapsed / 3600.0 / 1000.0
+
+    def as_dict(self):
+        """State to persist across restarts."""
+        return {"last_power": self.last_power, "last_time": self.last_time}
+
+    def restore(self, data):
+        """Restore the last sample saved by as_dict()."""
+        if not data:
+            return
+        try:
+            last_power = float(data["last_power"])
+            last_time = float(data["last_time"])
+        except (KeyError, TypeError, ValueError):
+            return
+        self.last_power = last_power
+        self.last_time = last_time
+
+
+class EnergyAccumulator:
+    """Integrates one power source (the switch total or one port) once per sample.
+
+    The energy sensor and all utility meters of that source share it: the
+    first one to see a new sample computes the increment, the others get the
+    cached value.
+    """
+
+    __slots__ = ("port_num", "sample_key", "integrator", "previous_time", "_sample", "_increment")
+
+    def __init__(self, port_num=None, method=DEFAULT_METHOD, max_gap=DEFAULT_MAX_GAP):
+        self.port_num = port_num
+        self.sample_key = "poe_total_sampled_at" if port_num is None else "poe_port_sampled_at"
+        self.integrator = EnergyIntegrator(method, max_gap)
+        # Time of the sample before the current one: the increment covers previous_time..sample time
+        self.previous_time = None
+        self._sample = None
+        self._increment = 0.0
+
+    def power(self, data):
+        """Current power (W) of this source in a coordinator snapshot."""
+        if self.port_num is None:
+            return data.get("poe_total_power", 0.0)
+        return data.get("ports", {}).get(self.port_num, {}).get("power", 0.0)
+
+    def update(self, data):
+        """Return (sample time, kWh since the previous sample) for the snapshot's power reading."""
+        sampled_at = data.get(self.sample_key)
+        if sampled_at is None:
+            return None, 0.0
+        if sampled_at != self._sample:
+            power = self.power(data)
+            self._sample = sampled_at
+            self.previous_time = self.integrator.last_time
+            # 0 for repeats and gaps longer than max_gap
+            gaps_skipped = self.integrator.gaps_skipped
+            self._increment = self.integrator.add_sample(power, sampled_at) if power is not None else 0.0
+            if self.integrator.gaps_skipped != gaps_skipped:
+                source = "total PoE" if self.port_num is None else f"port {self.port_num} PoE"
+                _LOGGER.warning(
+                    f"No {source} reading for {sampled_at - self.previous_time:.0f}s (max gap "
+                    f"{self.integrator.max_gap}s), the energy of that time is not counted"
+                )
+        return sampled_at, self._increment
+
+
+def share_after(increment, start, end, boundary):
+    """Part of an increment integrated over start..end that falls after `boundary`, pro rata to time."""
+    if start is None or end <= start or boundary <= start:
+        return increment
+    if boundary >= end:
+        return 0.0
+    return increment * (end - boundary) / (end - start)
+
+
+def next_cycle_start(cycle, moment):
+    """Start of the daily/monthly/yearly cycle after `moment` (an aware local datetime)."""
+    tzinfo = moment.tzinfo
+    if cycle == "daily":
+        # Calendar arithmetic on the date, so DST days still reset at local midnight
+        day = moment.date() + timedelta(days=1)
+        return datetime(day.year, day.month, day.day, tzinfo=tzinfo)
+    if cycle == "monthly":
+        if moment.month == 12:
+            return datetime(moment.year + 1, 1, 1, tzinfo=tzinfo)
+        return datetime(moment.year, moment.month + 1, 1, tzinfo=tzinfo)
+    if cycle == "yearly":
+        return datetime(moment.year + 1, 1, 1, tzinfo=tzinfo)
+    raise ValueError(f"Unknown utility cycle: {cycle}")
@@ -0,0 +1,87 @@
+"""Fleet-wide polling coordination for Keeplink Switch.
+
+One FleetScheduler lives in hass.data[DOMAIN] and is shared by every
+KeeplinkCoordinator. It gives each switch a deterministic phase offset so
+polls are spread across the interval instead of firing in lockstep, caps
+the number of HTTP requests in flight across all switches, and staggers
+the first refresh of each switch at startup.
+"""
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager
+
+
+class QueueWaitStats:
+    """Running statistics of how long requests waited for a fleet slot."""
+
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, wait):
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+        self.last = wait
+
+    def as_dict(self):
+        """Return the statistics in milliseconds."""
+        return {
+            "requests": self.count,
+            "avg_wait_ms": round((self.total / self.count) * 1000, 2) if self.count else 0.0,
+            "max_wait_ms": round(self.max * 1000, 2),
+            "last_wait_ms": round(self.last * 1000, 2),
+        }
+
+
+class FleetScheduler:
+    """Shared scheduler all Keeplink coordinators register with."""
+
+    def __init__(self, max_in_flight, startup_stagger):
+        self.max_in_flight = max(1, max_in_flight)
+        self.startup_stagger = startup_stagger
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._next_startup_slot = 0.0
+        self.members = set()
+        self.fleet_wait = QueueWaitStats()
+        self.host_wait = {}
+
+    def register(self, host):
+        """Register a switch and return its phase offset as a fraction of any interval."""
+        self.members.add(host)
+        self.host_wait.setdefault(host, QueueWaitStats())
+        return self.phase_fraction(host)
+
+    def unregister(self, host):
+        """Forget a switch (its config entry was unloaded)."""
+        self.members.discard(host)
+        self.host_wait.pop(host, None)
+
+    @staticmethod
+    def phase_fraction(host):
+        """Deterministic offset in [0, 1) derived from the host, stable across restarts."""
+        digest = hashlib.sha1(host.encode()).digest()
+        return int.from_bytes(digest[:4], "big") / 2**32
+
+    async def async_stagger_startup(self):
+        """Wait for this switch's turn so first refreshes don't all start at once."""
+        now = time.monotonic()
+        slot = max(now, self._next_startup_slot)
+        self._next_startup_slot = slot + self.startup_stagger
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    @asynccontextmanager
+    async def request_slot(self, host):
+        """Hold one of the fleet-wide request slots, recording the time spent queueing."""
+        start = time.monotonic()
+        async with self._semaphore:
+            wait = time.monotonic() - start
+            self.fleet_wait.add(wait)
+            self.host_wait.setdefault(host, QueueWaitStats()).add(wait)
+            yield
@@ -0,0 +1,93 @@
+"""Capability profiles of the Keeplink switch models.
+
+A profile tells how many ports a model has, which of them supply PoE,
+which are SFP cages and which speed/duplex options each port accepts.
+Known models are looked up by the model string shown on info.cgi. For any
+other model the profile is probed from the first poll: every port the
+switch lists, PoE on the ports pse_port.cgi reports, and as SFP cages the
+ports after the last PoE port (the uplinks of this family) or, on switches
+without PoE, the ports that show a 10G speed. Registered profiles are
+checked against the same probe on the first full poll, and the probe wins
+when they disagree.
+
+Only layouts verified on real hardware belong in MODEL_PROFILES.
+"""
+from .const import ENDPOINTS, POE_ENDPOINTS
+
+# Speed/duplex options (see SPEED_DUPLEX_OPTIONS) offered on each kind of port
+COPPER_SPEEDS = ("Auto", "10M/Half", "10M/Full", "100M/Half", "100M/Full", "1000M/Full", "2500M/Full")
+SFP_SPEEDS = ("Auto", "100M/Full", "1000M/Full", "2500M/Full", "10G/Full")
+
+
+class ModelProfile:
+    """Port layout and speed options of one switch model."""
+
+    __slots__ = ("model", "port_count", "poe_ports", "sfp_ports", "probed")
+
+    def __init__(self, model, port_count, poe_ports=(), sfp_ports=(), probed=False):
+        self.model = model
+        self.port_count = port_count
+        self.poe_ports = frozenset(poe_ports)
+        self.sfp_ports = frozenset(sfp_ports)
+        # True when guessed from the pages instead of taken from MODEL_PROFILES
+        self.probed = probed
+
+    @property
+    def ports(self):
+        return range(1, self.port_count + 1)
+
+    @property
+    def has_poe(self):
+        return bool(self.poe_ports)
+
+    @property
+    def endpoints(self):
+        """The pages this model serves, in merge order."""
+        return [endpoint for endpoint in ENDPOINTS if self.has_poe or endpoint not in POE_ENDPOINTS]
+
+    def speed_options(self, port_num):
+        """Speed/duplex options the port accepts."""
+        return SFP_SPEEDS if port_num in self.sfp_ports else COPPER_SPEEDS
+
+    def as_dict(self):
+        return {
+            "model": self.model,
+            "port_count": self.port_count,
+            "poe_ports": sorted(self.poe_ports),
+            "sfp_ports": sorted(self.sfp_ports),
+            "probed": self.probed,
+        }
+
+
+def _span(first, last):
+    return range(first, last + 1)
+
+
+# Keyed by the model string on info.cgi (upper case)
+MODEL_PROFILES = {
+    "KP-9000-9XHPML-X-AC": ModelProfile("KP-9000-9XHPML-X-AC", 9, _span(1, 8), (9,)),
+}
+
+
+def lookup_profile(model):
+    """The registered profile of a model string, or None for unknown models."""
+    if not model:
+        return None
+    return MODEL_PROFILES.get(model.strip().upper())
+
+
+def probe_profile(model, ports):
+    """Guess the profile of a model from its port records (a PortTable).
+
+    Only ports a page reported count; records a profile created ahead of time stay empty.
+    """
+    listed = {port_num: port for port_num, port in ports.items() if port.as_dict()}
+    poe_ports = [port_num for port_num, port in listed.items() if port.has_poe]
+    if poe_ports:
+        sfp_ports = [port_num for port_num in listed if port_num > max(poe_ports)]
+    else:
+        sfp_ports = [
+            port_num for port_num, port in listed.items()
+            if "10G" in (port.speed or "") or "10G" in (port.config_speed or "")
+        ]
+    return ModelProfile(model or "Unknown", max(listed, default=0), poe_ports, sfp_ports, probed=True)
@@ -0,0 +1,309 @@
+"""HTML page parsers for Keeplink Switch.
+
+The switch pages are plain HTML tables, so instead of building a full
+BeautifulSoup tree on every poll we stream the markup through
+html.parser.HTMLParser and keep only table rows, cell texts and named
+<input> values. Cells and rows left open are closed by the next cell, row
+or table end, as a browser does (BeautifulSoup's html.parser would nest
+them instead). BeautifulSoup is only used as a fallback for markup the
+fast extractor can't reproduce exactly (e.g. nested tables).
+"""
+import logging
+import time
+from html.parser import HTMLParser
+
+_LOGGER = logging.getLogger(__name__)
+
+_CELL_TAGS = ("td", "th")
+# Text inside these tags is not returned by BeautifulSoup's get_text()
+_NON_TEXT_TAGS = ("script", "style", "template")
+
+
+class UnsupportedMarkup(Exception):
+    """Raised when the fast extractor can't guarantee BeautifulSoup-identical output."""
+
+
+class PageTables:
+    """Flat view of a page: all rows, rows per table and named input values.
+
+    A row is a list of (tag, text) tuples, where tag is "td" or "th" and text
+    matches BeautifulSoup's get_text(strip=True) for that cell.
+    """
+
+    __slots__ = ("rows", "tables", "inputs")
+
+    def __init__(self):
+        self.rows = []
+        self.tables = []
+        self.inputs = {}
+
+
+class _TableExtractor(HTMLParser):
+    """Streaming extractor that yields table rows and cells without building a DOM."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.page = PageTables()
+        self._table = None
+        self._row = None
+        self._cell_tag = None
+        self._cell_parts = None
+        self._text = []
+
+    def _flush_text(self):
+        """Close the current run of text, the same way BeautifulSoup splits strings."""
+        if self._text:
+            text = "".join(self._text).strip()
+            self._text = []
+            if text and self._cell_parts is not None:
+                self._cell_parts.append(text)
+
+    def _close_cell(self):
+        if self._cell_tag is not None:
+            self._row.append((self._cell_tag, "".join(self._cell_parts)))
+            self._cell_tag = None
+            self._cell_parts = None
+
+    def _close_row(self):
+        self._close_cell()
+        self._row = None
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+
+        if tag == "input":
+            attr_map = dict(attrs)
+            name = attr_map.get("name")
+            if name is not None and name not in self.page.inputs:
+                self.page.inputs[name] = attr_map.get("value")
+        elif tag == "table":
+            if self._table is not None:
+                raise UnsupportedMarkup("nested table")
+            self._table = []
+            self.page.tables.append(self._table)
+        elif tag == "tr":
+            if self._row is not None:
+                self._close_row()
+            self._row = []
+            self.page.rows.append(self._row)
+            if self._table is not None:
+                self._table.append(self._row)
+        elif tag in _CELL_TAGS:
+            self._close_cell()
+            if self._row is not None:
+                self._cell_tag = tag
+                self._cell_parts = []
+        elif tag in _NON_TEXT_TAGS and self._cell_tag is not None:
+            raise UnsupportedMarkup(f"<{tag}> inside a cell")
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+
+        if tag in _CELL_TAGS:
+            self._close_cell()
+        elif tag == "tr":
+            if self._row is not None:
+                self._close_row()
+        elif tag == "table":
+            if self._table is not None:
+                if self._row is not None:
+                    self._close_row()
+                self._table = None
+
+    def handle_data(self, data):
+        if self._cell_tag is not None:
+            self._text.append(data)
+
+    def handle_comment(self, data):
+        # Comments split text nodes but are not part of get_text()
+        self._flush_text()
+
+    def close(self):
+        super().close()
+        self._flush_text()
+        if self._row is not None:
+            self._close_row()
+
+
+def _extract_fast(html):
+    """Extract tables with the streaming HTMLParser."""
+    extractor = _TableExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.page
+
+
+def _extract_soup(html):
+    """Extract tables with BeautifulSoup (slow, but handles any markup)."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    page = PageTables()
+
+    def read_row(row):
+        return [(cell.name, cell.get_text(strip=True)) for cell in row.find_all(list(_CELL_TAGS))]
+
+    page.rows = [read_row(row) for row in soup.find_all("tr")]
+    page.tables = [[read_row(row) for row in table.find_all("tr")] for table in soup.find_all("table")]
+    for input_tag in soup.find_all("input"):
+        name = input_tag.get("name")
+        if name is not None and name not in page.inputs:
+            page.inputs[name] = input_tag.get("value")
+    return page
+
+
+def extract_page(html):
+    """Return the PageTables for a page, falling back to BeautifulSoup if needed."""
+    try:
+        return _extract_fast(html)
+    except UnsupportedMarkup as err:
+        _LOGGER.debug(f"Fast extractor fell back to BeautifulSoup: {err}")
+        return _extract_soup(html)
+
+
+def _td_texts(row):
+    """Return only the <td> cell texts of a row."""
+    return [text for tag, text in row if tag == "td"]
+
+
+# -------------------------------------------------------------------------
+# PAGE PARSERS
+# -------------------------------------------------------------------------
+
+def parse_info(html):
+    """Parse System Info (info.cgi)."""
+    page = extract_page(html)
+    data = {}
+    for row in page.rows:
+        if len(row) == 2:
+            key = row[0][1]
+            value = row[1][1]
+
+            if "Device Model" in key: data["model"] = value
+            elif "Firmware Version" in key: data["firmware"] = value
+            elif "MAC Address" in key: data["mac"] = value
+            elif "Hardware Version" in key: data["hardware"] = value
+            elif "IP Address" in key: data["ip_address"] = value
+            elif "Netmask" in key: data["netmask"] = value
+            elif "Gateway" in key: data["gateway"] = value
+            elif "Firmware Date" in key: data["firmware_date"] = value
+    return data
+
+
+def parse_pse_system(html):
+    """Parse Total PoE Power (pse_system.cgi)."""
+    page = extract_page(html)
+    data = {}
+    value = page.inputs.get("pse_con_pwr")
+    if value:
+        try:
+            data["poe_total_power"] = float(value)
+        except ValueError:
+            pass
+    return data
+
+
+def parse_pse_port(html):
+    """Parse Per-Port PoE Data (pse_port.cgi)."""
+    page = extract_page(html)
+    data = {"ports": {}}
+    if len(page.tables) < 2:
+        return data
+
+    def parse_val(text):
+        return float(text) if text != "-" else 0.0
+
+    for row in page.tables[1][1:]:
+        cols = _td_texts(row)
+        if len(cols) >= 7:
+            try:
+                port_num = int(cols[0].replace("Port ", ""))
+            except ValueError:
+                continue
+
+            data["ports"][port_num] = {
+                "power": parse_val(cols[4]),
+                "voltage": parse_val(cols[5]),
+                "current": parse_val(cols[6]),
+                "enabled": "Enable" in cols[1]
+            }
+    return data
+
+
+def parse_port_settings(html):
+    """Parse Port Settings like Speed and Flow Control (port.cgi)."""
+    page = extract_page(html)
+    data = {"ports": {}}
+    if not page.tables:
+        return data
+
+    for row in page.tables[-1]:
+        cols = _td_texts(row)
+        if len(cols) >= 6:
+            if "Port" not in cols[0]:
+                continue
+            try:
+                port_num = int(cols[0].replace("Port ", ""))
+            except ValueError:
+                continue
+
+            data["ports"][port_num] = {
+                "admin_state": cols[1] == "Enable",
+                "config_speed": cols[2],
+                "speed": cols[3],
+                "config_flow": cols[4] == "On",
+                "flow_control": cols[5]
+            }
+    return data
+
+
+def parse_bigint(text_content):
+    """Math conversion for 64-bit integer values displayed in HTML as 'high-low'."""
+    if "-" in text_content:
+        parts = text_content.split("-")
+        try:
+            return (int(parts[0]) * 4294967296) + int(parts[1])
+        except ValueError:
+            return 0
+    return 0
+
+
+def parse_port_stats(html):
+    """Parse Link Status and Traffic Counters (port.cgi?page=stats)."""
+    page = extract_page(html)
+    data = {"ports": {}}
+    if not page.tables:
+        return data
+
+    for row in page.tables[0]:
+        cols = _td_texts(row)
+        if len(cols) >= 7:
+            if "Port" not in cols[0]:
+                continue
+            try:
+                port_num = int(cols[0].replace("Port ", ""))
+            except ValueError:
+                continue
+
+            data["ports"][port_num] = {
+                "is_link_up": "Link Up" in cols[2],
+                "tx_packets": parse_bigint(cols[3]),
+                "rx_packets": parse_bigint(cols[5]),
+                "tx_errors": int(cols[4]),
+                "rx_errors": int(cols[6])
+            }
+    return data
+
+
+def timed_parse_batch(parse_jobs):
+    """Parse a batch of (parser_func, html) pages and return the results with each page's parse time.
+
+    Plain CPU work, so it can run in the executor.
+    """
+    results = []
+    durations = []
+    for parser_func, html in parse_jobs:
+        start = time.perf_counter()
+        results.append(parser_func(html))
+        durations.append(time.perf_counter() - start)
+    return results, durations
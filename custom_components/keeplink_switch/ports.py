@@ -0,0 +1,108 @@
+"""Port state records of a Keeplink switch.
+
+Every port is one PortState object with a fixed set of slots instead of a
+dict of string keys, and every switch owns one PortTable indexed by port
+number. Records are created once, when a port is first seen, and updated
+in place afterwards, so entities can keep a direct reference to their
+port's record instead of looking it up in the coordinator data on every
+state write. The merge reports which (port, field) pairs really changed,
+which is what drives the change-aware entity updates.
+"""
+
+# Fields per page: link and counters (port.cgi?page=stats), PoE (pse_port.cgi),
+# configuration (port.cgi) and the rates derived from the counters
+LINK_FIELDS = ("is_link_up", "tx_packets", "rx_packets", "tx_errors", "rx_errors")
+POE_FIELDS = ("enabled", "power", "voltage", "current")
+CONFIG_FIELDS = ("admin_state", "config_speed", "speed", "config_flow", "flow_control")
+RATE_FIELDS = ("tx_packets_rate", "rx_packets_rate", "tx_errors_rate", "rx_errors_rate")
+PORT_FIELDS = LINK_FIELDS + POE_FIELDS + CONFIG_FIELDS + RATE_FIELDS
+
+
+class PortState:
+    """Everything known about one port. None means the switch hasn't reported the field."""
+
+    __slots__ = ("port_num",) + PORT_FIELDS
+
+    def __init__(self, port_num):
+        self.port_num = port_num
+        for field in PORT_FIELDS:
+            setattr(self, field, None)
+
+    @property
+    def has_poe(self):
+        """The port showed up on the PoE page."""
+        return self.enabled is not None
+
+    def get(self, field, default=None):
+        """Value of a field by name, or default if it wasn't reported."""
+        value = getattr(self, field)
+        return default if value is None else value
+
+    def as_dict(self):
+        """The reported fields as a plain dict (diagnostics, service responses, storage)."""
+        return {field: value for field in PORT_FIELDS if (value := getattr(self, field)) is not None}
+
+    def __repr__(self):
+        return f"PortState({self.port_num}, {self.as_dict()})"
+
+
+class PortTable:
+    """The port records of one switch, indexed by port number.
+
+    Read-only mapping of port number -> PortState for everything outside the
+    coordinator; only merge() adds ports or changes values.
+    """
+
+    __slots__ = ("_records", "_count")
+
+    def __init__(self):
+        # Index = port number, slot 0 is unused (ports are numbered from 1)
+        self._records = [None]
+        self._count = 0
+
+    def get(self, port_num, default=None):
+        if 0 < port_num < len(self._records):
+            record = self._records[port_num]
+            if record is not None:
+                return record
+        return default
+
+    def __getitem__(self, port_num):
+        record = self.get(port_num)
+        if record is None:
+            raise KeyError(port_num)
+        return record
+
+    def __contains__(self, port_num):
+        return self.get(port_num) is not None
+
+    def __iter__(self):
+        return (record.port_num for record in self._records if record is not None)
+
+    def __len__(self):
+        return self._count
+
+    def items(self):
+        return ((record.port_num, record) for record in self._records if record is not None)
+
+    def values(self):
+        return (record for record in self._records if record is not None)
+
+    def _record(self, port_num):
+        if port_num >= len(self._records):
+            self._records.extend([None] * (port_num + 1 - len(self._records)))
+        record = self._records[port_num]
+        if record is None:
+            record = self._records[port_num] = PortState(port_num)
+            self._count += 1
+        return record
+
+    def merge(self, ports, changed):
+        """Apply {port: {field: value}} in place, adding every (port, field) that changed to `changed`."""
+        for port_num, info in ports.items():
+            record = self._record(port_num)
+            for field, value in info.items():
+                if getattr(record, field) != value:
+                    setattr(record, field, value)
+                    changed.add((port_num, field))
+        return changed
@@ -0,0 +1,137 @@
+"""On-demand cProfile capture of a Keeplink coordinator's update cycles.
+
+While a capture runs, the coordinator's _async_refresh is shadowed by an
+instance attribute that enables the profiler around each scheduled cycle:
+fetching, parsing, merging and the entity update fan-out
+(_handle_coordinator_update / state writes). Pages are parsed inline for
+the duration, because cProfile only sees the event loop thread. Once the
+requested number of cycles has run, the attribute is removed again, so an
+idle coordinator runs exactly the same code as before.
+"""
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Functions listed in the text summary
+SUMMARY_LINES = 40
+# Event loop plumbing (and idle time in the selector) left out of the returned top list
+_LOOP_FILES = ("base_events.py", "selectors.py", "events.py", "tasks.py")
+_LOOP_WAITS = ("epoll", "kqueue", "poll")
+
+
+class CycleProfiler:
+    """Profiles the next `cycles` update cycles of one coordinator."""
+
+    # cProfile can only run one profiler per thread, so one capture at a time
+    active = None
+
+    def __init__(self, coordinator, cycles, output_dir):
+        self.coordinator = coordinator
+        self.cycles = cycles
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        name = f"keeplink_profile_{coordinator.host.replace('.', '_').replace(':', '_')}_{stamp}"
+        self.profile_path = os.path.join(output_dir, f"{name}.prof")
+        self.summary_path = os.path.join(output_dir, f"{name}.txt")
+        self.done = asyncio.get_running_loop().create_future()
+        self._profile = cProfile.Profile()
+        self._completed = 0
+        self._inline_parse_max_bytes = None
+
+    def start(self):
+        """Install the profiling hook; returns False if another capture is running."""
+        if CycleProfiler.active is not None:
+            return False
+        CycleProfiler.active = self
+
+        coordinator = self.coordinator
+        original_refresh = type(coordinator)._async_refresh.__get__(coordinator)
+
+        async def profiled_refresh(*args, **kwargs):
+            try:
+                self._profile.enable()
+            except ValueError as err:
+                # Another profiler (e.g. Home Assistant's profiler integration) owns the thread
+                _LOGGER.warning(f"Skipping profile of an update cycle: {err}")
+                return await original_refresh(*args, **kwargs)
+            try:
+                return await original_refresh(*args, **kwargs)
+            finally:
+                self._profile.disable()
+                self._completed += 1
+                if self._completed >= self.cycles:
+                    self._stop()
+
+        # Parse on the loop thread so the parsers show up in the profile
+        self._inline_parse_max_bytes = coordinator.inline_parse_max_bytes
+        coordinator.inline_parse_max_bytes = float("inf")
+        coordinator._async_refresh = profiled_refresh
+        _LOGGER.info(f"Profiling the next {self.cycles} update cycle(s) of Keeplink Switch ({coordinator.host})")
+        return True
+
+    def _stop(self):
+        coordinator = self.coordinator
+        coordinator.__dict__.pop("_async_refresh", None)
+        coordinator.inline_parse_max_bytes = self._inline_parse_max_bytes
+        CycleProfiler.active = None
+        coordinator.hass.async_create_task(self._async_write())
+
+    def cancel(self):
+        """Remove the hook without writing anything (the switch is being unloaded); done resolves to None."""
+        if CycleProfiler.active is not self:
+            return
+        coordinator = self.coordinator
+        coordinator.__dict__.pop("_async_refresh", None)
+        coordinator.inline_parse_max_bytes = self._inline_parse_max_bytes
+        CycleProfiler.active = None
+        if not self.done.done():
+            self.done.set_result(None)
+
+    async def _async_write(self):
+        try:
+            summary = await self.coordinator.hass.async_add_executor_job(self._write_files)
+        except OSError as err:
+            _LOGGER.error(f"Failed to write profile of Keeplink Switch ({self.coordinator.host}): {err}")
+            if not self.done.done():
+                self.done.set_exception(err)
+            return
+        _LOGGER.info(f"Profile of Keeplink Switch ({self.coordinator.host}) written to {self.profile_path}")
+        if not self.done.done():
+            self.done.set_result(summary)
+
+    def _write_files(self):
+        """Dump the raw profile and a top-functions summary (runs in the executor)."""
+        self._profile.dump_stats(self.profile_path)
+
+        stream = io.StringIO()
+        stream.write(f"Keeplink Switch ({self.coordinator.host}), {self._completed} update cycle(s)\n")
+        stream.write("Other tasks that ran on the event loop during a cycle are included.\n")
+        stats = pstats.Stats(self._profile, stream=stream).strip_dirs()
+        stream.write("\n=== By cumulative time ===\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_LINES)
+        stream.write("\n=== By own time ===\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(SUMMARY_LINES)
+        with open(self.summary_path, "w", encoding="utf-8") as summary_file:
+            summary_file.write(stream.getvalue())
+
+        top = sorted(
+            (
+                (func, values) for func, values in stats.stats.items()
+                if func[0] not in _LOOP_FILES and not any(wait in func[2] for wait in _LOOP_WAITS)
+            ),
+            key=lambda item: item[1][3], reverse=True
+        )[:10]
+        return {
+            "cycles": self._completed,
+            "profile": self.profile_path,
+            "summary": self.summary_path,
+            "top_cumulative": [
+                {"function": f"{func[0]}:{func[1]}({func[2]})", "calls": values[1], "cumulative_ms": round(values[3] * 1000, 2)}
+                for func, values in top
+            ],
+        }
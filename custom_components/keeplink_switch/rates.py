@@ -0,0 +1,67 @@
+"""Traffic rates derived from the port counters of port.cgi?page=stats.
+
+Packets/s and errors/s come from the difference between two consecutive
+reads of the counters the integration already polls, so they cost no
+extra requests. Counters that go backwards are either a wrap (the previous
+value was close to the counter's maximum) or a clear/reboot, in which case
+the baseline starts over and the rate is unknown until the next read.
+"""
+
+# Counter widths: packet counters are 64-bit (shown as "high-low"), error counters 32-bit
+COUNTER_BITS = {
+    "tx_packets": 64,
+    "rx_packets": 64,
+    "tx_errors": 32,
+    "rx_errors": 32,
+}
+
+# Suffix of the derived port field, e.g. "rx_packets" -> "rx_packets_rate"
+RATE_SUFFIX = "_rate"
+
+
+def counter_delta(previous, current, bits):
+    """Increase of a counter between two reads, or None if it was cleared."""
+    if current >= previous:
+        return current - previous
+    modulus = 1 << bits
+    # Only a counter that was in the top quarter of its range can have wrapped
+    if previous >= modulus - (modulus >> 2):
+        return current + modulus - previous
+    return None
+
+
+class TrafficRates:
+    """Keeps the last counter sample per port and turns new samples into rates."""
+
+    def __init__(self):
+        self._samples = {}
+
+    def reset(self):
+        """Forget all baselines (the counters were cleared on purpose)."""
+        self._samples.clear()
+
+    def update(self, ports, now):
+        """Feed {port: port data} read at monotonic time `now`.
+
+        Returns {port: {"<counter>_rate": per second}} for every port with
+        counters. A rate is None when it can't be computed (first read,
+        cleared counters), so the sensor doesn't keep showing the last one.
+        """
+        rates = {}
+        for port_num, info in ports.items():
+            counters = {field: info[field] for field in COUNTER_BITS if info.get(field) is not None}
+            if not counters:
+                continue
+
+            previous = self._samples.get(port_num)
+            self._samples[port_num] = (now, counters)
+            previous_time, previous_counters = previous if previous is not None else (now, {})
+            elapsed = now - previous_time
+
+            port_rates = rates[port_num] = {}
+            for field, value in counters.items():
+                delta = None
+                if field in previous_counters and elapsed > 0:
+                    delta = counter_delta(previous_counters[field], value, COUNTER_BITS[field])
+                port_rates[field + RATE_SUFFIX] = round(delta / elapsed, 2) if delta is not None else None
+        return rates
@@ -0,0 +1,123 @@
+"""Per-endpoint polling schedule for Keeplink Switch.
+
+Every endpoint has its own cadence. Deadlines live in a heap and advance by
+whole intervals from the previous deadline (not from "now"), so the
+schedule doesn't drift no matter how long a fetch takes.
+"""
+import heapq
+import math
+import time
+
+# The coordinator timer may fire slightly early, treat anything this close as due
+DUE_TOLERANCE = 1.0
+
+
+class EndpointScheduler:
+    """Deadline queue deciding which endpoints are due on each tick."""
+
+    def __init__(self, intervals, now=None, phase=0.0):
+        """Initialize with {endpoint: interval seconds}; everything is due immediately.
+
+        phase (0..1) shifts the following deadlines by that fraction of each
+        interval, so several switches don't poll in lockstep.
+        """
+        now = time.monotonic() if now is None else now
+        self.intervals = {endpoint: max(1, int(interval)) for endpoint, interval in intervals.items()}
+        self._deadlines = {}
+        self._heap = []
+        for endpoint, interval in self.intervals.items():
+            # Already due, and one interval later lands on now + phase * interval
+            self._push(endpoint, now - (1.0 - phase) * interval)
+
+    def _push(self, endpoint, deadline):
+        self._deadlines[endpoint] = deadline
+        heapq.heappush(self._heap, (deadline, endpoint))
+
+    def _prune(self):
+        """Drop heap entries that were superseded by a newer deadline."""
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def due(self, now=None):
+        """Return the set of endpoints whose deadline has passed (without consuming them)."""
+        now = time.monotonic() if now is None else now
+        return {endpoint for endpoint, deadline in self._deadlines.items() if deadline <= now + DUE_TOLERANCE}
+
+    def mark_done(self, endpoints, now=None):
+        """Advance the deadline of fetched endpoints by whole intervals, keeping their phase."""
+        now = time.monotonic() if now is None else now
+        for endpoint in endpoints:
+            if endpoint not in self.intervals:
+                continue
+            interval = self.intervals[endpoint]
+            deadline = self._deadlines[endpoint]
+            periods = max(1, math.floor((now + DUE_TOLERANCE - deadline) / interval) + 1)
+            self._push(endpoint, deadline + periods * interval)
+
+    def set_interval(self, endpoints, interval, now=None):
+        """Change the cadence of endpoints, pulling their deadline in if the new one is sooner."""
+        now = time.monotonic() if now is None else now
+        interval = max(1, int(interval))
+        for endpoint in endpoints:
+            if endpoint not in self.intervals:
+                continue
+            self.intervals[endpoint] = interval
+            if self._deadlines[endpoint] > now + interval:
+                self._push(endpoint, now + interval)
+
+    def remove(self, endpoints):
+        """Stop polling endpoints altogether (pages the switch doesn't have)."""
+        for endpoint in endpoints:
+            self.intervals.pop(endpoint, None)
+            self._deadlines.pop(endpoint, None)
+
+    def next_deadline(self):
+        """Monotonic time of the earliest deadline."""
+        self._prune()
+        return self._heap[0][0]
+
+    def seconds_until_next(self, now=None):
+        """Seconds until the next endpoint becomes due (never negative)."""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.next_deadline() - now)
+
+
+# Changes smaller than these are treated as noise: power (W), voltage (V), current (mA)
+POE_NOISE_FLOORS = (0.5, 0.5, 10.0)
+
+
+class AdaptiveInterval:
+    """Picks a PoE polling interval inside [min, max] from how much readings move.
+
+    When any port's power, voltage or current moves more than the threshold
+    (relative, with an absolute noise floor) the interval drops straight to the
+    minimum; while readings stay flat it backs off gradually to the maximum.
+    """
+
+    def __init__(self, base_interval, min_interval, max_interval, threshold_pct, backoff=1.5):
+        self.min_interval = max(1, int(min_interval))
+        self.max_interval = max(self.min_interval, int(max_interval))
+        self.threshold = threshold_pct / 100.0
+        self.backoff = backoff
+        self.interval = min(self.max_interval, max(self.min_interval, int(base_interval)))
+
+    def _is_volatile(self, previous, current):
+        for port, readings in current.items():
+            old_readings = previous.get(port)
+            if old_readings is None:
+                continue
+            for old, new, floor in zip(old_readings, readings, POE_NOISE_FLOORS):
+                if old is None or new is None:
+                    continue
+                delta = abs(new - old)
+                if delta > floor and delta > abs(old) * self.threshold:
+                    return True
+        return False
+
+    def update(self, previous, current):
+        """Feed {port: (power, voltage, current)} of two polls and return the new interval."""
+        if self._is_volatile(previous, current):
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, int(round(self.interval * self.backoff)))
+        return self.interval
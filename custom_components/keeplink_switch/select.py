@@ -3,16 +3,15 @@ from homeassistant.components.select import SelectEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DOMAIN
+from .const import DOMAIN, SPEED_DUPLEX_VALUES, SPEED_DUPLEX_LABELS
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the Keeplink Switch selects."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
     
     selects = []
-    if "ports" in coordinator.data:
-        for port_num in coordinator.data["ports"]:
-            selects.append(KeeplinkPortSpeedSelect(coordinator, port_num))
+    for port_num in coordinator.profile.ports:
+        selects.append(KeeplinkPortSpeedSelect(coordinator, port_num))
 
     async_add_entities(selects)
 
@@ -21,54 +20,27 @@ class KeeplinkPortSpeedSelect(CoordinatorEntity, SelectEntity):
 
     def __init__(self, coordinator, port_num):
         """Initialize the select."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({(port_num, "config_speed")}))
         self.port_num = port_num
+        self._port = coordinator.ports[port_num]
         self._attr_unique_id = f"{coordinator.mac_address}_port{port_num}_speed_select"
         self._attr_name = f"Keeplink Port {port_num} Speed"
         self._attr_icon = "mdi:transit-connection-variant"
         
-        # Dynamically set options based on Port type (Port 9 is SFP+)
-        if port_num == 9:
-            self._attr_options = ["Auto", "100M/Full", "1000M/Full", "2500M/Full", "10G/Full"]
-        else:
-            self._attr_options = ["Auto", "10M/Half", "10M/Full", "100M/Half", "100M/Full", "1000M/Full", "2500M/Full"]
-
-        # Map UI dropdown strings to payload integers
-        self._val_map = {
-            "Auto": 0, 
-            "10M/Half": 1, 
-            "10M/Full": 2, 
-            "100M/Half": 3, 
-            "100M/Full": 4, 
-            "1000M/Full": 5, 
-            "2500M/Full": 6, 
-            "10G/Full": 8
-        }
-        
-        # Map HTML text strings from the switch to our UI dropdown strings
-        self._html_map = {
-            "Auto": "Auto",
-            "10 Half": "10M/Half", 
-            "10 Full": "10M/Full",
-            "100 Half": "100M/Half", 
-            "100 Full": "100M/Full",
-            "1000Full": "1000M/Full",
-            "2.5G Full": "2500M/Full",
-            "10G Full": "10G/Full"
-        }
+        # Options depend on the port type (SFP cage or copper) of this model
+        self._attr_options = list(coordinator.profile.speed_options(port_num))
 
     @property
     def current_option(self):
         """Return the current selected option."""
-        port_data = self.coordinator.data.get("ports", {}).get(self.port_num, {})
-        cfg_speed = port_data.get("config_speed", "Auto")
+        cfg_speed = self._port.get("config_speed", "Auto")
         
         # Translate HTML string to UI String. Default to "Auto" if not found.
-        return self._html_map.get(cfg_speed, "Auto")
+        return SPEED_DUPLEX_LABELS.get(cfg_speed, "Auto")
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
-        speed_val = self._val_map[option]
+        speed_val = SPEED_DUPLEX_VALUES[option]
         await self.coordinator.async_set_port_settings(self.port_num, speed_val=speed_val)
 
     @property
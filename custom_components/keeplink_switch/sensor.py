@@ -1,8 +1,8 @@
 """Sensor platform for Keeplink Switch."""
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass, RestoreSensor
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass, RestoreSensor, SensorExtraStoredData
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
-from homeassistant.const import UnitOfPower, UnitOfElectricPotential, UnitOfElectricCurrent, UnitOfEnergy
+from homeassistant.const import UnitOfPower, UnitOfElectricPotential, UnitOfElectricCurrent, UnitOfEnergy, UnitOfTime, PERCENTAGE
 from homeassistant.util import dt as dt_util
 from homeassistant.core import callback
 
@@ -10,12 +10,25 @@ from .const import (
     DOMAIN, 
     CONF_CREATE_TOTAL_ENERGY, 
     CONF_CREATE_PORT_ENERGY, 
-    CONF_UTILITY_CYCLES
+    CONF_UTILITY_CYCLES,
+    CONF_ENERGY_METHOD,
+    CONF_ENERGY_MAX_GAP,
+    CONF_POE_ADAPTIVE
 )
+from .energy import (
+    EnergyAccumulator,
+    effective_max_gap,
+    next_cycle_start,
+    share_after,
+    DEFAULT_METHOD as DEFAULT_ENERGY_METHOD,
+    DEFAULT_MAX_GAP as DEFAULT_ENERGY_MAX_GAP
+)
+from .rates import COUNTER_BITS, RATE_SUFFIX
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the Keeplink Switch sensors."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    profile = coordinator.profile
     
     # 1. Base Sensors
     sensors = [
@@ -27,41 +40,65 @@ async def async_setup_entry(hass, entry, async_add_entities):
         KeeplinkSensor(coordinator, "netmask", "Netmask", "mdi:subnet-mask"),
         KeeplinkSensor(coordinator, "gateway", "Gateway", "mdi:router"),
         KeeplinkSensor(coordinator, "firmware_date", "Firmware Date", "mdi:calendar-clock"),
-        KeeplinkPoETotalSensor(coordinator)
+        KeeplinkParseCacheSensor(coordinator),
+        KeeplinkDispatchSensor(coordinator),
+        KeeplinkConnectionSensor(coordinator),
+        KeeplinkCommandQueueSensor(coordinator),
+        KeeplinkReconcileSensor(coordinator),
+        KeeplinkCycleTimeSensor(coordinator)
     ]
+    sensors.extend(KeeplinkEndpointTimingSensor(coordinator, endpoint) for endpoint in profile.endpoints)
+    if coordinator.fleet is not None:
+        sensors.append(KeeplinkQueueWaitSensor(coordinator))
     
+    if profile.has_poe:
+        sensors.append(KeeplinkPoETotalSensor(coordinator))
+        if entry.data.get(CONF_POE_ADAPTIVE, False):
+            sensors.append(KeeplinkPoEIntervalSensor(coordinator))
+
     # Check config for Energy generation
     create_total_energy = entry.data.get(CONF_CREATE_TOTAL_ENERGY, False)
     create_port_energy = entry.data.get(CONF_CREATE_PORT_ENERGY, False)
     utility_cycles = entry.data.get(CONF_UTILITY_CYCLES, [])
+    energy_method = entry.data.get(CONF_ENERGY_METHOD, DEFAULT_ENERGY_METHOD)
+    # Never shorter than the PoE polling, even at the adaptive maximum
+    poe_interval = (
+        coordinator.poe_adaptive.max_interval if coordinator.poe_adaptive is not None else coordinator.poe_scan_interval
+    )
+    energy_max_gap = effective_max_gap(entry.data.get(CONF_ENERGY_MAX_GAP, DEFAULT_ENERGY_MAX_GAP), poe_interval)
 
-    # 2. Total Energy Sensors
-    if create_total_energy:
-        sensors.append(KeeplinkEnergySensor(coordinator, is_total=True))
+    # 2. Total Energy Sensors (one accumulator feeds the meter and all its cycles)
+    if create_total_energy and profile.has_poe:
+        accumulator = EnergyAccumulator(None, energy_method, energy_max_gap)
+        sensors.append(KeeplinkEnergySensor(coordinator, accumulator, is_total=True))
         for cycle in utility_cycles:
-            sensors.append(KeeplinkUtilitySensor(coordinator, is_total=True, cycle=cycle))
+            sensors.append(KeeplinkUtilitySensor(coordinator, accumulator, is_total=True, cycle=cycle))
 
     # 3. Per-Port Dynamic Sensors
-    if "ports" in coordinator.data:
-        for port_num, port_data in coordinator.data["ports"].items():
-            if "power" in port_data:
-                # Add basic PoE sensors (Disabled by default)
-                sensors.append(KeeplinkPortSensor(coordinator, port_num, "power"))
-                sensors.append(KeeplinkPortSensor(coordinator, port_num, "voltage"))
-                sensors.append(KeeplinkPortSensor(coordinator, port_num, "current"))
-                
-                # Add Energy & Utility sensors for this port if enabled
-                if create_port_energy:
-                    sensors.append(KeeplinkEnergySensor(coordinator, is_total=False, port_num=port_num))
-                    for cycle in utility_cycles:
-                        sensors.append(KeeplinkUtilitySensor(coordinator, is_total=False, port_num=port_num, cycle=cycle))
+    for port_num in profile.ports:
+        # Traffic rates derived from the stats counters (Disabled by default)
+        for counter in COUNTER_BITS:
+            sensors.append(KeeplinkPortRateSensor(coordinator, port_num, counter))
+
+        if port_num in profile.poe_ports:
+            # Add basic PoE sensors (Disabled by default)
+            sensors.append(KeeplinkPortSensor(coordinator, port_num, "power"))
+            sensors.append(KeeplinkPortSensor(coordinator, port_num, "voltage"))
+            sensors.append(KeeplinkPortSensor(coordinator, port_num, "current"))
+            
+            # Add Energy & Utility sensors for this port if enabled
+            if create_port_energy:
+                accumulator = EnergyAccumulator(port_num, energy_method, energy_max_gap)
+                sensors.append(KeeplinkEnergySensor(coordinator, accumulator, is_total=False, port_num=port_num))
+                for cycle in utility_cycles:
+                    sensors.append(KeeplinkUtilitySensor(coordinator, accumulator, is_total=False, port_num=port_num, cycle=cycle))
 
     async_add_entities(sensors)
 
 # --- Standard Sensors (Unchanged) ---
 class KeeplinkSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, key, name, icon):
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({(None, key)}))
         self._key = key
         self._name = name
         self._icon = icon
@@ -87,10 +124,268 @@ class KeeplinkPoETotalSensor(KeeplinkSensor):
         self._attr_native_unit_of_measurement = UnitOfPower.WATT
         self._attr_suggested_display_precision = 3
 
+class KeeplinkPoEIntervalSensor(KeeplinkSensor):
+    """Effective PoE polling interval picked by the adaptive poller."""
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "poe_effective_interval", "PoE Poll Interval", "mdi:timer-sync-outline")
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfTime.SECONDS
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+class KeeplinkParseCacheSensor(CoordinatorEntity, SensorEntity):
+    """Share of fetched pages whose parse was reused because the body didn't change."""
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac_address}_parse_cache_hit_ratio"
+        self._attr_name = "Keeplink Parse Cache Hit Ratio"
+        self._attr_icon = "mdi:cached"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 1
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        stats = self.coordinator.page_cache_stats
+        total = stats["hits"] + stats["misses"]
+        return (stats["hits"] / total) * 100 if total else None
+
+    @property
+    def extra_state_attributes(self):
+        stats = self.coordinator.page_cache_stats
+        attributes = {
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "bytes_skipped": stats["bytes_skipped"],
+        }
+        for endpoint, endpoint_stats in stats["endpoints"].items():
+            attributes[f"{endpoint} hits"] = endpoint_stats["hits"]
+            attributes[f"{endpoint} misses"] = endpoint_stats["misses"]
+        return attributes
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
+class KeeplinkDispatchSensor(CoordinatorEntity, SensorEntity):
+    """Share of entity state writes skipped because none of the entity's keys changed."""
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac_address}_suppressed_state_writes"
+        self._attr_name = "Keeplink Suppressed State Writes"
+        self._attr_icon = "mdi:filter-variant-remove"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 1
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        stats = self.coordinator.dispatch_stats
+        total = stats["dispatched"] + stats["suppressed"]
+        return (stats["suppressed"] / total) * 100 if total else None
+
+    @property
+    def extra_state_attributes(self):
+        return dict(self.coordinator.dispatch_stats)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
+class KeeplinkConnectionSensor(CoordinatorEntity, SensorEntity):
+    """Share of requests that went out over an already open keep-alive connection."""
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac_address}_connection_reuse"
+        self._attr_name = "Keeplink Connection Reuse"
+        self._attr_icon = "mdi:lan-connect"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 1
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        ratio = self.coordinator.connection_stats.as_dict()["reuse_ratio"]
+        return ratio * 100 if ratio is not None else None
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.connection_stats.as_dict()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
+class KeeplinkCommandQueueSensor(CoordinatorEntity, SensorEntity):
+    """Number of commands sent in the last write batch, with queue depth as attributes."""
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac_address}_command_batch_size"
+        self._attr_name = "Keeplink Command Batch Size"
+        self._attr_icon = "mdi:tray-full"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        return self.coordinator.commands.stats["last_batch_size"]
+
+    @property
+    def extra_state_attributes(self):
+        return dict(self.coordinator.commands.stats)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
+class KeeplinkReconcileSensor(CoordinatorEntity, SensorEntity):
+    """Share of optimistically shown writes the switch did not confirm on read-back."""
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac_address}_optimistic_mismatch_rate"
+        self._attr_name = "Keeplink Optimistic Mismatch Rate"
+        self._attr_icon = "mdi:sync-alert"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 1
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        stats = self.coordinator.optimistic_stats
+        total = stats["confirmed"] + stats["mismatched"]
+        return (stats["mismatched"] / total) * 100 if total else None
+
+    @property
+    def extra_state_attributes(self):
+        stats = self.coordinator.optimistic_stats
+        return {
+            "applied": stats["applied"],
+            "confirmed": stats["confirmed"],
+            "mismatched": stats["mismatched"],
+            "last_ui_update_ms": round(stats["last_ui_update_ms"], 1),
+            "avg_ui_update_ms": round(stats["ui_update_ms_total"] / stats["applied"], 1) if stats["applied"] else None,
+            "last_confirm_ms": round(stats["last_confirm_ms"], 1),
+        }
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
+class KeeplinkCycleTimeSensor(CoordinatorEntity, SensorEntity):
+    """Median duration of an update cycle (fetch, parse and merge), with percentiles as attributes."""
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac_address}_update_cycle_time"
+        self._attr_name = "Keeplink Update Cycle Time"
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 1
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        return self.coordinator.timing.cycle_ms.percentile(0.5)
+
+    @property
+    def extra_state_attributes(self):
+        timing = self.coordinator.timing
+        attributes = timing.cycle_ms.as_dict()
+        for key, value in timing.merge_ms.as_dict(3).items():
+            attributes[f"merge_{key}"] = value
+        return attributes
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
+class KeeplinkEndpointTimingSensor(CoordinatorEntity, SensorEntity):
+    """Median request time of one page, with time to first byte, body size and parse time as attributes."""
+    def __init__(self, coordinator, endpoint):
+        super().__init__(coordinator)
+        self.endpoint = endpoint
+        # "port.cgi?page=stats" -> "port_stats"
+        slug = endpoint.replace(".cgi", "").replace("?page=", "_")
+        self._attr_unique_id = f"{coordinator.mac_address}_{slug}_request_time"
+        self._attr_name = f"Keeplink {endpoint} Request Time"
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 1
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        timing = self.coordinator.timing.endpoints.get(self.endpoint)
+        return timing.request_ms.percentile(0.5) if timing else None
+
+    @property
+    def extra_state_attributes(self):
+        timing = self.coordinator.timing.endpoints.get(self.endpoint)
+        if timing is None:
+            return {}
+        attributes = {}
+        for name, stats in timing.as_dict().items():
+            for key, value in stats.items():
+                attributes[f"{name}_{key}"] = value
+        return attributes
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
+class KeeplinkQueueWaitSensor(CoordinatorEntity, SensorEntity):
+    """Average time this switch's requests waited for a fleet-wide request slot."""
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac_address}_request_queue_wait"
+        self._attr_name = "Keeplink Request Queue Wait"
+        self._attr_icon = "mdi:timer-sand"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 1
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        stats = self.coordinator.fleet.host_wait.get(self.coordinator.host)
+        return stats.as_dict()["avg_wait_ms"] if stats else None
+
+    @property
+    def extra_state_attributes(self):
+        fleet = self.coordinator.fleet
+        stats = fleet.host_wait.get(self.coordinator.host)
+        attributes = stats.as_dict() if stats else {}
+        for key, value in fleet.fleet_wait.as_dict().items():
+            attributes[f"fleet_{key}"] = value
+        attributes["fleet_switches"] = len(fleet.members)
+        attributes["fleet_max_in_flight"] = fleet.max_in_flight
+        return attributes
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
 class KeeplinkPortSensor(CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, port_num, metric):
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({(port_num, metric)}))
         self.port_num = port_num
+        self._port = coordinator.ports[port_num]
         self.metric = metric
         self._attr_unique_id = f"{coordinator.mac_address}_port{port_num}_{metric}"
         self._attr_name = f"Keeplink Port {port_num} PoE {metric.capitalize()}"
@@ -117,8 +412,32 @@ class KeeplinkPortSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self):
-        port_data = self.coordinator.data.get("ports", {}).get(self.port_num)
-        return port_data.get(self.metric) if port_data else None
+        return getattr(self._port, self.metric)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(identifiers={(DOMAIN, self.coordinator.mac_address)})
+
+
+class KeeplinkPortRateSensor(CoordinatorEntity, SensorEntity):
+    """Packets/s or errors/s of one port, derived from consecutive counter reads."""
+    def __init__(self, coordinator, port_num, counter):
+        self.field = counter + RATE_SUFFIX
+        super().__init__(coordinator, frozenset({(port_num, self.field)}))
+        self.port_num = port_num
+        self._port = coordinator.ports[port_num]
+        direction, kind = counter.split("_")
+        self._attr_unique_id = f"{coordinator.mac_address}_port{port_num}_{self.field}"
+        self._attr_name = f"Keeplink Port {port_num} {direction.upper()} {kind.capitalize()} Rate"
+        self._attr_native_unit_of_measurement = f"{kind}/s"
+        self._attr_icon = "mdi:swap-vertical" if kind == "packets" else "mdi:alert-circle-outline"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_suggested_display_precision = 1
+        self._attr_entity_registry_enabled_default = False
+
+    @property
+    def native_value(self):
+        return getattr(self._port, self.field)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -126,18 +445,32 @@ class KeeplinkPortSensor(CoordinatorEntity, SensorEntity):
 
 
 # --- NEW: Energy & Utility Sensors (Riemann Sum Integration & Resets) ---
+class KeeplinkEnergyStoredData(SensorExtraStoredData):
+    """Restore data of an energy sensor: the meter value plus the last power sample."""
+
+    def __init__(self, native_value, native_unit_of_measurement, integrator):
+        super().__init__(native_value, native_unit_of_measurement)
+        self.integrator = integrator
+
+    def as_dict(self):
+        data = super().as_dict()
+        data["integrator"] = self.integrator
+        return data
+
+
 class KeeplinkEnergySensor(CoordinatorEntity, RestoreSensor):
-    """Calculates accumulated energy (kWh) from Power (W) using Left Riemann sum."""
+    """Accumulated energy (kWh) of one power source, fed by its shared EnergyAccumulator."""
     
-    def __init__(self, coordinator, is_total=True, port_num=None):
-        super().__init__(coordinator)
+    def __init__(self, coordinator, accumulator, is_total=True, port_num=None):
+        # Only new power readings (stamped with the time the switch was read) matter
+        super().__init__(coordinator, frozenset({(None, accumulator.sample_key)}))
         self.is_total = is_total
         self.port_num = port_num
         
-        # State variables for Riemann sum
+        # Shared with the utility meters of the same source, which integrate nothing themselves
+        self._accumulator = accumulator
         self._state = 0.0
-        self._last_update_time = None
-        self._last_power_w = 0.0
+        self._last_sample = None
 
         if is_total:
             self._attr_unique_id = f"{coordinator.mac_address}_total_energy"
@@ -163,33 +496,31 @@ class KeeplinkEnergySensor(CoordinatorEntity, RestoreSensor):
             except ValueError:
                 self._state = 0.0
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator and apply Left Riemann Sum."""
-        now = dt_util.utcnow()
-        
-        # Fetch current power
-        if self.is_total:
-            current_power = self.coordinator.data.get("poe_total_power", 0.0)
-        else:
-            port_data = self.coordinator.data.get("ports", {}).get(self.port_num, {})
-            current_power = port_data.get("power", 0.0)
+        # Continue from the last power sample, so a short restart is integrated too
+        integrator = self._accumulator.integrator
+        last_extra = await self.async_get_last_extra_data()
+        if last_extra is not None and integrator.last_time is None:
+            integrator.restore(last_extra.as_dict().get("integrator"))
 
-        # Left Riemann Sum Math: kWh = (Last Power * Delta Hours) / 1000
-        if self._last_update_time is not None:
-            delta_seconds = (now - self._last_update_time).total_seconds()
-            delta_hours = delta_seconds / 3600.0
-            
-            # Use _last_power_w (Left method) for calculation
-            added_kwh = (self._last_power_w * delta_hours) / 1000.0
-            self._state += added_kwh
+    @property
+    def extra_restore_state_data(self):
+        return KeeplinkEnergyStoredData(
+            self.native_value, self.native_unit_of_measurement, self._accumulator.integrator.as_dict()
+        )
 
-        # Update tracking variables
-        self._last_update_time = now
-        self._last_power_w = current_power
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator and add the energy of the new power sample."""
+        sampled_at, increment = self._accumulator.update(self.coordinator.data)
+        if sampled_at is not None and sampled_at != self._last_sample:
+            self._last_sample = sampled_at
+            self._add_energy(sampled_at, increment)
 
         super()._handle_coordinator_update()
 
+    def _add_energy(self, sampled_at, increment):
+        self._state += increment
+
     @property
     def native_value(self):
         return self._state
@@ -202,10 +533,12 @@ class KeeplinkEnergySensor(CoordinatorEntity, RestoreSensor):
 class KeeplinkUtilitySensor(KeeplinkEnergySensor):
     """Energy Sensor that resets based on Daily, Monthly, or Yearly cycles."""
     
-    def __init__(self, coordinator, is_total, port_num=None, cycle="daily"):
-        # Initialize the base energy sensor to handle the math
-        super().__init__(coordinator, is_total, port_num)
+    def __init__(self, coordinator, accumulator, is_total, port_num=None, cycle="daily"):
+        # The base energy sensor reads the increments from the shared accumulator
+        super().__init__(coordinator, accumulator, is_total, port_num)
         self.cycle = cycle
+        # Epoch seconds of the next reset, computed once per cycle instead of comparing dates every tick
+        self._next_reset = None
         
         if is_total:
             self._attr_unique_id = f"{coordinator.mac_address}_total_energy_{cycle}"
@@ -216,21 +549,24 @@ class KeeplinkUtilitySensor(KeeplinkEnergySensor):
             
         self._attr_icon = "mdi:chart-timeline"
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Check for cycle boundary crossings before accumulating energy."""
-        now = dt_util.now() # Use local time for utility resets!
-        
-        if self._last_update_time is not None:
-            last_local = dt_util.as_local(self._last_update_time)
-            
-            # Detect Boundary Crossing and Reset to 0
-            if self.cycle == "daily" and now.day != last_local.day:
-                self._state = 0.0
-            elif self.cycle == "monthly" and now.month != last_local.month:
-                self._state = 0.0
-            elif self.cycle == "yearly" and now.year != last_local.year:
-                self._state = 0.0
+    async def async_added_to_hass(self):
+        """Restore the meter, then work out when its current cycle ends."""
+        await super().async_added_to_hass()
+        # Anchor on the last restored sample, so a restart across midnight still resets
+        last_time = self._accumulator.integrator.last_time
+        anchor = dt_util.utc_from_timestamp(last_time) if last_time is not None else dt_util.utcnow()
+        self._schedule_reset(anchor)
+
+    def _schedule_reset(self, moment):
+        # Use local time for utility resets!
+        self._next_reset = next_cycle_start(self.cycle, dt_util.as_local(moment)).timestamp()
 
-        # Now let the parent class do the normal Riemann math
-        super()._handle_coordinator_update()
\ No newline at end of file
+    def _add_energy(self, sampled_at, increment):
+        if self._next_reset is not None and sampled_at >= self._next_reset:
+            # The last reset passed since the previous sample; only the energy after it starts the new cycle
+            while self._next_reset <= sampled_at:
+                boundary = self._next_reset
+                self._schedule_reset(dt_util.utc_from_timestamp(boundary))
+            increment = share_after(increment, self._accumulator.previous_time, sampled_at, boundary)
+            self._state = 0.0
+        self._state += increment
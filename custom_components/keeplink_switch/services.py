@@ -0,0 +1,212 @@
+"""Services for Keeplink Switch."""
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import (
+    DOMAIN,
+    SERVICE_SET_POE,
+    SERVICE_SET_PORT_SETTINGS,
+    SERVICE_POWER_CYCLE,
+    SERVICE_PROFILE,
+    ATTR_PORTS,
+    ATTR_STATE,
+    ATTR_SPEED,
+    ATTR_FLOW,
+    ATTR_DELAY,
+    ATTR_STAGGER,
+    ATTR_CYCLES,
+    SPEED_DUPLEX_VALUES,
+    DEFAULT_POWER_CYCLE_DELAY,
+    DEFAULT_POWER_CYCLE_STAGGER,
+    DEFAULT_PROFILE_CYCLES
+)
+from .coordinator import KeeplinkCoordinator
+from .profiling import CycleProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+_TARGET_SCHEMA = {
+    # Omit to address every configured switch
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Required(ATTR_PORTS): vol.All(cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=1))]),
+}
+
+SET_POE_SCHEMA = vol.Schema({
+    **_TARGET_SCHEMA,
+    vol.Required(ATTR_STATE): cv.boolean,
+})
+
+SET_PORT_SETTINGS_SCHEMA = vol.All(
+    vol.Schema({
+        **_TARGET_SCHEMA,
+        vol.Optional(ATTR_STATE): cv.boolean,
+        vol.Optional(ATTR_SPEED): vol.In(list(SPEED_DUPLEX_VALUES)),
+        vol.Optional(ATTR_FLOW): cv.boolean,
+    }),
+    cv.has_at_least_one_key(ATTR_STATE, ATTR_SPEED, ATTR_FLOW),
+)
+
+POWER_CYCLE_SCHEMA = vol.Schema({
+    **_TARGET_SCHEMA,
+    vol.Optional(ATTR_DELAY, default=DEFAULT_POWER_CYCLE_DELAY): vol.All(vol.Coerce(float), vol.Range(min=0, max=300)),
+    vol.Optional(ATTR_STAGGER, default=DEFAULT_POWER_CYCLE_STAGGER): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+})
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_DEVICE_ID): cv.string,
+    vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+})
+
+
+def _resolve_coordinators(hass, device_ids):
+    """Map the service target to coordinators (all switches when no device is given)."""
+    coordinators = {
+        entry_id: coordinator
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+        if isinstance(coordinator, KeeplinkCoordinator)
+    }
+    if not device_ids:
+        return list(coordinators.values())
+
+    registry = dr.async_get(hass)
+    selected = []
+    for device_id in device_ids:
+        device = registry.async_get(device_id)
+        matches = [coordinators[entry_id] for entry_id in device.config_entries if entry_id in coordinators] if device else []
+        if not matches:
+            raise ServiceValidationError(f"{device_id} is not a loaded Keeplink switch")
+        selected.extend(coordinator for coordinator in matches if coordinator not in selected)
+    return selected
+
+
+def _check_poe(coordinator, port_num):
+    return None if port_num in coordinator.profile.poe_ports else "Port has no PoE"
+
+
+def _check_speed(speed):
+    def check(coordinator, port_num):
+        return None if speed in coordinator.profile.speed_options(port_num) else f"Port does not support {speed}"
+    return check
+
+
+async def _async_run_bulk(coordinators, ports, action, fields, check=None):
+    """Run a bulk action on every switch concurrently and flatten the per-port results.
+
+    Each result reports the value of `fields` as read back from the switch.
+    Ports the model doesn't have, or for which check(coordinator, port)
+    returns an error, are skipped and reported as failed.
+    """
+    async def run(coordinator):
+        rejected = {}
+        for port_num in ports:
+            if port_num not in coordinator.profile.ports:
+                rejected[port_num] = "Unknown port"
+            elif check is not None and (error := check(coordinator, port_num)) is not None:
+                rejected[port_num] = error
+        errors = await action(coordinator, [port_num for port_num in ports if port_num not in rejected])
+
+        results = []
+        for port_num in ports:
+            result = {"switch": coordinator.host, "port": port_num}
+            if port_num in rejected:
+                result.update(success=False, error=rejected[port_num])
+            else:
+                error = errors.get(port_num)
+                result.update(success=error is None, error=error)
+                port_data = coordinator.ports.get(port_num, {})
+                for field in fields:
+                    result[field] = port_data.get(field)
+            results.append(result)
+        return results
+
+    per_switch = await asyncio.gather(*(run(coordinator) for coordinator in coordinators))
+    return {"results": [result for results in per_switch for result in results]}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant):
+    """Register the bulk services (once, shared by all switches)."""
+    if hass.services.has_service(DOMAIN, SERVICE_SET_POE):
+        return
+
+    async def async_set_poe(call: ServiceCall):
+        coordinators = _resolve_coordinators(hass, call.data.get(ATTR_DEVICE_ID))
+        state = call.data[ATTR_STATE]
+        _LOGGER.debug(f"Setting PoE {'on' if state else 'off'} for ports {call.data[ATTR_PORTS]} on {len(coordinators)} switch(es)")
+        return await _async_run_bulk(
+            coordinators,
+            call.data[ATTR_PORTS],
+            lambda coordinator, ports: coordinator.async_bulk_set_poe(ports, state),
+            ("enabled",),
+            _check_poe
+        )
+
+    async def async_set_port_settings(call: ServiceCall):
+        coordinators = _resolve_coordinators(hass, call.data.get(ATTR_DEVICE_ID))
+        speed = call.data.get(ATTR_SPEED)
+        speed_val = SPEED_DUPLEX_VALUES[speed] if speed is not None else None
+        return await _async_run_bulk(
+            coordinators,
+            call.data[ATTR_PORTS],
+            lambda coordinator, ports: coordinator.async_bulk_set_port_settings(
+                ports, state=call.data.get(ATTR_STATE), speed_val=speed_val, flow=call.data.get(ATTR_FLOW)
+            ),
+            ("admin_state", "config_speed", "config_flow"),
+            _check_speed(speed) if speed is not None else None
+        )
+
+    async def async_power_cycle(call: ServiceCall):
+        coordinators = _resolve_coordinators(hass, call.data.get(ATTR_DEVICE_ID))
+        return await _async_run_bulk(
+            coordinators,
+            call.data[ATTR_PORTS],
+            lambda coordinator, ports: coordinator.async_power_cycle(
+                ports, delay=call.data[ATTR_DELAY], stagger=call.data[ATTR_STAGGER]
+            ),
+            ("enabled",),
+            _check_poe
+        )
+
+    async def async_profile(call: ServiceCall):
+        coordinators = _resolve_coordinators(hass, [call.data[ATTR_DEVICE_ID]])
+        profiler = CycleProfiler(coordinators[0], call.data[ATTR_CYCLES], hass.config.config_dir)
+        if not profiler.start():
+            raise ServiceValidationError("A Keeplink profile is already being captured")
+        # Waits for the scheduled cycles, the switch keeps polling at its normal pace
+        result = await profiler.done
+        if result is None:
+            raise HomeAssistantError("The switch was unloaded before profiling finished")
+        return result
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_POE, async_set_poe,
+        schema=SET_POE_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_PORT_SETTINGS, async_set_port_settings,
+        schema=SET_PORT_SETTINGS_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_POWER_CYCLE, async_power_cycle,
+        schema=POWER_CYCLE_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile,
+        schema=PROFILE_SCHEMA, supports_response=SupportsResponse.OPTIONAL
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant):
+    """Remove the services once the last switch is unloaded."""
+    hass.services.async_remove(DOMAIN, SERVICE_SET_POE)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_PORT_SETTINGS)
+    hass.services.async_remove(DOMAIN, SERVICE_POWER_CYCLE)
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
@@ -0,0 +1,56 @@
+"""Copy-on-write snapshots of the Keeplink coordinator data.
+
+Instead of deep-copying the whole data tree on every tick, a new snapshot
+shallow-copies the top-level values (model, totals, sample times, ...) and
+shares the switch's port table. Port records are updated in place by the
+table itself (see ports.py), which reports the (port, field) pairs that
+changed; top-level changes are found by diffing the two snapshots.
+Published snapshots are wrapped in read-only MappingProxyType views so
+entities can't replace top-level values by accident. Only the top-level
+values are snapshotted: "ports" is the live table, so an older snapshot
+sees the port values of the latest merge, not those of its own cycle.
+"""
+from types import MappingProxyType
+
+_MISSING = object()
+
+
+def begin_snapshot(previous, ports):
+    """Start a new, writable snapshot from the previous one, sharing the port table."""
+    snapshot = dict(previous) if previous else {}
+    snapshot["ports"] = ports
+    return snapshot
+
+
+def merge_ports(snapshot, new_data, changed):
+    """Merge port attributes into the port records, collecting the (port, field) pairs that changed."""
+    ports = new_data.get("ports")
+    if ports:
+        snapshot["ports"].merge(ports, changed)
+
+
+def merge_result(snapshot, new_data, changed):
+    """Merge one parsed page: top-level values overwrite, port fields go to the port records."""
+    for key, value in new_data.items():
+        if key != "ports":
+            snapshot[key] = value
+    merge_ports(snapshot, new_data, changed)
+
+
+def freeze_snapshot(snapshot):
+    """Return the read-only view of a finished snapshot that gets published to entities.
+
+    The view doesn't cover the port table it shares; its records keep changing in place.
+    """
+    return MappingProxyType(snapshot)
+
+
+def diff_snapshots(old, new):
+    """Return the top-level keys that changed between two snapshots as (None, key).
+
+    Port changes are reported by the merge itself, the port table is shared.
+    """
+    return {
+        (None, key) for key, value in new.items()
+        if key != "ports" and old.get(key, _MISSING) != value
+    }
@@ -0,0 +1,100 @@
+"""Persisted last good snapshot of a Keeplink switch.
+
+After a restart the integration creates its entities from the stored
+snapshot (device info, the discovered ports and their last values) instead
+of waiting for a full poll of the switch, then refreshes in the background.
+Saves are delayed, so a switch polled every few seconds still writes the
+file at most once per SNAPSHOT_SAVE_DELAY (and once more on shutdown).
+"""
+import logging
+import time
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .ports import PORT_FIELDS, RATE_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds between writes of the snapshot file
+SNAPSHOT_SAVE_DELAY = 300
+
+# Not restored: rates need two live counter reads, and the energy sensors keep
+# their own last sample (an old sample time would be integrated again)
+_SKIPPED_KEYS = ("poe_total_sampled_at", "poe_port_sampled_at")
+
+
+def dump_snapshot(coordinator):
+    """The JSON-serializable form of the coordinator's current state."""
+    ports = {}
+    for port_num, port in coordinator.ports.items():
+        info = port.as_dict()
+        for field in RATE_FIELDS:
+            info.pop(field, None)
+        # JSON object keys are strings
+        ports[str(port_num)] = info
+    return {
+        "saved_at": time.time(),
+        "mac_address": coordinator.mac_address,
+        "device_info": dict(coordinator.device_info),
+        "data": {
+            key: value for key, value in coordinator.data.items()
+            if key != "ports" and key not in _SKIPPED_KEYS
+        },
+        "ports": ports,
+    }
+
+
+def load_ports(stored):
+    """{port_num: {field: value}} of a stored snapshot.
+
+    Fields PortState doesn't have (saved by another version) are dropped.
+    """
+    return {
+        int(port_num): {field: value for field, value in info.items() if field in PORT_FIELDS}
+        for port_num, info in stored.get("ports", {}).items()
+    }
+
+
+class SnapshotStore:
+    """The stored snapshot of one config entry."""
+
+    def __init__(self, hass, entry_id):
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._coordinator = None
+
+    async def async_load(self):
+        """The stored snapshot, or None if there is none (or it can't be used)."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # A damaged file must not block setup
+            _LOGGER.warning(f"Ignoring stored Keeplink snapshot {self._store.path}: {err}")
+            return None
+        if not stored or not stored.get("mac_address") or not stored.get("ports"):
+            return None
+        return stored
+
+    def async_schedule_save(self, coordinator):
+        """Write the coordinator's state within SNAPSHOT_SAVE_DELAY.
+
+        Store.async_delay_save restarts its timer on every call, so while a
+        save is pending further calls are ignored; the file gets the state
+        of the moment it is written.
+        """
+        if self._coordinator is not None:
+            return
+        self._coordinator = coordinator
+        self._store.async_delay_save(self._dump, SNAPSHOT_SAVE_DELAY)
+
+    async def async_save(self, coordinator):
+        """Write the coordinator's state now (replaces a pending delayed save)."""
+        self._coordinator = None
+        await self._store.async_save(dump_snapshot(coordinator))
+
+    def _dump(self):
+        coordinator, self._coordinator = self._coordinator, None
+        return dump_snapshot(coordinator)
+
+    async def async_remove(self):
+        await self._store.async_remove()
@@ -10,36 +10,34 @@ async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
     
     switches = []
-    if "ports" in coordinator.data:
-        for port_num, port_data in coordinator.data["ports"].items():
-            
-            # 1. Admin State Switch (Applies to all ports)
-            switches.append(KeeplinkPortAdminSwitch(coordinator, port_num))
-            
-            # 2. Flow Control Switch (Applies to all ports)
-            switches.append(KeeplinkPortFlowSwitch(coordinator, port_num))
-            
-            # 3. PoE Switch (Only for ports that support PoE)
-            if "enabled" in port_data:
-                switches.append(KeeplinkPoESwitch(coordinator, port_num))
+    profile = coordinator.profile
+    for port_num in profile.ports:
+        
+        # 1. Admin State Switch (Applies to all ports)
+        switches.append(KeeplinkPortAdminSwitch(coordinator, port_num))
+        
+        # 2. Flow Control Switch (Applies to all ports)
+        switches.append(KeeplinkPortFlowSwitch(coordinator, port_num))
+        
+        # 3. PoE Switch (Only for ports that support PoE)
+        if port_num in profile.poe_ports:
+            switches.append(KeeplinkPoESwitch(coordinator, port_num))
 
     async_add_entities(switches)
 
 class KeeplinkPoESwitch(CoordinatorEntity, SwitchEntity):
     """Representation of a Port PoE Switch."""
     def __init__(self, coordinator, port_num):
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({(port_num, "enabled")}))
         self.port_num = port_num
+        self._port = coordinator.ports[port_num]
         self._attr_unique_id = f"{coordinator.mac_address}_port{port_num}_poe_switch"
         self._attr_name = f"Keeplink Port {port_num} PoE"
         self._attr_icon = "mdi:ethernet"
 
     @property
     def is_on(self):
-        port_data = self.coordinator.data.get("ports", {}).get(self.port_num)
-        if port_data:
-            return port_data.get("enabled", False)
-        return False
+        return bool(self._port.enabled)
 
     async def async_turn_on(self, **kwargs):
         await self.coordinator.async_set_poe_state(self.port_num, True)
@@ -54,16 +52,16 @@ class KeeplinkPoESwitch(CoordinatorEntity, SwitchEntity):
 class KeeplinkPortAdminSwitch(CoordinatorEntity, SwitchEntity):
     """Representation of a Port Admin State Switch."""
     def __init__(self, coordinator, port_num):
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({(port_num, "admin_state")}))
         self.port_num = port_num
+        self._port = coordinator.ports[port_num]
         self._attr_unique_id = f"{coordinator.mac_address}_port{port_num}_admin_state"
         self._attr_name = f"Keeplink Port {port_num} State"
         self._attr_icon = "mdi:network-port"
 
     @property
     def is_on(self):
-        port_data = self.coordinator.data.get("ports", {}).get(self.port_num, {})
-        return port_data.get("admin_state", True)
+        return self._port.get("admin_state", True)
 
     async def async_turn_on(self, **kwargs):
         await self.coordinator.async_set_port_settings(self.port_num, state=True)
@@ -78,16 +76,16 @@ class KeeplinkPortAdminSwitch(CoordinatorEntity, SwitchEntity):
 class KeeplinkPortFlowSwitch(CoordinatorEntity, SwitchEntity):
     """Representation of a Port Flow Control Switch."""
     def __init__(self, coordinator, port_num):
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({(port_num, "config_flow")}))
         self.port_num = port_num
+        self._port = coordinator.ports[port_num]
         self._attr_unique_id = f"{coordinator.mac_address}_port{port_num}_flow_control"
         self._attr_name = f"Keeplink Port {port_num} Flow Control"
         self._attr_icon = "mdi:sync"
 
     @property
     def is_on(self):
-        port_data = self.coordinator.data.get("ports", {}).get(self.port_num, {})
-        return port_data.get("config_flow", False)
+        return self._port.get("config_flow", False)
 
     async def async_turn_on(self, **kwargs):
         await self.coordinator.async_set_port_settings(self.port_num, flow=True)
@@ -0,0 +1,95 @@
+"""Request, parse and update-cycle timing for Keeplink Switch.
+
+Keeps the last samples of every measurement in a fixed-size window so
+percentiles follow what the switch is doing now, not since startup. Used to
+tell a slow switch (request time, time to first byte) from a slow parse or
+merge on the Home Assistant side.
+"""
+from collections import deque
+
+# Samples kept per measurement
+TIMING_WINDOW = 100
+
+
+class RollingWindow:
+    """The last `size` samples of one measurement, with percentiles over them."""
+
+    __slots__ = ("samples", "count", "last")
+
+    def __init__(self, size=TIMING_WINDOW):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.last = None
+
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.last = value
+
+    def percentile(self, fraction):
+        """Nearest-rank percentile of the window, or None without samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    def as_dict(self, digits=2):
+        if not self.samples:
+            return {"count": self.count}
+        ordered = sorted(self.samples)
+        last_index = len(ordered) - 1
+
+        def rank(fraction):
+            return round(ordered[min(last_index, int(round(fraction * last_index)))], digits)
+
+        return {
+            "count": self.count,
+            "last": round(self.last, digits),
+            "p50": rank(0.5),
+            "p95": rank(0.95),
+            "p99": rank(0.99),
+            "max": round(ordered[-1], digits),
+        }
+
+
+class EndpointTiming:
+    """Per-page timings: round trip, time to first byte, body size and parse time."""
+
+    __slots__ = ("request_ms", "ttfb_ms", "body_bytes", "parse_ms")
+
+    def __init__(self, size=TIMING_WINDOW):
+        self.request_ms = RollingWindow(size)
+        self.ttfb_ms = RollingWindow(size)
+        self.body_bytes = RollingWindow(size)
+        self.parse_ms = RollingWindow(size)
+
+    def as_dict(self):
+        return {
+            "request_ms": self.request_ms.as_dict(),
+            "ttfb_ms": self.ttfb_ms.as_dict(),
+            "body_bytes": self.body_bytes.as_dict(0),
+            "parse_ms": self.parse_ms.as_dict(3),
+        }
+
+
+class TimingStats:
+    """All timings of one coordinator."""
+
+    def __init__(self, size=TIMING_WINDOW):
+        self._size = size
+        self.endpoints = {}
+        self.cycle_ms = RollingWindow(size)
+        self.merge_ms = RollingWindow(size)
+
+    def endpoint(self, endpoint):
+        timing = self.endpoints.get(endpoint)
+        if timing is None:
+            timing = self.endpoints[endpoint] = EndpointTiming(self._size)
+        return timing
+
+    def as_dict(self):
+        return {
+            "cycle_ms": self.cycle_ms.as_dict(),
+            "merge_ms": self.merge_ms.as_dict(3),
+            "endpoints": {endpoint: timing.as_dict() for endpoint, timing in self.endpoints.items()},
+        }
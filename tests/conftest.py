@@ -0,0 +1,23 @@
+"""Test setup for the Home Assistant independent modules of the integration.
+
+Registers custom_components/keeplink_switch as a bare keeplink_switch
+package, so its modules import with their relative imports intact without
+running the package __init__ (which needs Home Assistant).
+"""
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMPONENT = os.path.join(ROOT, "custom_components", "keeplink_switch")
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+
+if "keeplink_switch" not in sys.modules:
+    package = types.ModuleType("keeplink_switch")
+    package.__path__ = [COMPONENT]
+    sys.modules["keeplink_switch"] = package
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as fixture_file:
+        return fixture_file.read()
@@ -0,0 +1,125 @@
+"""Tests for the per-switch command queue."""
+import asyncio
+
+import pytest
+
+from keeplink_switch.commands import CommandQueue
+
+
+class FakeSwitch:
+    """Records the writes and read-backs of a CommandQueue."""
+
+    def __init__(self, fail_keys=(), refresh_error=None, on_refresh=None):
+        self.sent = []
+        self.refreshed = []
+        self.fail_keys = set(fail_keys)
+        self.refresh_error = refresh_error
+        self.on_refresh = on_refresh
+
+    async def send(self, command):
+        if command.key in self.fail_keys:
+            raise OSError(f"write of {command.key} failed")
+        self.sent.append((command.key, dict(command.fields)))
+
+    async def refresh(self, endpoints):
+        self.refreshed.append(set(endpoints))
+        if self.on_refresh is not None:
+            self.on_refresh()
+        if self.refresh_error is not None:
+            raise self.refresh_error
+
+
+def make_queue(switch):
+    return CommandQueue(switch.send, switch.refresh, rate=0, batch_window=0)
+
+
+def test_writes_to_the_same_target_are_coalesced():
+    async def run():
+        switch = FakeSwitch()
+        queue = make_queue(switch)
+        first = queue.submit(("poe", 1), {"state": False}, ("pse_port.cgi",))
+        second = queue.submit(("poe", 1), {"state": True}, ("pse_system.cgi",))
+        other = queue.submit(("port", 2), {"flow": True}, ("port.cgi",))
+        await asyncio.gather(first, second, other)
+        await queue.async_wait_idle()
+        return switch, queue, first, second
+
+    switch, queue, first, second = asyncio.run(run())
+
+    assert first is second
+    assert switch.sent == [(("poe", 1), {"state": True}), (("port", 2), {"flow": True})]
+    assert switch.refreshed == [{"pse_port.cgi", "pse_system.cgi", "port.cgi"}]
+    assert queue.stats["coalesced"] == 1
+    assert queue.stats["sent"] == 2
+    assert queue.stats["batches"] == 1
+
+
+def test_failed_write_fails_only_its_future():
+    async def run():
+        switch = FakeSwitch(fail_keys={("poe", 1)})
+        queue = make_queue(switch)
+        failing = queue.submit(("poe", 1), {"state": True}, ("pse_port.cgi",))
+        working = queue.submit(("poe", 2), {"state": True}, ("pse_port.cgi",))
+        results = await asyncio.gather(failing, working, return_exceptions=True)
+        await queue.async_wait_idle()
+        return switch, queue, results
+
+    switch, queue, results = asyncio.run(run())
+
+    assert isinstance(results[0], OSError)
+    assert results[1] is None
+    assert switch.sent == [(("poe", 2), {"state": True})]
+    assert switch.refreshed == [{"pse_port.cgi"}]
+    assert queue.stats["failed"] == 1
+
+
+def test_failed_refresh_keeps_the_queue_draining():
+    async def run():
+        later = []
+        switch = FakeSwitch(refresh_error=RuntimeError("read-back failed"))
+        queue = make_queue(switch)
+
+        def submit_during_refresh():
+            # The worker is still alive while its failing refresh runs, so submit() doesn't start one
+            if not later:
+                later.append(queue.submit(("poe", 2), {"state": True}, ("pse_port.cgi",)))
+
+        switch.on_refresh = submit_during_refresh
+        await queue.submit(("poe", 1), {"state": True}, ("pse_port.cgi",))
+        await asyncio.wait_for(later[0], 1)
+        await asyncio.wait_for(queue.async_wait_idle(), 1)
+        return switch, queue
+
+    switch, queue = asyncio.run(run())
+
+    assert switch.sent == [(("poe", 1), {"state": True}), (("poe", 2), {"state": True})]
+    assert len(switch.refreshed) == 2
+    assert queue.stats["depth"] == 0
+
+
+def test_shutdown_cancels_pending_writes():
+    async def run():
+        switch = FakeSwitch()
+        queue = CommandQueue(switch.send, switch.refresh, rate=0, batch_window=10)
+        pending = queue.submit(("poe", 1), {"state": True})
+        await asyncio.sleep(0)
+        await queue.async_shutdown()
+        return switch, pending
+
+    switch, pending = asyncio.run(run())
+
+    assert pending.cancelled()
+    assert switch.sent == []
+
+
+def test_rate_spaces_the_writes():
+    async def run():
+        switch = FakeSwitch()
+        queue = CommandQueue(switch.send, switch.refresh, rate=20, batch_window=0)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(queue.submit(("poe", port), {"state": True}) for port in (1, 2, 3)))
+        return loop.time() - start
+
+    # Three writes at 20/s: two gaps of 50 ms
+    assert asyncio.run(run()) == pytest.approx(0.1, abs=0.05)
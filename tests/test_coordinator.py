@@ -0,0 +1,110 @@
+"""Tests for the coordinator's scoped refresh and layout check (needs Home Assistant)."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+
+from keeplink_switch.coordinator import KeeplinkCoordinator  # noqa: E402
+from keeplink_switch.models import lookup_profile, probe_profile  # noqa: E402
+from keeplink_switch.ports import PortTable  # noqa: E402
+
+
+class FakeCoordinator:
+    """Just the state async_refresh_endpoints works on; fetching is scripted."""
+
+    host = "192.0.2.1"
+    async_refresh_endpoints = KeeplinkCoordinator.async_refresh_endpoints
+    _async_refresh_failed = KeeplinkCoordinator._async_refresh_failed
+
+    def __init__(self, outcomes):
+        self._outcomes = list(outcomes)
+        self.data = {"model": "old"}
+        self.last_update_success = True
+        self.last_exception = None
+        self.notified = 0
+
+    async def _async_fetch_endpoints(self, endpoints):
+        outcome = self._outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def async_update_listeners(self):
+        self.notified += 1
+
+
+@pytest.mark.parametrize("error", [UpdateFailed("timed out"), ValueError("unreadable page")])
+def test_failed_refresh_marks_the_data_unavailable_once(error):
+    coordinator = FakeCoordinator([error, error])
+
+    asyncio.run(coordinator.async_refresh_endpoints({"pse_port.cgi"}))
+    asyncio.run(coordinator.async_refresh_endpoints({"pse_port.cgi"}))
+
+    assert coordinator.last_update_success is False
+    assert coordinator.last_exception is error
+    assert coordinator.notified == 1
+    assert coordinator.data == {"model": "old"}
+
+
+def test_refresh_after_a_failure_recovers():
+    snapshot = {"model": "new"}
+    coordinator = FakeCoordinator([ValueError("unreadable page"), snapshot])
+
+    asyncio.run(coordinator.async_refresh_endpoints({"pse_port.cgi"}))
+    asyncio.run(coordinator.async_refresh_endpoints({"pse_port.cgi"}))
+
+    assert coordinator.last_update_success is True
+    assert coordinator.last_exception is None
+    assert coordinator.data is snapshot
+    assert coordinator.notified == 2
+
+
+class FakeProfileCoordinator:
+    """Just the state the layout check works on."""
+
+    host = "192.0.2.1"
+    _check_profile = KeeplinkCoordinator._check_profile
+
+    def __init__(self, profile):
+        self.profile = profile
+        self._profile_checked = False
+
+    def _set_profile(self, profile):
+        self.profile = profile
+
+
+def probe(ports):
+    table = PortTable()
+    table.merge(ports, set())
+    return probe_profile("KP-9000-9XHPML-X-AC", table)
+
+
+def test_empty_poe_page_does_not_drop_poe():
+    profile = lookup_profile("KP-9000-9XHPML-X-AC")
+    coordinator = FakeProfileCoordinator(profile)
+
+    # port.cgi listed the ports, pse_port.cgi came back without any
+    coordinator._check_profile(probe({port_num: {"admin_state": True} for port_num in range(1, 10)}))
+    assert coordinator.profile is profile
+    assert coordinator._profile_checked is False
+
+    coordinator._check_profile(probe({}))
+    assert coordinator.profile is profile
+    assert coordinator._profile_checked is False
+
+
+def test_layout_check_prefers_what_the_switch_shows():
+    profile = lookup_profile("KP-9000-9XHPML-X-AC")
+    coordinator = FakeProfileCoordinator(profile)
+    ports = {port_num: {"admin_state": True} for port_num in range(1, 11)}
+    for port_num in range(1, 9):
+        ports[port_num]["enabled"] = True
+
+    coordinator._check_profile(probe(ports))
+
+    assert coordinator._profile_checked is True
+    assert coordinator.profile.port_count == 10
+    assert coordinator.profile.poe_ports == frozenset(range(1, 9))
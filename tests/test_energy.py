@@ -0,0 +1,156 @@
+"""Tests for the PoE energy integration."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from keeplink_switch.energy import (
+    DEFAULT_MAX_GAP,
+    METHOD_LEFT,
+    METHOD_RIGHT,
+    METHOD_TRAPEZOIDAL,
+    EnergyAccumulator,
+    EnergyIntegrator,
+    effective_max_gap,
+    next_cycle_start,
+    share_after,
+)
+
+HOUR = 3600.0
+
+
+def integrate(method, curve, times, max_gap=DEFAULT_MAX_GAP):
+    integrator = EnergyIntegrator(method, max_gap)
+    return sum(integrator.add_sample(curve(t), t) for t in times), integrator
+
+
+def ramp(t):
+    """2 W rising to 12 W over the first hour."""
+    return 2.0 + 10.0 * min(1.0, t / HOUR)
+
+
+@pytest.mark.parametrize(
+    ("method", "expected"),
+    [(METHOD_LEFT, 0.1), (METHOD_RIGHT, 0.3), (METHOD_TRAPEZOIDAL, 0.2)],
+)
+def test_integration_methods(method, expected):
+    integrator = EnergyIntegrator(method, max_gap=3600)
+
+    assert integrator.add_sample(100.0, 0.0) == 0.0
+    # 100 W -> 300 W over an hour
+    assert integrator.add_sample(300.0, 3600.0) == pytest.approx(expected)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        EnergyIntegrator("simpson")
+
+
+@pytest.mark.parametrize("interval", [5, 30, 60, 300])
+def test_constant_load_does_not_depend_on_the_poll_interval(interval):
+    times = [float(t) for t in range(0, int(HOUR) + 1, interval)]
+
+    kwh, _ = integrate(METHOD_TRAPEZOIDAL, lambda t: 6.5, times)
+
+    assert kwh == pytest.approx(6.5 / 1000.0)
+
+
+def test_trapezoidal_is_exact_on_a_ramp_at_slow_polling():
+    # 300 s polling over the one hour ramp: exactly 7 Wh
+    times = [float(t) for t in range(0, int(HOUR) + 1, 300)]
+
+    trapezoidal, _ = integrate(METHOD_TRAPEZOIDAL, ramp, times)
+    left, _ = integrate(METHOD_LEFT, ramp, times)
+    right, _ = integrate(METHOD_RIGHT, ramp, times)
+
+    assert trapezoidal == pytest.approx(0.007)
+    assert left < trapezoidal < right
+
+
+def test_outage_is_not_integrated():
+    # 30 s polling for three hours, nothing read during the second hour
+    times = [float(t) for t in range(0, 3 * int(HOUR) + 1, 30) if not HOUR < t < 2 * HOUR]
+
+    kwh, integrator = integrate(METHOD_TRAPEZOIDAL, lambda t: 10.0, times)
+
+    assert kwh == pytest.approx(0.02)
+    assert integrator.gaps_skipped == 1
+
+
+def test_repeated_and_older_samples_add_nothing():
+    integrator = EnergyIntegrator(METHOD_LEFT)
+    integrator.add_sample(100.0, 100.0)
+
+    assert integrator.add_sample(100.0, 100.0) == 0.0
+    assert integrator.add_sample(100.0, 50.0) == 0.0
+    assert integrator.last_time == 100.0
+
+
+def test_gaps_longer_than_max_gap_are_skipped():
+    integrator = EnergyIntegrator(METHOD_LEFT, max_gap=600)
+    integrator.add_sample(100.0, 0.0)
+
+    assert integrator.add_sample(100.0, 601.0) == 0.0
+    assert integrator.gaps_skipped == 1
+    # Integration resumes from the sample after the gap
+    assert integrator.add_sample(100.0, 637.0) == pytest.approx(0.001)
+
+
+def test_max_gap_covers_slow_poe_polling():
+    assert effective_max_gap(600, 30) == 600
+    assert effective_max_gap(600, 900) == 1800
+
+    # PoE read every 15 minutes still counts with the raised gap
+    kwh, integrator = integrate(METHOD_LEFT, lambda t: 10.0, [0.0, 900.0, 1800.0], effective_max_gap(600, 900))
+    assert kwh == pytest.approx(0.005)
+    assert integrator.gaps_skipped == 0
+
+
+def test_skipped_gap_is_logged(caplog):
+    accumulator = EnergyAccumulator(port_num=3, max_gap=600)
+    accumulator.update({"poe_port_sampled_at": 0.0, "ports": {3: {"power": 5.0}}})
+    accumulator.update({"poe_port_sampled_at": 3600.0, "ports": {3: {"power": 5.0}}})
+
+    assert "No port 3 PoE reading for 3600s" in caplog.text
+
+
+def test_restore():
+    integrator = EnergyIntegrator(METHOD_LEFT)
+    integrator.restore({"last_power": "100", "last_time": 0})
+
+    assert integrator.add_sample(0.0, 36.0) == pytest.approx(0.001)
+
+    broken = EnergyIntegrator()
+    broken.restore({"last_power": None, "last_time": 0})
+    assert broken.last_time is None
+
+
+def test_accumulator_integrates_each_sample_once():
+    accumulator = EnergyAccumulator(method=METHOD_LEFT)
+    accumulator.update({"poe_total_sampled_at": 0.0, "poe_total_power": 1000.0})
+
+    data = {"poe_total_sampled_at": 36.0, "poe_total_power": 1000.0}
+    assert accumulator.update(data) == (36.0, pytest.approx(0.01))
+    # The second sensor of the same source gets the cached increment
+    assert accumulator.update(data) == (36.0, pytest.approx(0.01))
+    assert accumulator.previous_time == 0.0
+    assert accumulator.update({}) == (None, 0.0)
+
+
+def test_share_after():
+    assert share_after(1.0, 0.0, 100.0, 75.0) == pytest.approx(0.25)
+    assert share_after(1.0, 0.0, 100.0, 100.0) == 0.0
+    assert share_after(1.0, 50.0, 100.0, 0.0) == 1.0
+    # Without a previous sample everything counts
+    assert share_after(1.0, None, 100.0, 50.0) == 1.0
+
+
+def test_next_cycle_start():
+    tzinfo = timezone(timedelta(hours=1))
+    moment = datetime(2025, 12, 31, 23, 59, tzinfo=tzinfo)
+
+    assert next_cycle_start("daily", moment) == datetime(2026, 1, 1, tzinfo=tzinfo)
+    assert next_cycle_start("monthly", moment) == datetime(2026, 1, 1, tzinfo=tzinfo)
+    assert next_cycle_start("yearly", moment) == datetime(2026, 1, 1, tzinfo=tzinfo)
+    assert next_cycle_start("monthly", datetime(2026, 2, 1, tzinfo=tzinfo)) == datetime(2026, 3, 1, tzinfo=tzinfo)
+    with pytest.raises(ValueError):
+        next_cycle_start("weekly", moment)
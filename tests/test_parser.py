@@ -0,0 +1,79 @@
+"""Tests for the table extractor and page parsers."""
+import os
+
+import pytest
+
+from conftest import ROOT, load_fixture
+from keeplink_switch import parser
+
+BENCH_FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+
+# Markup the fast extractor must read exactly like BeautifulSoup
+EDGE_MARKUP = {
+    "entities": "<table><tr><td>A&amp;B&nbsp;</td><td> x &lt;1&gt; </td></tr></table>",
+    "comment": "<table><tr><td>Port<!-- hidden -->1</td><td>a<b>b</b> c</td></tr></table>",
+    "uppercase": "<TABLE><TR><TH>Port</TH><TD>1</TD></TR></TABLE>",
+    "inputs": '<input name="pse_con_pwr" value="12.5"><input name="pse_con_pwr" value="9"><input value="x">',
+    "rows outside tables": "<tr><td>loose</td></tr><table><tr><td>in</td></tr></table>",
+    "empty cells": "<table><tr><td></td><td>  </td></tr></table>",
+}
+# Markup the fast extractor hands over to BeautifulSoup
+FALLBACK_MARKUP = {
+    "nested table": "<table><tr><td><table><tr><td>x</td></tr></table></td></tr></table>",
+    "script in a cell": "<table><tr><td><script>var cell = '<td>';</script>v</td></tr></table>",
+}
+
+
+def fixture_pages():
+    pages = []
+    for model in sorted(os.listdir(BENCH_FIXTURES)):
+        for page_name in sorted(os.listdir(os.path.join(BENCH_FIXTURES, model))):
+            with open(os.path.join(BENCH_FIXTURES, model, page_name), encoding="utf-8") as page_file:
+                pages.append(pytest.param(page_file.read(), id=f"{model}/{page_name}"))
+    return pages
+
+
+def as_tuple(page):
+    return page.rows, page.tables, page.inputs
+
+
+@pytest.mark.parametrize("html", fixture_pages())
+def test_fixture_pages_match_beautifulsoup(html):
+    assert as_tuple(parser._extract_fast(html)) == as_tuple(parser._extract_soup(html))
+
+
+@pytest.mark.parametrize("html", EDGE_MARKUP.values(), ids=EDGE_MARKUP.keys())
+def test_edge_markup_matches_beautifulsoup(html):
+    assert as_tuple(parser._extract_fast(html)) == as_tuple(parser._extract_soup(html))
+
+
+@pytest.mark.parametrize("html", FALLBACK_MARKUP.values(), ids=FALLBACK_MARKUP.keys())
+def test_unsupported_markup_falls_back(html):
+    with pytest.raises(parser.UnsupportedMarkup):
+        parser._extract_fast(html)
+    assert as_tuple(parser.extract_page(html)) == as_tuple(parser._extract_soup(html))
+
+
+def test_unclosed_cells_and_rows_are_closed_implicitly():
+    page = parser._extract_fast("<table><tr><th>a<th>b<tr><td>1<td>2</tr><tr><td>3</table>")
+
+    assert page.tables == [[[("th", "a"), ("th", "b")], [("td", "1"), ("td", "2")], [("td", "3")]]]
+    assert page.rows == page.tables[0]
+
+
+def test_port_stats_with_unclosed_tags():
+    data = parser.parse_port_stats(load_fixture("port_stats_unclosed.html"))
+
+    assert data["ports"] == {
+        1: {"is_link_up": True, "tx_packets": 2 * 4294967296 + 371375481, "rx_packets": 3343385571,
+            "tx_errors": 17, "rx_errors": 0},
+        2: {"is_link_up": False, "tx_packets": 0, "rx_packets": 0, "tx_errors": 0, "rx_errors": 0},
+        3: {"is_link_up": True, "tx_packets": 4096, "rx_packets": 8192, "tx_errors": 1, "rx_errors": 2},
+    }
+
+
+def test_timed_parse_batch():
+    results, durations = parser.timed_parse_batch([(parser.parse_pse_system, '<input name="pse_con_pwr" value="12.5">')])
+
+    assert results == [{"poe_total_power": 12.5}]
+    assert len(durations) == 1 and durations[0] >= 0
@@ -0,0 +1,53 @@
+"""Tests for the traffic rates derived from the port counters."""
+from keeplink_switch.rates import TrafficRates, counter_delta
+
+
+def test_counter_delta():
+    assert counter_delta(100, 250, 64) == 150
+    # Wrap of a counter that was close to its maximum
+    assert counter_delta((1 << 32) - 10, 5, 32) == 15
+    assert counter_delta((1 << 64) - 1, 0, 64) == 1
+    # Went backwards from low in its range: cleared, not wrapped
+    assert counter_delta(1000, 10, 32) is None
+
+
+def test_rates_per_second():
+    rates = TrafficRates()
+    rates.update({1: {"tx_packets": 1000, "rx_errors": 2}}, 0.0)
+
+    assert rates.update({1: {"tx_packets": 1500, "rx_errors": 4}}, 10.0) == {
+        1: {"tx_packets_rate": 50.0, "rx_errors_rate": 0.2}
+    }
+
+
+def test_first_read_has_unknown_rates():
+    rates = TrafficRates()
+
+    assert rates.update({1: {"tx_packets": 1000}, 2: {}}, 0.0) == {1: {"tx_packets_rate": None}}
+
+
+def test_wrap_keeps_the_rate():
+    rates = TrafficRates()
+    rates.update({1: {"tx_errors": (1 << 32) - 100}}, 0.0)
+
+    assert rates.update({1: {"tx_errors": 100}}, 20.0) == {1: {"tx_errors_rate": 10.0}}
+
+
+def test_clear_reports_unknown_until_the_next_read():
+    rates = TrafficRates()
+    rates.update({1: {"tx_packets": 5000, "rx_packets": 100}}, 0.0)
+
+    assert rates.update({1: {"tx_packets": 10, "rx_packets": 200}}, 10.0) == {
+        1: {"tx_packets_rate": None, "rx_packets_rate": 10.0}
+    }
+    assert rates.update({1: {"tx_packets": 110, "rx_packets": 300}}, 20.0) == {
+        1: {"tx_packets_rate": 10.0, "rx_packets_rate": 10.0}
+    }
+
+
+def test_reset_forgets_the_baseline():
+    rates = TrafficRates()
+    rates.update({1: {"tx_packets": 5000}}, 0.0)
+    rates.reset()
+
+    assert rates.update({1: {"tx_packets": 0}}, 10.0) == {1: {"tx_packets_rate": None}}
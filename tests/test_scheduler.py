@@ -0,0 +1,74 @@
+"""Tests for the per-endpoint polling schedule and the adaptive PoE interval."""
+from keeplink_switch.scheduler import DUE_TOLERANCE, AdaptiveInterval, EndpointScheduler
+
+
+def test_everything_is_due_at_start():
+    scheduler = EndpointScheduler({"fast": 10, "slow": 30}, now=100.0)
+
+    assert scheduler.due(now=100.0) == {"fast", "slow"}
+
+
+def test_phase_shifts_the_following_deadlines():
+    scheduler = EndpointScheduler({"fast": 10, "slow": 30}, now=100.0, phase=0.5)
+    scheduler.mark_done({"fast", "slow"}, now=100.0)
+
+    assert scheduler.next_deadline() == 105.0
+    assert scheduler.due(now=105.0) == {"fast"}
+    assert scheduler.due(now=115.0) == {"fast", "slow"}
+
+
+def test_late_fetch_keeps_the_phase():
+    scheduler = EndpointScheduler({"fast": 10}, now=0.0)
+    scheduler.mark_done({"fast"}, now=0.0)
+
+    # Three intervals late: skip the missed deadlines instead of catching up
+    scheduler.mark_done({"fast"}, now=32.0)
+
+    assert scheduler.next_deadline() == 40.0
+    assert scheduler.seconds_until_next(now=32.0) == 8.0
+
+
+def test_due_tolerance():
+    scheduler = EndpointScheduler({"fast": 10}, now=0.0)
+    scheduler.mark_done({"fast"}, now=0.0)
+
+    assert scheduler.due(now=10.0 - DUE_TOLERANCE) == {"fast"}
+    assert scheduler.due(now=10.0 - DUE_TOLERANCE - 0.1) == set()
+
+
+def test_set_interval_pulls_the_deadline_in():
+    scheduler = EndpointScheduler({"poe": 120}, now=0.0)
+    scheduler.mark_done({"poe"}, now=0.0)
+
+    scheduler.set_interval({"poe"}, 5, now=10.0)
+    assert scheduler.next_deadline() == 15.0
+
+    # A longer interval doesn't push the pending deadline out
+    scheduler.set_interval({"poe"}, 60, now=11.0)
+    assert scheduler.next_deadline() == 15.0
+
+
+def test_removed_endpoints_are_never_due():
+    scheduler = EndpointScheduler({"poe": 30, "stats": 60}, now=0.0)
+    scheduler.remove({"poe"})
+    scheduler.mark_done({"poe", "stats"}, now=0.0)
+
+    assert scheduler.due(now=0.0) == set()
+    assert scheduler.next_deadline() == 60.0
+    assert "poe" not in scheduler.intervals
+
+
+def test_adaptive_interval_drops_on_change_and_backs_off():
+    adaptive = AdaptiveInterval(30, 5, 120, threshold_pct=10)
+    flat = {1: (5.0, 53.0, 100.0)}
+
+    assert adaptive.update(flat, {1: (10.0, 53.0, 190.0)}) == 5
+    assert adaptive.update(flat, flat) == 8
+    assert adaptive.update(flat, flat) == 12
+
+
+def test_adaptive_interval_ignores_noise():
+    adaptive = AdaptiveInterval(30, 5, 40, threshold_pct=10)
+
+    # Over 10%, but below the 0.5 W noise floor
+    assert adaptive.update({1: (1.0, 53.0, 20.0)}, {1: (1.4, 53.0, 27.0)}) == 40